@@ -1,8 +1,8 @@
 import os
 import logging
 from pathlib import Path
-import autogen
-from autogen_playwright.ops import print_session_summary, analyze_conversation
+from autogen_playwright.ops import print_cost_summary, get_cost_tracker, analyze_conversation, print_trace_breakdown, get_tracer, write_flame_graph
+from autogen_playwright.ops.runtime_logger import start_runtime_logging, stop_runtime_logging
 from autogen_playwright.utils.common_utils import load_env_from_file
 
 # Configure logging
@@ -32,14 +32,7 @@ def run_test(test_steps=None):
         
         # Start runtime logging with SQLite
         db_path = Path("runtime_logs/autogen_logs.db")
-        db_path.parent.mkdir(exist_ok=True)
-        logging_config = {
-            "dbname": str(db_path),
-            "table_name": "agent_logs",
-            "create_table": True
-        }
-        logging_session_id = autogen.runtime_logging.start(config=logging_config)
-        logger.info(f"LOG:  Started autogen runtime logging with session ID: {logging_session_id}")
+        logging_session_id = start_runtime_logging(str(db_path))
         
         # Default test steps if none provided
         default_steps = [
@@ -70,36 +63,43 @@ def run_test(test_steps=None):
         - Generate a test summary at the end
         """
         
+        # Root span for the scenario: agent rounds, LLM calls, executor runs and skill steps nest under it
+        scenario_span = None
         try:
             logger.info("Initiating chat with test message...")
             max_iterations = int(os.getenv('MAX_ITERATIONS', '10'))
             
-            # Initiate chat based on mode
-            if use_group_chat:
-                chat_result = executor.initiate_chat(
-                    manager,
-                    message=test_message,
-                    max_turns=max_iterations
-                )
-            else:
-                chat_result = executor.initiate_chat(
-                    testing_agent,
-                    message=test_message,
-                    max_turns=max_iterations,
-                    summary_method="reflection_with_llm"
-                )
+            with get_tracer().span("scenario", session_id=str(logging_session_id)) as scenario_span, \
+                    get_cost_tracker().scenario("EE Broadband Page Navigation and Validation"):
+                # Initiate chat based on mode
+                if use_group_chat:
+                    chat_result = executor.initiate_chat(
+                        manager,
+                        message=test_message,
+                        max_turns=max_iterations
+                    )
+                else:
+                    chat_result = executor.initiate_chat(
+                        testing_agent,
+                        message=test_message,
+                        max_turns=max_iterations,
+                        summary_method="reflection_with_llm"
+                    )
             
             return True
                 
         finally:
             # Stop runtime logging and print session info
-            autogen.runtime_logging.stop()
+            stop_runtime_logging()
             logger.info(f"LOG:  Stopped autogen runtime logging for session {logging_session_id}")
             
             # Print analytics
             print("\n=== Test Analytics ===")
-            print_session_summary(logging_session_id, str(db_path))
+            print_cost_summary()
             analyze_conversation(logging_session_id, str(db_path))
+            if scenario_span is not None:
+                print_trace_breakdown(scenario_span.trace_id)
+                write_flame_graph(scenario_span.trace_id, f"runtime_logs/flamegraph_{scenario_span.trace_id}.folded")
             
     except Exception as e:
         logger.error(f"Test execution failed: {str(e)}", exc_info=True)
@@ -13,6 +13,7 @@ setup(
         "pandas>=2.0.0",
         "cerebras_cloud_sdk>=0.1.0",
         "streamlit>=1.31.0",
+        "Pillow>=9.0.0",
     ],
     python_requires=">=3.9",
 ) 
\ No newline at end of file
@@ -1,7 +1,36 @@
-from .agents.web_testing_agents import create_web_testing_agents
-from .skills.playwright_skill import PlaywrightSkill
+"""
+AutoGen-powered automated web testing with Playwright.
+
+Public names are loaded on first access so that code which only needs
+PlaywrightSkill (such as generated test scripts run by the executor) does not
+pay for importing autogen and openai, and vice versa.
+"""
+
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .agents.web_testing_agents import create_web_testing_agents
+    from .skills.playwright_skill import PlaywrightSkill
+
+_LAZY_ATTRIBUTES = {
+    'create_web_testing_agents': '.agents.web_testing_agents',
+    'PlaywrightSkill': '.skills.playwright_skill',
+}
 
 __all__ = [
     'create_web_testing_agents',
     'PlaywrightSkill'
-] 
\ No newline at end of file
+]
+
+def __getattr__(name: str):
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    # Cache on the package so later lookups skip __getattr__
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_ATTRIBUTES))
@@ -1,11 +1,17 @@
 from autogen import AssistantAgent, UserProxyAgent, GroupChat, GroupChatManager, Agent
+from autogen.code_utils import TIMEOUT_MSG, WORKING_DIR
 import logging
 import json
 import re
+import functools
+import hashlib
+import subprocess
+import sys
 from typing import Optional, List, Dict, Any, Tuple, Union
 from ..skills.playwright_skill import PlaywrightSkill
 from ..llm.provider import LLMProvider
 from ..prompts import WEB_TESTER_PROMPT, DEBUG_AGENT_PROMPT, SECURITY_ADMIN_PROMPT
+from ..ops.tracing import get_tracer
 import os
 
 logger = logging.getLogger(__name__)
@@ -197,6 +203,71 @@ def create_agents(llm_config: dict, monitor: ConversationMonitor) -> Dict[str, U
         "executor": executor
     }
 
+def run_python_code(code: str, env: Dict[str, str], work_dir: Optional[str] = None,
+                    timeout: Optional[int] = None) -> Tuple[int, str, None]:
+    """
+    Run Python code in a subprocess the way autogen's local executor does, with an explicit environment
+    Args:
+        code: Python source to run
+        env: Environment of the subprocess
+        work_dir: Directory the code is written to and run in (defaults to autogen's WORKING_DIR)
+        timeout: Seconds before the subprocess is killed
+    Returns:
+        Exit code, logs (stdout, or stderr on failure) and no image, like UserProxyAgent.run_code
+    """
+    work_dir = work_dir or WORKING_DIR
+    filename = f"tmp_code_{hashlib.md5(code.encode()).hexdigest()}.py"
+    os.makedirs(work_dir, exist_ok=True)
+    with open(os.path.join(work_dir, filename), "w", encoding="utf-8") as f:
+        f.write(code)
+    try:
+        result = subprocess.run([sys.executable, filename], cwd=work_dir, env=env,
+                                capture_output=True, text=True, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        return 1, TIMEOUT_MSG, None
+    return result.returncode, result.stderr if result.returncode else result.stdout, None
+
+def instrument_agents(agents: Dict[str, Union[AssistantAgent, UserProxyAgent]], provider: LLMProvider,
+                      turn_span: str = "groupchat.round") -> None:
+    """
+    Wrap agent turns, LLM calls and code execution in tracing spans
+    Args:
+        agents: Dictionary of agents
+        provider: LLM provider used to trace completions
+        turn_span: Span name for each agent reply
+    """
+    for name, agent in agents.items():
+        provider.instrument(agent)
+
+        generate_reply = agent.generate_reply
+
+        @functools.wraps(generate_reply)
+        def traced_generate_reply(*args, _generate_reply=generate_reply, _name=name, **kwargs):
+            with get_tracer().span(turn_span, speaker=_name):
+                return _generate_reply(*args, **kwargs)
+
+        agent.generate_reply = traced_generate_reply
+
+    executor = agents.get("executor")
+    if executor is None:
+        return
+    run_code = executor.run_code
+
+    @functools.wraps(run_code)
+    def traced_run_code(code, **kwargs):
+        tracer = get_tracer()
+        lang = kwargs.get("lang", "python")
+        with tracer.span("executor.run", lang=lang):
+            propagated = tracer.propagation_env()
+            if not propagated or not lang.startswith("python") or kwargs.get("use_docker"):
+                return run_code(code, **kwargs)
+            # Let PlaywrightSkill spans in the executor subprocess nest under this run; the trace
+            # context goes to that subprocess only, never into this process's os.environ
+            return run_python_code(code, env={**os.environ, **propagated},
+                                   work_dir=kwargs.get("work_dir"), timeout=kwargs.get("timeout"))
+
+    executor.run_code = traced_run_code
+
 def setup_group_chat(agents: Dict[str, Union[AssistantAgent, UserProxyAgent]], llm_config: dict) -> GroupChatManager:
     """
     Set up a group chat with all agents
@@ -232,7 +303,8 @@ def create_web_testing_agents(use_group_chat: bool = True) -> Union[Tuple[Assist
         If use_group_chat=False:
             Tuple[AssistantAgent, UserProxyAgent]
     """
-    llm_config = LLMProvider().get_config()
+    provider = LLMProvider()
+    llm_config = provider.get_config()
     logger.info(f"LOG :Creating agents with config: {llm_config}")
     
     # Create conversation monitor
@@ -243,6 +315,7 @@ def create_web_testing_agents(use_group_chat: bool = True) -> Union[Tuple[Assist
     
     # Create all agents
     agents = create_agents(llm_config, monitor)
+    instrument_agents(agents, provider, "groupchat.round" if use_group_chat else "chat.turn")
     
     if use_group_chat:
         manager = setup_group_chat(agents, llm_config)
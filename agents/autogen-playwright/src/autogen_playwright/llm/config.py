@@ -18,6 +18,7 @@ class LLMConfig:
     cache_path: Optional[str] = None
     max_consecutive_empty: int = 3  # Maximum number of consecutive empty exchanges allowed
     max_total_tokens: Optional[int] = None  # Maximum total tokens for the entire conversation, None for no limit
+    base_url: Optional[str] = None  # Override the provider endpoint (e.g. a local OpenAI-compatible server)
     
     @classmethod
     def from_env(cls) -> 'LLMConfig':
@@ -45,7 +46,8 @@ class LLMConfig:
             cache_enable=os.getenv('LLM_CACHE_ENABLE', 'true').lower() == 'true',
             cache_path=os.getenv('LLM_CACHE_PATH', '/tmp/autogen-playwright-cache'),
             max_consecutive_empty=int(os.getenv('LLM_MAX_CONSECUTIVE_EMPTY', '3')),
-            max_total_tokens=max_total_tokens
+            max_total_tokens=max_total_tokens,
+            base_url=os.getenv('LLM_BASE_URL') or None
         )
         
         logger.info(f"LOG:  Created config with provider: {config.provider}, model: {config.model}")
@@ -1,15 +1,12 @@
 import os
 import logging
+import functools
 from typing import Dict, Any, Optional
 from .config import LLMConfig
+from ..ops.tracing import get_tracer
+from ..ops.cost_tracker import get_cost_tracker
 from autogen import Cache
 
-# Configure basic logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
-
 class LoggedCache(Cache):
     """Cache implementation that logs hits and misses"""
     def __init__(self, *args, **kwargs):
@@ -67,6 +64,10 @@ class LLMProvider:
         
         if self.config.max_tokens:
             base_config["max_tokens"] = self.config.max_tokens
+
+        if self.config.base_url:
+            base_config["base_url"] = self.config.base_url
+            self.logger.info(f"LOG:  Using base URL: {self.config.base_url}")
             
         provider_specific = {
             "openai": {
@@ -87,4 +88,29 @@ class LLMProvider:
             }
         }
         
-        return {**base_config, **provider_specific.get(self.config.provider, {})}
\ No newline at end of file
+        return {**base_config, **provider_specific.get(self.config.provider, {})}
+
+    def instrument(self, agent) -> None:
+        """
+        Trace every LLM completion made by an agent and add it to the running cost totals
+        Args:
+            agent: ConversableAgent whose OpenAIWrapper client should be wrapped
+        """
+        client = getattr(agent, "client", None)
+        if client is None:
+            return
+        model = self.config.model
+        get_cost_tracker().instrument(agent, model=model)
+        create = client.create
+
+        @functools.wraps(create)
+        def traced_create(**params):
+            with get_tracer().span("llm.completion", agent=agent.name, model=model) as span:
+                response = create(**params)
+                usage = getattr(response, "usage", None)
+                if span is not None and usage is not None:
+                    span.set_attribute("prompt_tokens", getattr(usage, "prompt_tokens", 0))
+                    span.set_attribute("completion_tokens", getattr(usage, "completion_tokens", 0))
+                return response
+
+        client.create = traced_create
@@ -1,9 +1,66 @@
-from .log_analyzer import LogAnalyzer
-from .utils import print_session_summary, analyze_conversation, get_db_path
+"""
+Log analysis and tracing utilities.
+
+LogAnalyzer and the session helpers need pandas and the runtime logger needs
+autogen, so they are loaded on first access; tracing is imported by PlaywrightSkill and must stay lightweight.
+"""
+
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .log_analyzer import LogAnalyzer
+    from .utils import print_session_summary, print_cost_summary, analyze_conversation, get_db_path, print_trace_breakdown
+    from .cost_tracker import CostTracker, BudgetExceededError, get_cost_tracker
+    from .transcript_store import TranscriptStore
+    from .tracing import Tracer, get_tracer, traced, write_flame_graph
+    from .runtime_logger import start_runtime_logging, stop_runtime_logging
+
+_LAZY_ATTRIBUTES = {
+    'LogAnalyzer': '.log_analyzer',
+    'print_session_summary': '.utils',
+    'print_cost_summary': '.utils',
+    'analyze_conversation': '.utils',
+    'get_db_path': '.utils',
+    'print_trace_breakdown': '.utils',
+    'Tracer': '.tracing',
+    'get_tracer': '.tracing',
+    'traced': '.tracing',
+    'write_flame_graph': '.tracing',
+    'start_runtime_logging': '.runtime_logger',
+    'stop_runtime_logging': '.runtime_logger',
+    'CostTracker': '.cost_tracker',
+    'BudgetExceededError': '.cost_tracker',
+    'get_cost_tracker': '.cost_tracker',
+    'TranscriptStore': '.transcript_store',
+}
 
 __all__ = [
     'LogAnalyzer',
     'print_session_summary',
+    'print_cost_summary',
     'analyze_conversation',
-    'get_db_path'
-] 
\ No newline at end of file
+    'get_db_path',
+    'print_trace_breakdown',
+    'Tracer',
+    'get_tracer',
+    'traced',
+    'write_flame_graph',
+    'start_runtime_logging',
+    'stop_runtime_logging',
+    'CostTracker',
+    'BudgetExceededError',
+    'get_cost_tracker',
+    'TranscriptStore'
+]
+
+def __getattr__(name: str):
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_ATTRIBUTES))
@@ -0,0 +1,224 @@
+import os
+import copy
+import logging
+import functools
+import threading
+import contextvars
+from contextlib import contextmanager
+from dataclasses import dataclass, asdict
+from typing import Dict, Iterator, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# USD per 1k tokens as (prompt, completion); longest matching prefix wins
+MODEL_PRICING: Dict[str, Tuple[float, float]] = {
+    "gpt-4": (0.03, 0.06),
+    "gpt-4-32k": (0.06, 0.12),
+    "gpt-4-1106-preview": (0.01, 0.03),
+    "gpt-4-turbo": (0.01, 0.03),
+    "gpt-4o": (0.005, 0.015),
+    "gpt-4o-mini": (0.00015, 0.0006),
+    "gpt-3.5-turbo": (0.0005, 0.0015),
+    "claude-3-opus": (0.015, 0.075),
+    "claude-3-sonnet": (0.003, 0.015),
+    "claude-3-haiku": (0.00025, 0.00125),
+}
+# Unknown models are priced like GPT-4, as LogAnalyzer does
+DEFAULT_PRICING = (0.03, 0.06)
+
+_current_scenario: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar(
+    "autogen_playwright_scenario", default=None
+)
+
+class BudgetExceededError(RuntimeError):
+    """Raised before an LLM call once a CostTracker spend or token cap has been reached"""
+
+@dataclass
+class UsageTotals:
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cost: float = 0.0
+    requests: int = 0
+    cached_requests: int = 0
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+    def add(self, prompt_tokens: int, completion_tokens: int, cost: float):
+        self.prompt_tokens += prompt_tokens
+        self.completion_tokens += completion_tokens
+        self.cost += cost
+        self.requests += 1
+
+    def add_cached(self):
+        self.cached_requests += 1
+
+    def to_dict(self) -> Dict:
+        data = asdict(self)
+        data["total_tokens"] = self.total_tokens
+        data["cost"] = round(self.cost, 4)
+        return data
+
+class CostTracker:
+    """
+    In-memory running totals of LLM token usage and cost.
+
+    Fed directly from completion responses (see instrument), so totals are
+    available mid-run without reading the runtime log database. Totals are kept
+    overall and per agent, model and scenario, and optional caps stop further
+    LLM calls once reached.
+    """
+
+    def __init__(self, max_cost: Optional[float] = None, max_tokens: Optional[int] = None,
+                 pricing: Optional[Dict[str, Tuple[float, float]]] = None):
+        """
+        Initialize cost tracker
+        Args:
+            max_cost: Spend cap in USD (no cap when None)
+            max_tokens: Total token cap (no cap when None)
+            pricing: Model pricing overrides, USD per 1k tokens as (prompt, completion)
+        """
+        self.max_cost = max_cost
+        self.max_tokens = max_tokens
+        self.pricing = {**MODEL_PRICING, **(pricing or {})}
+        self._lock = threading.Lock()
+        self.reset()
+
+    @classmethod
+    def from_env(cls) -> "CostTracker":
+        """Build a tracker with caps from COST_LIMIT_USD and TOKEN_LIMIT"""
+        max_cost = os.getenv("COST_LIMIT_USD")
+        max_tokens = os.getenv("TOKEN_LIMIT")
+        return cls(
+            max_cost=float(max_cost) if max_cost else None,
+            max_tokens=int(max_tokens) if max_tokens else None,
+        )
+
+    def reset(self):
+        with self._lock:
+            self.total = UsageTotals()
+            self.by_agent: Dict[str, UsageTotals] = {}
+            self.by_model: Dict[str, UsageTotals] = {}
+            self.by_scenario: Dict[str, UsageTotals] = {}
+
+    def price(self, model: str, prompt_tokens: int, completion_tokens: int) -> float:
+        """Cost in USD of one completion"""
+        matches = [name for name in self.pricing if model and model.startswith(name)]
+        prompt_rate, completion_rate = self.pricing[max(matches, key=len)] if matches else DEFAULT_PRICING
+        return (prompt_tokens * prompt_rate + completion_tokens * completion_rate) / 1000
+
+    @contextmanager
+    def scenario(self, name: str) -> Iterator[None]:
+        """Attribute LLM calls made inside the block (in this context) to a scenario"""
+        token = _current_scenario.set(name)
+        try:
+            yield
+        finally:
+            _current_scenario.reset(token)
+
+    def record(self, agent: str, model: str, prompt_tokens: int, completion_tokens: int,
+               scenario: Optional[str] = None, cached: bool = False) -> float:
+        """
+        Add one completion to the running totals
+        Args:
+            agent: Name of the agent that made the call
+            model: Model that served the call
+            prompt_tokens: Prompt tokens reported by the API
+            completion_tokens: Completion tokens reported by the API
+            scenario: Scenario to attribute the call to (defaults to the active scenario)
+            cached: Served from the LLM cache; counted in cached_requests only, since it cost nothing
+        Returns:
+            Cost of the call in USD
+        """
+        cost = 0.0 if cached else self.price(model, prompt_tokens, completion_tokens)
+        scenario = scenario or _current_scenario.get()
+        with self._lock:
+            totals = [self.total, self.by_agent.setdefault(agent, UsageTotals()),
+                      self.by_model.setdefault(model, UsageTotals())]
+            if scenario:
+                totals.append(self.by_scenario.setdefault(scenario, UsageTotals()))
+            for usage in totals:
+                if cached:
+                    usage.add_cached()
+                else:
+                    usage.add(prompt_tokens, completion_tokens, cost)
+        if self.exceeded():
+            logger.warning(f"Spend cap reached: {self.exceeded()}")
+        return cost
+
+    def exceeded(self) -> Optional[str]:
+        """Description of the cap that has been reached, or None"""
+        if self.max_cost is not None and self.total.cost >= self.max_cost:
+            return f"cost ${self.total.cost:.4f} >= ${self.max_cost:.4f}"
+        if self.max_tokens is not None and self.total.total_tokens >= self.max_tokens:
+            return f"tokens {self.total.total_tokens} >= {self.max_tokens}"
+        return None
+
+    def check(self):
+        """Raise BudgetExceededError if a cap has been reached"""
+        reason = self.exceeded()
+        if reason:
+            raise BudgetExceededError(f"LLM budget exceeded: {reason}")
+
+    def snapshot(self) -> Dict:
+        """Current totals with per-agent, per-model and per-scenario breakdowns"""
+        with self._lock:
+            return {
+                **self.total.to_dict(),
+                "max_cost": self.max_cost,
+                "max_tokens": self.max_tokens,
+                "by_agent": {name: totals.to_dict() for name, totals in self.by_agent.items()},
+                "by_model": {name: totals.to_dict() for name, totals in self.by_model.items()},
+                "by_scenario": {name: totals.to_dict() for name, totals in self.by_scenario.items()},
+            }
+
+    def instrument(self, agent, model: Optional[str] = None) -> None:
+        """
+        Record every LLM completion made by an agent and enforce the caps before each call
+        Args:
+            agent: ConversableAgent whose OpenAIWrapper client should be wrapped
+            model: Model name to use when the response does not report one
+        """
+        client = getattr(agent, "client", None)
+        if client is None:
+            return
+        create = client.create
+
+        @functools.wraps(create)
+        def tracked_create(**params):
+            self.check()
+            # OpenAIWrapper adds only requests that reached the API to actual_usage_summary,
+            # so an unchanged summary means the response came from the autogen cache
+            actual_before = copy.deepcopy(getattr(client, "actual_usage_summary", None))
+            response = create(**params)
+            usage = getattr(response, "usage", None)
+            if usage is not None:
+                cached = (hasattr(client, "actual_usage_summary")
+                          and client.actual_usage_summary == actual_before)
+                self.record(
+                    agent.name,
+                    getattr(response, "model", None) or model or params.get("model") or "unknown",
+                    getattr(usage, "prompt_tokens", 0) or 0,
+                    getattr(usage, "completion_tokens", 0) or 0,
+                    cached=cached,
+                )
+            return response
+
+        client.create = tracked_create
+
+_cost_tracker: Optional[CostTracker] = None
+_cost_tracker_lock = threading.Lock()
+
+def get_cost_tracker() -> CostTracker:
+    """Return the process-wide cost tracker, creating it from the environment on first use"""
+    global _cost_tracker
+    if _cost_tracker is None:
+        with _cost_tracker_lock:
+            if _cost_tracker is None:
+                _cost_tracker = CostTracker.from_env()
+    return _cost_tracker
+
+def set_cost_tracker(tracker: CostTracker):
+    global _cost_tracker
+    _cost_tracker = tracker
@@ -0,0 +1,134 @@
+import time
+import uuid
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class Job:
+    """A unit of background work and the progress it has reported so far; messages live in the TranscriptStore"""
+    id: str
+    name: str
+    status: str = "queued"  # queued, running, succeeded, failed or cancelled
+    progress: Dict[str, Any] = field(default_factory=dict)
+    result: Any = None
+    error: Optional[str] = None
+    created: float = field(default_factory=time.time)
+    started: Optional[float] = None
+    finished: Optional[float] = None
+    cancel_event: threading.Event = field(default_factory=threading.Event, repr=False)
+
+    @property
+    def done(self) -> bool:
+        return self.status in ("succeeded", "failed", "cancelled")
+
+    @property
+    def cancelled(self) -> bool:
+        return self.cancel_event.is_set()
+
+class JobQueue:
+    """
+    Thread pool that runs jobs in the background and keeps their state for polling.
+
+    Callers submit a function and get a Job back immediately; the function receives
+    the Job as its first argument and reports progress on it. Finished jobs are kept
+    until max_jobs is exceeded, oldest first.
+    """
+
+    def __init__(self, max_workers: int = 2, max_jobs: int = 100):
+        """
+        Initialize job queue
+        Args:
+            max_workers: Jobs that run concurrently; the rest wait in the queue
+            max_jobs: Jobs kept for polling before the oldest finished ones are dropped
+        """
+        self.max_workers = max_workers
+        self.max_jobs = max_jobs
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job-worker")
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._futures: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, name: str, fn: Callable[..., Any], *args, **kwargs) -> Job:
+        """
+        Queue a function to run on a worker
+        Args:
+            name: Human-readable job name
+            fn: Function called as fn(job, *args, **kwargs)
+        Returns:
+            The queued Job
+        """
+        job = Job(id=uuid.uuid4().hex[:12], name=name)
+        with self._lock:
+            self._jobs[job.id] = job
+            self._futures[job.id] = self._executor.submit(self._run, job, fn, *args, **kwargs)
+            self._prune()
+        logger.info(f"LOG:  Queued job {job.id} ({name}), {self.pending()} waiting")
+        return job
+
+    def _run(self, job: Job, fn: Callable[..., Any], *args, **kwargs):
+        # Status changes happen under the lock so cancel() and pollers never see a half-updated job
+        with self._lock:
+            if job.cancelled:
+                job.status = "cancelled"
+                return
+            job.status = "running"
+            job.started = time.time()
+        result, error = None, None
+        try:
+            result = fn(job, *args, **kwargs)
+        except Exception as e:
+            logger.exception(f"Job {job.id} ({job.name}) failed")
+            error = str(e)
+        with self._lock:
+            job.result = result
+            job.error = error
+            job.status = "failed" if error is not None else "cancelled" if job.cancelled else "succeeded"
+            job.finished = time.time()
+        logger.info(f"LOG:  Job {job.id} {job.status} in {job.finished - job.started:.1f}s")
+
+    def _prune(self):
+        finished = [job_id for job_id, job in self._jobs.items() if job.done]
+        for job_id in finished[:max(len(self._jobs) - self.max_jobs, 0)]:
+            del self._jobs[job_id]
+            self._futures.pop(job_id, None)
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> bool:
+        """
+        Ask a job to stop: queued jobs are dropped, running jobs see job.cancelled
+        Returns:
+            True if the job exists and was not already finished
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.done:
+                return False
+            job.cancel_event.set()
+            future = self._futures.get(job_id)
+            if future is not None and future.cancel():
+                job.status = "cancelled"
+        return True
+
+    def pending(self) -> int:
+        """Jobs waiting for a free worker"""
+        with self._lock:
+            return sum(1 for job in self._jobs.values() if job.status == "queued")
+
+    def position(self, job_id: str) -> int:
+        """Place of a queued job in the queue (1 is next), 0 once it has started"""
+        with self._lock:
+            queued = [job.id for job in self._jobs.values() if job.status == "queued"]
+        return queued.index(job_id) + 1 if job_id in queued else 0
+
+    def shutdown(self, wait: bool = True):
+        for job_id in list(self._jobs):
+            self.cancel(job_id)
+        self._executor.shutdown(wait=wait)
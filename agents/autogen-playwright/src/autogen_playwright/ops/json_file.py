@@ -0,0 +1,59 @@
+import os
+import json
+import logging
+import tempfile
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterator
+
+try:
+    import fcntl
+except ImportError:  # Windows: only threads of this process are serialized
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+_thread_lock = threading.Lock()
+
+def read_json(path: Path, default: Any) -> Any:
+    """Content of a JSON file, or default when it is missing or unreadable"""
+    if not path.exists():
+        return default
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (json.JSONDecodeError, OSError) as e:
+        logger.warning(f"Could not read {path}: {str(e)}")
+        return default
+
+def write_json(path: Path, data: Any):
+    """Replace a JSON file atomically through a temporary file unique to this writer"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f"{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+@contextmanager
+def locked_json(path: Path, default: Any) -> Iterator[Any]:
+    """
+    Read-modify-write a JSON file shared by concurrent test processes
+    Holds an exclusive lock on <path>.lock while the body runs, yields the current
+    content and writes it back when the body finishes without an error.
+    Args:
+        path: JSON file to update
+        default: Content used when the file does not exist yet
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with _thread_lock, open(path.with_name(path.name + ".lock"), "a") as lock_file:
+        if fcntl is not None:
+            # Released when the lock file is closed
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        data = read_json(path, default)
+        yield data
+        write_json(path, data)
@@ -8,7 +8,12 @@ import logging
 logger = logging.getLogger(__name__)
 
 class LogAnalyzer:
-    """Analyzer for autogen runtime logs stored in SQLite database"""
+    """
+    Analyzer for autogen runtime logs stored in SQLite database.
+
+    Per-process shards written next to the main database (autogen_logs.<shard>.db,
+    see ops.runtime_logger) are read together with it as one log.
+    """
     
     def __init__(self, db_path: str = "runtime_logs/autogen_logs.db"):
         """
@@ -17,6 +22,12 @@ class LogAnalyzer:
             db_path: Path to SQLite database file
         """
         self.db_path = db_path
+
+    def db_paths(self) -> List[Path]:
+        """Main database plus any per-process shards next to it"""
+        path = Path(self.db_path)
+        paths = [path] if path.exists() else []
+        return paths + sorted(path.parent.glob(f"{path.stem}.*{path.suffix}"))
         
     def get_log_data(self, table: str = "chat_completions") -> List[Dict]:
         """
@@ -26,19 +37,21 @@ class LogAnalyzer:
         Returns:
             List of dictionaries containing log data
         """
-        try:
-            con = sqlite3.connect(self.db_path)
-            query = f"SELECT * from {table}"
-            cursor = con.execute(query)
-            rows = cursor.fetchall()
-            column_names = [description[0] for description in cursor.description]
-            data = [dict(zip(column_names, row)) for row in rows]
-            logger.info(f"LOG:  Retrieved {len(data)} records from {table}")
-            con.close()
-            return data
-        except sqlite3.OperationalError as e:
-            logger.warning(f"Error reading from database: {str(e)}")
-            return []
+        data = []
+        for path in self.db_paths():
+            try:
+                con = sqlite3.connect(path)
+                try:
+                    cursor = con.execute(f"SELECT * from {table}")
+                    rows = cursor.fetchall()
+                    column_names = [description[0] for description in cursor.description]
+                    data.extend(dict(zip(column_names, row)) for row in rows)
+                finally:
+                    con.close()
+            except sqlite3.OperationalError as e:
+                logger.warning(f"Error reading from database {path}: {str(e)}")
+        logger.info(f"LOG:  Retrieved {len(data)} records from {table}")
+        return data
     
     def get_log_dataframe(self, table: str = "chat_completions") -> pd.DataFrame:
         """
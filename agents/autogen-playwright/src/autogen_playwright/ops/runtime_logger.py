@@ -0,0 +1,149 @@
+import os
+import queue
+import atexit
+import sqlite3
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+import autogen.runtime_logging
+from autogen.logger.sqlite_logger import SqliteLogger
+
+logger = logging.getLogger(__name__)
+
+class BatchedSqliteLogger(SqliteLogger):
+    """
+    autogen SQLite runtime logger that writes from a background thread in batches.
+
+    autogen's SqliteLogger commits every completion individually on the calling
+    thread, so parallel workers serialize on SQLite's write lock and chat turns
+    stall. Here inserts are queued in memory and written in one transaction per
+    batch, the database runs in WAL mode, and a bounded queue applies
+    back-pressure instead of growing without limit.
+    """
+
+    def __init__(self, config: Dict[str, Any], batch_size: int = 200, flush_interval: float = 0.5,
+                 max_queue: int = 10000):
+        """
+        Initialize batched logger
+        Args:
+            config: autogen logger config; "dbname" is the SQLite file
+            batch_size: Maximum inserts written per transaction
+            flush_interval: Seconds to wait for a batch to fill before writing it
+            max_queue: Queued inserts before log calls block (back-pressure)
+        """
+        super().__init__(config)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: "queue.Queue[Optional[Tuple[str, Tuple[Any, ...]]]]" = queue.Queue(maxsize=max_queue)
+        self._writer: Optional[threading.Thread] = None
+        self._writer_con: Optional[sqlite3.Connection] = None
+        self._set_pragmas(self.con)
+
+    @staticmethod
+    def _set_pragmas(con: sqlite3.Connection):
+        # WAL lets LogAnalyzer read while workers write
+        con.execute("PRAGMA journal_mode=WAL")
+        con.execute("PRAGMA synchronous=NORMAL")
+        con.execute("PRAGMA busy_timeout=5000")
+
+    def start(self) -> str:
+        # Table creation and migrations run synchronously before the writer starts
+        session_id = super().start()
+        self._writer_con = sqlite3.connect(self.dbname, check_same_thread=False)
+        self._set_pragmas(self._writer_con)
+        self._writer = threading.Thread(target=self._write_loop, name="autogen-log-writer", daemon=True)
+        self._writer.start()
+        atexit.register(self.flush)
+        return session_id
+
+    def _run_query(self, query: str, args: Tuple[Any, ...] = ()) -> None:
+        if self._writer is None:
+            return super()._run_query(query=query, args=args)
+        # Blocks when the queue is full, slowing producers rather than dropping events
+        self._queue.put((query, args))
+
+    def _write_loop(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                self._queue.task_done()
+                return
+            batch = [item]
+            try:
+                while len(batch) < self.batch_size:
+                    next_item = self._queue.get(timeout=self.flush_interval)
+                    if next_item is None:
+                        self._write_batch(batch)
+                        for _ in range(len(batch) + 1):
+                            self._queue.task_done()
+                        return
+                    batch.append(next_item)
+            except queue.Empty:
+                pass
+            self._write_batch(batch)
+            for _ in batch:
+                self._queue.task_done()
+
+    def _write_batch(self, batch):
+        try:
+            with self._writer_con:
+                for query, args in batch:
+                    self._writer_con.execute(query, args)
+        except sqlite3.Error as e:
+            logger.error(f"Failed to write {len(batch)} runtime log events: {str(e)}")
+
+    def flush(self):
+        """Block until every queued event has been written"""
+        if self._writer is not None and self._writer.is_alive():
+            self._queue.join()
+
+    def stop(self) -> None:
+        if self._writer is not None:
+            self._queue.put(None)
+            self._writer.join()
+            self._writer = None
+        if self._writer_con is not None:
+            self._writer_con.close()
+            self._writer_con = None
+        super().stop()
+
+def shard_path(db_path: str, shard: Optional[str] = None) -> str:
+    """
+    Per-process database file next to the main one, e.g. autogen_logs.<shard>.db
+    Args:
+        db_path: Main database path
+        shard: Shard name (defaults to the process ID)
+    Returns:
+        Path of the shard database
+    """
+    path = Path(db_path)
+    return str(path.with_name(f"{path.stem}.{shard or os.getpid()}{path.suffix}"))
+
+def start_runtime_logging(db_path: str = "runtime_logs/autogen_logs.db", shard: Optional[bool] = None,
+                          **logger_kwargs) -> str:
+    """
+    Start autogen runtime logging through a BatchedSqliteLogger
+    Args:
+        db_path: SQLite database path
+        shard: Write to a per-process shard (read together by LogAnalyzer) instead of db_path;
+            defaults to the RUNTIME_LOG_SHARD environment variable
+        **logger_kwargs: batch_size, flush_interval or max_queue for BatchedSqliteLogger
+    Returns:
+        Logging session ID
+    """
+    if shard is None:
+        shard = os.getenv("RUNTIME_LOG_SHARD", "false").lower() == "true"
+    dbname = shard_path(db_path) if shard else db_path
+    Path(dbname).parent.mkdir(parents=True, exist_ok=True)
+    if autogen.runtime_logging.is_logging:
+        # autogen keeps one global logger; flush and close the one being replaced
+        autogen.runtime_logging.stop()
+    batched_logger = BatchedSqliteLogger({"dbname": dbname}, **logger_kwargs)
+    session_id = autogen.runtime_logging.start(logger=batched_logger)
+    logger.info(f"LOG:  Started batched runtime logging to {dbname} with session ID: {session_id}")
+    return session_id
+
+def stop_runtime_logging():
+    """Flush queued events and stop autogen runtime logging"""
+    autogen.runtime_logging.stop()
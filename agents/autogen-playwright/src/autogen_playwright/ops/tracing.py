@@ -0,0 +1,429 @@
+import os
+import json
+import time
+import uuid
+import atexit
+import logging
+import functools
+import weakref
+import threading
+import contextvars
+import urllib.request
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Environment variable used to propagate the active span into executor subprocesses
+TRACEPARENT_ENV = "AUTOGEN_PLAYWRIGHT_TRACEPARENT"
+
+_current_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar(
+    "autogen_playwright_current_span", default=None
+)
+
+
+@dataclass
+class Span:
+    """A single timed operation, modelled on the OpenTelemetry span"""
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str] = None
+    start_ns: int = field(default_factory=time.time_ns)
+    end_ns: Optional[int] = None
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    status: str = "OK"
+    # Monotonic clock used for durations, wall clock kept for export
+    _start_perf: int = field(default_factory=time.perf_counter_ns, repr=False)
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+    def elapsed_ms(self) -> float:
+        """Milliseconds since the span started (or its full duration once ended)"""
+        if self.end_ns is not None:
+            return (self.end_ns - self.start_ns) / 1e6
+        return (time.perf_counter_ns() - self._start_perf) / 1e6
+
+    def end(self):
+        if self.end_ns is None:
+            self.end_ns = self.start_ns + (time.perf_counter_ns() - self._start_perf)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_ns": self.start_ns,
+            "end_ns": self.end_ns,
+            "duration_ms": round(self.elapsed_ms(), 3),
+            "attributes": self.attributes,
+            "status": self.status,
+            "pid": os.getpid(),
+        }
+
+
+class SpanExporter:
+    """Base class for span exporters"""
+
+    def export(self, spans: List[Dict[str, Any]]):
+        raise NotImplementedError
+
+    def shutdown(self):
+        pass
+
+
+class FileSpanExporter(SpanExporter):
+    """Append finished spans as JSON lines to a local file"""
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def export(self, spans: List[Dict[str, Any]]):
+        lines = "".join(json.dumps(span, default=str) + "\n" for span in spans)
+        with self._lock, open(self.path, "a") as f:
+            f.write(lines)
+
+
+class OTLPHttpSpanExporter(SpanExporter):
+    """Send spans to an OpenTelemetry collector using OTLP/HTTP with JSON encoding"""
+
+    def __init__(self, endpoint: str, service_name: str = "autogen_playwright", timeout: float = 5.0):
+        self.endpoint = endpoint.rstrip("/")
+        if not self.endpoint.endswith("/v1/traces"):
+            self.endpoint += "/v1/traces"
+        self.service_name = service_name
+        self.timeout = timeout
+
+    @staticmethod
+    def _attribute(key: str, value: Any) -> Dict[str, Any]:
+        if isinstance(value, bool):
+            return {"key": key, "value": {"boolValue": value}}
+        if isinstance(value, int):
+            return {"key": key, "value": {"intValue": str(value)}}
+        if isinstance(value, float):
+            return {"key": key, "value": {"doubleValue": value}}
+        return {"key": key, "value": {"stringValue": str(value)}}
+
+    def export(self, spans: List[Dict[str, Any]]):
+        otlp_spans = [
+            {
+                "traceId": span["trace_id"],
+                "spanId": span["span_id"],
+                "parentSpanId": span["parent_id"] or "",
+                "name": span["name"],
+                "kind": 1,
+                "startTimeUnixNano": str(span["start_ns"]),
+                "endTimeUnixNano": str(span["end_ns"]),
+                "attributes": [self._attribute(k, v) for k, v in span["attributes"].items()],
+                "status": {"code": 1 if span["status"] == "OK" else 2},
+            }
+            for span in spans
+        ]
+        payload = {
+            "resourceSpans": [{
+                "resource": {"attributes": [self._attribute("service.name", self.service_name)]},
+                "scopeSpans": [{"scope": {"name": __name__}, "spans": otlp_spans}],
+            }]
+        }
+        request = urllib.request.Request(
+            self.endpoint,
+            data=json.dumps(payload).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        try:
+            urllib.request.urlopen(request, timeout=self.timeout).close()
+        except Exception as e:
+            logger.warning(f"Failed to export {len(spans)} spans to {self.endpoint}: {str(e)}")
+
+
+class Tracer:
+    """Collects nested spans and hands them to exporters in batches"""
+
+    def __init__(self, exporters: Optional[List[SpanExporter]] = None, enabled: bool = True,
+                 service_name: str = "autogen_playwright", batch_size: int = 64, max_finished: int = 10_000):
+        """
+        Initialize tracer
+        Args:
+            exporters: Exporters that receive finished spans
+            enabled: Whether spans are recorded at all (defaults to True)
+            service_name: Service name reported to collectors
+            batch_size: Number of finished spans buffered before exporting
+            max_finished: Recent finished spans kept in memory for spans_for_trace; older
+                ones are only available from the exporters
+        """
+        self.exporters = exporters or []
+        self.enabled = enabled
+        self.service_name = service_name
+        self.batch_size = batch_size
+        self.finished: Deque[Dict[str, Any]] = deque(maxlen=max_finished)
+        self._pending: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        _open_tracers.add(self)
+
+    @classmethod
+    def from_env(cls) -> "Tracer":
+        """Build a tracer from TRACING_* environment variables"""
+        enabled = os.getenv("TRACING_ENABLE", "false").lower() == "true"
+        exporters: List[SpanExporter] = []
+        if enabled:
+            trace_path = os.getenv("TRACING_PATH", "runtime_logs/traces.jsonl")
+            if trace_path:
+                exporters.append(FileSpanExporter(os.path.abspath(trace_path)))
+            if endpoint := os.getenv("TRACING_OTLP_ENDPOINT"):
+                exporters.append(OTLPHttpSpanExporter(endpoint))
+        return cls(exporters=exporters, enabled=enabled)
+
+    def current_span(self) -> Optional[Span]:
+        return _current_span.get()
+
+    def start_span(self, name: str, **attributes) -> Optional[Span]:
+        """
+        Start a span as a child of the current span (or of the propagated parent)
+        Args:
+            name: Span name, dotted by category (e.g. "playwright.navigate")
+            **attributes: Initial span attributes
+        Returns:
+            The started Span, or None when tracing is disabled
+        """
+        if not self.enabled:
+            return None
+        parent = _current_span.get()
+        if parent is not None:
+            trace_id, parent_id = parent.trace_id, parent.span_id
+        else:
+            trace_id, parent_id = self._remote_parent()
+        return Span(
+            name=name,
+            trace_id=trace_id,
+            span_id=uuid.uuid4().hex[:16],
+            parent_id=parent_id,
+            attributes=dict(attributes),
+        )
+
+    def end_span(self, span: Optional[Span], error: Optional[BaseException] = None):
+        if span is None:
+            return
+        if error is not None:
+            span.status = "ERROR"
+            span.set_attribute("error", str(error))
+        span.end()
+        record = span.to_dict()
+        with self._lock:
+            self.finished.append(record)
+            self._pending.append(record)
+            should_flush = len(self._pending) >= self.batch_size or span.parent_id is None
+        if should_flush:
+            self.flush()
+
+    @contextmanager
+    def span(self, name: str, **attributes) -> Iterator[Optional[Span]]:
+        """Context manager that runs the body inside a new current span"""
+        span = self.start_span(name, **attributes)
+        if span is None:
+            yield None
+            return
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            _current_span.reset(token)
+            self.end_span(span, error=e)
+            raise
+        _current_span.reset(token)
+        self.end_span(span)
+
+    def activate(self, span: Optional[Span]) -> Optional[contextvars.Token]:
+        """Make a long-lived span current; pair with deactivate()"""
+        return _current_span.set(span) if span is not None else None
+
+    def deactivate(self, token: Optional[contextvars.Token]):
+        if token is not None:
+            _current_span.reset(token)
+
+    def propagation_env(self) -> Dict[str, str]:
+        """Environment variables that let a subprocess continue the current trace"""
+        span = _current_span.get()
+        if span is None:
+            return {}
+        # Tracing is opt-in; the subprocess traces whenever its parent span does
+        env = {TRACEPARENT_ENV: f"00-{span.trace_id}-{span.span_id}-01", "TRACING_ENABLE": "true"}
+        for exporter in self.exporters:
+            if isinstance(exporter, FileSpanExporter):
+                env["TRACING_PATH"] = str(exporter.path)
+        return env
+
+    def flush(self):
+        with self._lock:
+            batch, self._pending = self._pending, []
+        if not batch:
+            return
+        for exporter in self.exporters:
+            try:
+                exporter.export(batch)
+            except Exception as e:
+                logger.warning(f"Span exporter {type(exporter).__name__} failed: {str(e)}")
+
+    def close(self):
+        """Export buffered spans and shut down the exporters"""
+        _open_tracers.discard(self)
+        self.flush()
+        for exporter in self.exporters:
+            exporter.shutdown()
+
+    def spans_for_trace(self, trace_id: str) -> List[Dict[str, Any]]:
+        """Spans of a trace seen by this process plus any exported by subprocesses"""
+        spans = {span["span_id"]: span for span in self.finished if span["trace_id"] == trace_id}
+        for exporter in self.exporters:
+            if isinstance(exporter, FileSpanExporter):
+                for span in load_spans(str(exporter.path), trace_id):
+                    spans.setdefault(span["span_id"], span)
+        return list(spans.values())
+
+    @staticmethod
+    def _remote_parent():
+        traceparent = os.getenv(TRACEPARENT_ENV, "")
+        parts = traceparent.split("-")
+        if len(parts) == 4 and len(parts[1]) == 32:
+            return parts[1], parts[2]
+        return uuid.uuid4().hex, None
+
+
+def load_spans(path: str, trace_id: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Load exported spans from a JSON lines file
+    Args:
+        path: Path written by FileSpanExporter
+        trace_id: Optional trace ID to filter by
+    Returns:
+        List of span dictionaries
+    """
+    spans = []
+    try:
+        with open(path) as f:
+            for line in f:
+                try:
+                    span = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if trace_id is None or span.get("trace_id") == trace_id:
+                    spans.append(span)
+    except FileNotFoundError:
+        logger.warning(f"Trace file {path} not found")
+    return spans
+
+
+def flame_graph(spans: List[Dict[str, Any]]) -> List[str]:
+    """
+    Build folded stacks (flamegraph.pl / speedscope format) from a trace
+    Args:
+        spans: Span dictionaries belonging to one trace
+    Returns:
+        Lines of "root;child;leaf <self time in microseconds>"
+    """
+    by_id = {span["span_id"]: span for span in spans}
+    child_time: Dict[str, float] = {}
+    for span in spans:
+        if span.get("parent_id") in by_id:
+            child_time[span["parent_id"]] = child_time.get(span["parent_id"], 0.0) + span["duration_ms"]
+
+    folded: Dict[str, int] = {}
+    for span in spans:
+        stack = []
+        node = span
+        while node is not None:
+            stack.append(node["name"])
+            node = by_id.get(node.get("parent_id"))
+        key = ";".join(reversed(stack))
+        self_ms = max(span["duration_ms"] - child_time.get(span["span_id"], 0.0), 0.0)
+        folded[key] = folded.get(key, 0) + int(self_ms * 1000)
+    return [f"{key} {value}" for key, value in sorted(folded.items()) if value > 0]
+
+
+def time_breakdown(spans: List[Dict[str, Any]]) -> Dict[str, float]:
+    """
+    Summarise self time per span category (the prefix before the first dot)
+    Args:
+        spans: Span dictionaries belonging to one trace
+    Returns:
+        Mapping of category to milliseconds, largest first
+    """
+    totals: Dict[str, float] = {}
+    for line in flame_graph(spans):
+        stack, micros = line.rsplit(" ", 1)
+        category = stack.split(";")[-1].split(".")[0]
+        totals[category] = totals.get(category, 0.0) + int(micros) / 1000
+    return dict(sorted(totals.items(), key=lambda item: item[1], reverse=True))
+
+
+def write_flame_graph(trace_id: str, output_path: str, tracer: Optional[Tracer] = None) -> str:
+    """
+    Write the folded-stack flame graph for a trace to disk
+    Args:
+        trace_id: Trace to render
+        output_path: Destination .folded file
+        tracer: Tracer to read spans from (defaults to the global tracer)
+    Returns:
+        Path of the written file
+    """
+    tracer = tracer or get_tracer()
+    tracer.flush()
+    lines = flame_graph(tracer.spans_for_trace(trace_id))
+    Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, "w") as f:
+        f.write("\n".join(lines) + "\n")
+    logger.info(f"LOG:  Wrote flame graph with {len(lines)} stacks to {output_path}")
+    return output_path
+
+
+_tracer: Optional[Tracer] = None
+_tracer_lock = threading.Lock()
+
+# Tracers not yet closed; one exit hook flushes them all without keeping them alive
+_open_tracers: "weakref.WeakSet[Tracer]" = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_open_tracers():
+    for tracer in list(_open_tracers):
+        tracer.flush()
+
+
+def get_tracer() -> Tracer:
+    """Return the process-wide tracer, creating it from the environment on first use"""
+    global _tracer
+    if _tracer is None:
+        with _tracer_lock:
+            if _tracer is None:
+                _tracer = Tracer.from_env()
+    return _tracer
+
+
+def set_tracer(tracer: Tracer):
+    global _tracer
+    _tracer = tracer
+
+
+def traced(name: Optional[str] = None, **attributes) -> Callable:
+    """
+    Decorator that wraps every call of a function in a span
+    Args:
+        name: Span name (defaults to the function's qualified name)
+        **attributes: Static attributes added to each span
+    """
+    def decorator(func: Callable) -> Callable:
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with get_tracer().span(span_name, **attributes):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
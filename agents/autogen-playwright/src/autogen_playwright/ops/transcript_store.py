@@ -0,0 +1,111 @@
+import re
+import time
+import sqlite3
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Messages matching this are flagged as test reports when they are written
+REPORT_PATTERN = re.compile("Test Summary|The execution succeeded|test scenario completed", re.IGNORECASE)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS transcripts(
+    session_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    sender TEXT,
+    content TEXT,
+    is_report INTEGER NOT NULL DEFAULT 0,
+    time REAL,
+    PRIMARY KEY (session_id, seq)
+);
+CREATE INDEX IF NOT EXISTS transcripts_reports ON transcripts(session_id, is_report, seq);
+"""
+
+class TranscriptStore:
+    """
+    Chat transcripts persisted one message at a time in SQLite.
+
+    Messages are keyed by session and sequence number, so a UI can fetch only the
+    messages after the ones it already has, and report messages are flagged on
+    write so they are found through an index instead of scanning every response.
+    """
+
+    def __init__(self, db_path: str = "runtime_logs/transcripts.db"):
+        """
+        Initialize transcript store
+        Args:
+            db_path: Path to SQLite database file
+        """
+        self.db_path = db_path
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._con = sqlite3.connect(db_path, check_same_thread=False)
+        self._con.execute("PRAGMA journal_mode=WAL")
+        self._con.executescript(SCHEMA)
+        self._lock = threading.Lock()
+
+    def append(self, session_id: str, sender: str, content: str) -> int:
+        """
+        Persist one message at the end of a session's transcript
+        Args:
+            session_id: Session (chat) the message belongs to
+            sender: Name of the agent that sent it
+            content: Message text
+        Returns:
+            Sequence number of the message within the session
+        """
+        with self._lock, self._con:
+            seq = self._con.execute(
+                "SELECT COALESCE(MAX(seq) + 1, 0) FROM transcripts WHERE session_id = ?", (session_id,)
+            ).fetchone()[0]
+            self._con.execute(
+                "INSERT INTO transcripts(session_id, seq, sender, content, is_report, time) VALUES (?, ?, ?, ?, ?, ?)",
+                (session_id, seq, sender, content, int(bool(REPORT_PATTERN.search(content or ""))), time.time()),
+            )
+        return seq
+
+    def _query(self, query: str, args: tuple) -> List[Dict]:
+        with self._lock:
+            cursor = self._con.execute(query, args)
+            column_names = [description[0] for description in cursor.description]
+            return [dict(zip(column_names, row)) for row in cursor.fetchall()]
+
+    def messages(self, session_id: str, offset: int = 0, limit: Optional[int] = None) -> List[Dict]:
+        """
+        Messages of a session in order, starting at a sequence number
+        Args:
+            session_id: Session to read
+            offset: First sequence number to return (e.g. the number of messages already loaded)
+            limit: Maximum number of messages (all when None)
+        Returns:
+            List of message dictionaries (seq, sender, content, is_report, time)
+        """
+        return self._query(
+            "SELECT seq, sender, content, is_report, time FROM transcripts"
+            " WHERE session_id = ? AND seq >= ? ORDER BY seq LIMIT ?",
+            (session_id, offset, -1 if limit is None else limit),
+        )
+
+    def count(self, session_id: str) -> int:
+        return self._query("SELECT COUNT(*) AS n FROM transcripts WHERE session_id = ?", (session_id,))[0]["n"]
+
+    def latest_report(self, session_id: str) -> Optional[str]:
+        """Content of the last report message of a session, or None"""
+        rows = self._query(
+            "SELECT content FROM transcripts WHERE session_id = ? AND is_report = 1 ORDER BY seq DESC LIMIT 1",
+            (session_id,),
+        )
+        return rows[0]["content"] if rows else None
+
+    def sessions(self, limit: int = 20) -> List[Dict]:
+        """Most recent sessions with their message counts"""
+        return self._query(
+            "SELECT session_id, COUNT(*) AS messages, MIN(time) AS started, MAX(time) AS updated"
+            " FROM transcripts GROUP BY session_id ORDER BY updated DESC LIMIT ?",
+            (limit,),
+        )
+
+    def close(self):
+        self._con.close()
@@ -2,6 +2,8 @@ from typing import Dict, Optional
 from pathlib import Path
 import logging
 from .log_analyzer import LogAnalyzer
+from .tracing import get_tracer, time_breakdown
+from .cost_tracker import CostTracker, get_cost_tracker
 
 logger = logging.getLogger(__name__)
 
@@ -30,6 +32,27 @@ def print_session_summary(session_id: Optional[str] = None, db_path: Optional[st
     
     return stats
 
+def print_cost_summary(tracker: Optional[CostTracker] = None) -> Dict:
+    """
+    Print the running token and cost totals without reading the log database
+    Args:
+        tracker: Cost tracker to report (defaults to the process-wide tracker)
+    Returns:
+        Snapshot of the tracker totals
+    """
+    stats = (tracker or get_cost_tracker()).snapshot()
+    print("\nCost Summary")
+    print("-" * 50)
+    print(f"Prompt Tokens: {stats['prompt_tokens']:,}")
+    print(f"Completion Tokens: {stats['completion_tokens']:,}")
+    print(f"Total Tokens: {stats['total_tokens']:,} (${stats['cost']:.4f})")
+    print(f"Number of Requests: {stats['requests']} (plus {stats['cached_requests']} served from the cache)")
+    for breakdown, label in (("by_agent", "Agent"), ("by_model", "Model"), ("by_scenario", "Scenario")):
+        for name, totals in stats[breakdown].items():
+            print(f"{label} {name}: {totals['total_tokens']:,} tokens (${totals['cost']:.4f}) in {totals['requests']} requests")
+    
+    return stats
+
 def analyze_conversation(session_id: str, db_path: Optional[str] = None) -> None:
     """
     Analyze and print the conversation flow for a specific session
@@ -70,6 +93,31 @@ def analyze_conversation(session_id: str, db_path: Optional[str] = None) -> None
         print(f"Token Usage - Input: {prompt_tokens}, Output: {completion_tokens}")
         print("-" * 30)
 
+def print_trace_breakdown(trace_id: str) -> Dict[str, float]:
+    """
+    Print where the time of a traced run went, by span category
+    Args:
+        trace_id: Trace ID of the run (the scenario span's trace_id)
+    Returns:
+        Dictionary of category to self time in milliseconds
+    """
+    tracer = get_tracer()
+    tracer.flush()
+    spans = tracer.spans_for_trace(trace_id)
+    breakdown = time_breakdown(spans)
+
+    print(f"\nTiming Breakdown (Trace: {trace_id})")
+    print("-" * 50)
+    if not breakdown:
+        print("No spans recorded for this trace")
+        return breakdown
+    total = sum(breakdown.values())
+    for category, millis in breakdown.items():
+        print(f"{category:<12} {millis / 1000:>9.2f}s ({millis / total:.0%})")
+    print(f"Spans recorded: {len(spans)}")
+
+    return breakdown
+
 def get_db_path(workspace_root: Optional[str] = None) -> str:
     """
     Get the path to the SQLite database
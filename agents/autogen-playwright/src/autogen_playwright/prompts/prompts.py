@@ -15,7 +15,14 @@ PlaywrightSkill Methods:
 - click_element(selector: str) -> Clicks elements
 - hover_element(selector: str) -> Hovers over elements
 - verify_element_exists(selector: str) -> Checks element presence
-- verify_text_content(text: str) -> Verifies text on page
+- verify_text_content(text: str, scope: str = None, regex: bool = False, ignore_case: bool = False,
+  timeout: int = None) -> Verifies text on page, optionally within a selector or waiting for it to appear
+- find_text(needles: list, ...) -> Match counts and locations for several texts in one call
+- verify_all(assertions: list) -> Checks several conditions in one call, e.g.
+  [{"type": "exists", "selector": "h1"}, {"type": "text_contains", "text": "Broadband"},
+   {"type": "visible" | "hoverable", "selector": ...},
+   {"type": "attribute_equals", "selector": ..., "attribute": ..., "value": ...}]
+  Returns a list with "passed" per assertion (CSS selectors only)
 - take_screenshot(name: str, full_page: bool = False) -> Captures page state
 - end_session() -> Closes browser and saves report
 
@@ -0,0 +1,101 @@
+import logging
+import statistics
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+from urllib.parse import urlsplit, urlunsplit
+from ..ops.json_file import locked_json, read_json
+
+logger = logging.getLogger(__name__)
+
+# Metrics compared against the per-URL baseline; higher is worse for all of them
+TRACKED_METRICS = ["ttfb_ms", "fcp_ms", "lcp_ms", "load_event_ms", "cls", "inp_ms", "transfer_bytes"]
+
+def url_key(url: str) -> str:
+    """Aggregate runs by scheme, host and path, ignoring query strings and fragments"""
+    parts = urlsplit(url)
+    return urlunsplit((parts.scheme, parts.netloc, parts.path or "/", "", ""))
+
+def is_complete(metrics: dict) -> bool:
+    """False for a navigation whose load event never fired, e.g. one that timed out"""
+    load_event_ms = metrics.get("load_event_ms")
+    return load_event_ms is None or load_event_ms > 0
+
+class PageMetricsStore:
+    """
+    Browser performance metrics per URL, accumulated across test runs.
+
+    Scenarios running in parallel processes share the JSON file, so each record
+    re-reads it under a file lock before adding its sample.
+    """
+
+    def __init__(self, path: Optional[Path] = None, max_samples: int = 50,
+                 min_baseline_samples: int = 3, tolerance: float = 0.2):
+        """
+        Initialize metrics store
+        Args:
+            path: JSON file holding the history (in-memory only when None)
+            max_samples: Samples kept per URL
+            min_baseline_samples: Samples needed before regressions are flagged
+            tolerance: Allowed increase over the baseline median (0.2 = 20%)
+        """
+        self.path = Path(path) if path else None
+        self.max_samples = max_samples
+        self.min_baseline_samples = min_baseline_samples
+        self.tolerance = tolerance
+        self.history: Dict[str, List[dict]] = read_json(self.path, {}) if self.path else {}
+
+    @contextmanager
+    def _update(self) -> Iterator[Dict[str, List[dict]]]:
+        """Latest history from disk, written back with the caller's changes"""
+        if not self.path:
+            yield self.history
+            return
+        with locked_json(self.path, {}) as history:
+            self.history = history
+            yield history
+
+    def baseline(self, url: str) -> Dict[str, float]:
+        """Median of each tracked metric over the stored samples for a URL"""
+        samples = self.history.get(url_key(url), [])
+        baseline = {}
+        for metric in TRACKED_METRICS:
+            values = [s[metric] for s in samples if s.get(metric) is not None]
+            if len(values) >= self.min_baseline_samples:
+                baseline[metric] = statistics.median(values)
+        return baseline
+
+    def record(self, url: str, metrics: dict, run_id: Optional[str] = None) -> List[str]:
+        """
+        Store a sample and compare it against the URL's baseline
+        Incomplete samples (the load event never fired) are neither compared nor stored.
+        Args:
+            url: Navigated URL
+            metrics: Metrics collected by PlaywrightSkill
+            run_id: Test run the sample belongs to
+        Returns:
+            Human-readable descriptions of metrics that regressed
+        """
+        if not is_complete(metrics):
+            logger.info(f"LOG:  Skipped incomplete page metrics for {url}")
+            return []
+        with self._update() as history:
+            baseline = self.baseline(url)
+            regressions = []
+            for metric, reference in baseline.items():
+                value = metrics.get(metric)
+                if value is None or reference <= 0:
+                    continue
+                if value > reference * (1 + self.tolerance):
+                    regressions.append(
+                        f"{metric} {value} vs baseline {round(reference, 3)} (+{(value / reference - 1):.0%})"
+                    )
+
+            sample = {k: metrics.get(k) for k in TRACKED_METRICS}
+            sample["run_id"] = run_id
+            sample["timestamp"] = datetime.now().isoformat()
+            samples = history.setdefault(url_key(url), [])
+            samples.append(sample)
+            del samples[:-self.max_samples]
+        return regressions
@@ -2,6 +2,7 @@ import os
 from datetime import datetime
 from typing import List, Optional
 from pathlib import Path
+from ..ops.tracing import get_tracer
 
 def find_script_root() -> Path:
     """Find the root directory relative to the script location"""
@@ -39,13 +40,27 @@ class TestReport:
             self.report_dir.mkdir(parents=True, exist_ok=True)
             print(f"\nTest reports will be saved to: {self.report_dir.absolute()}")
         
-    def add_step(self, description: str, status: str = "Success", error: Optional[str] = None):
-        """Add a test step to the report"""
+    def add_step(self, description: str, status: str = "Success", error: Optional[str] = None,
+                 metrics: Optional[dict] = None):
+        """
+        Add a test step to the report
+        Args:
+            description: What the step did
+            status: Success, Warning, Failed or Error
+            error: Optional error details
+            metrics: Optional browser performance metrics captured during the step
+        """
+        # Steps are recorded at the end of a traced skill call, so the
+        # enclosing span's elapsed time is the step duration
+        span = get_tracer().current_span()
         step = {
             "description": description,
             "status": status,
             "timestamp": datetime.now().isoformat(),
-            "error": error
+            "error": error,
+            "duration_ms": round(span.elapsed_ms(), 1) if span else None,
+            "span_id": span.span_id if span else None,
+            "metrics": metrics
         }
         self.steps.append(step)
         
@@ -98,6 +113,17 @@ class TestReport:
         print(f"{len(self.steps) + 2}. Test completed with status: {self.status}")
         print(f"\nYou can find the full test report at: {self.report_dir / 'report.md'}")
         
+    @staticmethod
+    def _format_metrics(metrics: dict) -> str:
+        """Render page performance metrics as a markdown bullet"""
+        labels = [
+            ("ttfb_ms", "TTFB", " ms"), ("fcp_ms", "FCP", " ms"), ("lcp_ms", "LCP", " ms"),
+            ("cls", "CLS", ""), ("inp_ms", "INP", " ms"), ("load_event_ms", "Load", " ms"),
+            ("resource_count", "Resources", ""), ("transfer_bytes", "Transferred", " bytes"),
+        ]
+        parts = [f"{label} {metrics[key]}{unit}" for key, label, unit in labels if metrics.get(key) is not None]
+        return f"- Performance: {', '.join(parts)}\n" if parts else ""
+
     def _generate_markdown(self):
         """Generate markdown report"""
         if not self.enabled:
@@ -117,8 +143,12 @@ class TestReport:
             report += f"\n### Step {i}: {step['description']}\n"
             report += f"- Status: {step['status']}\n"
             report += f"- Time: {step['timestamp']}\n"
+            if step.get('duration_ms') is not None:
+                report += f"- Duration: {step['duration_ms']} ms\n"
             if step.get('error'):
                 report += f"- Error: {step['error']}\n"
+            if step.get('metrics'):
+                report += self._format_metrics(step['metrics'])
                 
         if self.screenshots:
             report += "\n## Screenshots\n"
@@ -0,0 +1,42 @@
+import logging
+from pathlib import Path
+from typing import List, Tuple
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+THUMBNAIL_DIR = "thumbnails"
+THUMBNAIL_SIZE = (480, 320)
+
+def list_screenshots(run_dir: Path) -> List[Path]:
+    """Screenshots in a report run directory, oldest first"""
+    return sorted(Path(run_dir).glob("*.png"), key=lambda path: path.stat().st_mtime)
+
+def thumbnail_path(screenshot: Path, size: Tuple[int, int] = THUMBNAIL_SIZE) -> Path:
+    """Where the thumbnail of a screenshot is cached: <run_dir>/thumbnails/<stem>_<w>x<h>.jpg"""
+    screenshot = Path(screenshot)
+    return screenshot.parent / THUMBNAIL_DIR / f"{screenshot.stem}_{size[0]}x{size[1]}.jpg"
+
+def ensure_thumbnail(screenshot: Path, size: Tuple[int, int] = THUMBNAIL_SIZE) -> Path:
+    """
+    Return a cached thumbnail of a screenshot, generating it on first use
+    The thumbnail is regenerated only when the screenshot is newer than it.
+    Args:
+        screenshot: Full-resolution PNG screenshot
+        size: Bounding box the thumbnail is scaled into, keeping the aspect ratio
+    Returns:
+        Path of the JPEG thumbnail
+    """
+    screenshot = Path(screenshot)
+    thumbnail = thumbnail_path(screenshot, size)
+    if thumbnail.exists() and thumbnail.stat().st_mtime >= screenshot.stat().st_mtime:
+        return thumbnail
+
+    thumbnail.parent.mkdir(parents=True, exist_ok=True)
+    with Image.open(screenshot) as image:
+        image.thumbnail(size)
+        tmp_path = thumbnail.with_suffix(".tmp")
+        image.convert("RGB").save(tmp_path, format="JPEG", quality=80, optimize=True)
+        tmp_path.replace(thumbnail)
+    logger.debug(f"Generated thumbnail {thumbnail}")
+    return thumbnail
@@ -0,0 +1,271 @@
+"""
+JavaScript snippets injected into pages by PlaywrightSkill.
+"""
+
+# Installed with context.add_init_script so the observers exist before any page
+# script runs. Entries are buffered on window.__apPerf and read back after navigation.
+PERF_OBSERVER_SCRIPT = """
+(() => {
+    if (window.__apPerf) return;
+    const perf = window.__apPerf = { lcp: null, cls: 0, inp: null };
+    const observe = (type, callback, options = {}) => {
+        try {
+            new PerformanceObserver((list) => list.getEntries().forEach(callback))
+                .observe({ type, buffered: true, ...options });
+        } catch (e) { /* entry type not supported by this browser */ }
+    };
+
+    observe('largest-contentful-paint', (entry) => {
+        perf.lcp = entry.renderTime || entry.loadTime || entry.startTime;
+    });
+
+    // CLS is the largest session window: shifts less than 1s apart, capped at 5s
+    let windowValue = 0, windowStart = 0, lastShift = 0;
+    observe('layout-shift', (entry) => {
+        if (entry.hadRecentInput) return;
+        if (entry.startTime - lastShift > 1000 || entry.startTime - windowStart > 5000) {
+            windowValue = 0;
+            windowStart = entry.startTime;
+        }
+        windowValue += entry.value;
+        lastShift = entry.startTime;
+        perf.cls = Math.max(perf.cls, windowValue);
+    });
+
+    // INP approximated by the slowest interaction seen so far
+    observe('event', (entry) => {
+        if (!entry.interactionId) return;
+        perf.inp = Math.max(perf.inp || 0, entry.duration);
+    }, { durationThreshold: 16 });
+})();
+"""
+
+COLLECT_METRICS_SCRIPT = """
+() => {
+    const round = (value) => value == null ? null : Math.round(value * 10) / 10;
+    const nav = performance.getEntriesByType('navigation')[0];
+    const resources = performance.getEntriesByType('resource');
+    const paint = Object.fromEntries(
+        performance.getEntriesByType('paint').map((entry) => [entry.name, entry.startTime])
+    );
+    const observed = window.__apPerf || {};
+    const byType = {};
+    let transferBytes = nav ? nav.transferSize || 0 : 0;
+    for (const entry of resources) {
+        byType[entry.initiatorType] = (byType[entry.initiatorType] || 0) + 1;
+        transferBytes += entry.transferSize || 0;
+    }
+    return {
+        ttfb_ms: nav ? round(nav.responseStart - nav.startTime) : null,
+        dom_content_loaded_ms: nav ? round(nav.domContentLoadedEventEnd - nav.startTime) : null,
+        load_event_ms: nav ? round(nav.loadEventEnd - nav.startTime) : null,
+        fcp_ms: round(paint['first-contentful-paint']),
+        lcp_ms: round(observed.lcp),
+        cls: observed.cls == null ? null : Math.round(observed.cls * 1000) / 1000,
+        inp_ms: round(observed.inp),
+        resource_count: resources.length,
+        resources_by_type: byType,
+        transfer_bytes: transferBytes,
+    };
+}
+"""
+
+# Describes an element well enough to find it again after the DOM changes
+FINGERPRINT_SCRIPT = """
+(element) => ({
+    tag: element.tagName.toLowerCase(),
+    id: element.id || null,
+    role: element.getAttribute('role'),
+    name: element.getAttribute('name'),
+    type: element.getAttribute('type'),
+    aria_label: element.getAttribute('aria-label'),
+    testid: element.getAttribute('data-testid'),
+    href: element.getAttribute('href'),
+    text: (element.innerText || element.value || '').trim().replace(/\\s+/g, ' ').slice(0, 80),
+    classes: Array.from(element.classList).slice(0, 5),
+})
+"""
+
+# Scores visible elements against a stored fingerprint and returns a selector
+# for the best match, or null when nothing is similar enough. Candidates must share
+# the tag and at least one identifying attribute; text and role alone are too common.
+HEAL_SELECTOR_SCRIPT = """
+([fp, minScore]) => {
+    const weights = { id: 5, testid: 5, aria_label: 4, name: 3, text: 3, href: 2, role: 1, type: 1 };
+    const identifying = ['id', 'testid', 'aria_label', 'name'];
+    const attr = { id: 'id', testid: 'data-testid', aria_label: 'aria-label', name: 'name',
+                   href: 'href', role: 'role', type: 'type' };
+    const visible = (el) => {
+        const rect = el.getBoundingClientRect();
+        return rect.width > 0 && rect.height > 0 && getComputedStyle(el).visibility !== 'hidden';
+    };
+    let best = null, bestScore = 0;
+    for (const el of document.querySelectorAll(fp.tag || '*')) {
+        if (!visible(el)) continue;
+        let score = 0, identified = false;
+        for (const [key, weight] of Object.entries(weights)) {
+            if (fp[key] == null || fp[key] === '') continue;
+            const value = key === 'text'
+                ? (el.innerText || el.value || '').trim().replace(/\\s+/g, ' ').slice(0, 80)
+                : el.getAttribute(attr[key]);
+            if (value === fp[key]) {
+                score += weight;
+                identified = identified || identifying.includes(key);
+            }
+        }
+        if (!identified) continue;
+        score += (fp.classes || []).filter((c) => el.classList.contains(c)).length * 0.5;
+        if (score > bestScore) { best = el; bestScore = score; }
+    }
+    if (!best || bestScore < minScore) return null;
+
+    const quote = (value) => JSON.stringify(value);
+    const tag = best.tagName.toLowerCase();
+    if (best.id && document.querySelectorAll('#' + CSS.escape(best.id)).length === 1) {
+        return { selector: '#' + CSS.escape(best.id), score: bestScore };
+    }
+    for (const name of ['data-testid', 'aria-label', 'name']) {
+        const value = best.getAttribute(name);
+        if (!value) continue;
+        const selector = `${tag}[${name}=${quote(value)}]`;
+        if (document.querySelectorAll(selector).length === 1) return { selector, score: bestScore };
+    }
+    // Fall back to a structural path from the nearest ancestor with an id
+    const path = [];
+    let node = best;
+    while (node && node.nodeType === 1 && node !== document.body) {
+        if (node.id) { path.unshift('#' + CSS.escape(node.id)); break; }
+        const siblings = Array.from(node.parentNode.children).filter((s) => s.tagName === node.tagName);
+        const index = siblings.indexOf(node) + 1;
+        path.unshift(`${node.tagName.toLowerCase()}:nth-of-type(${index})`);
+        node = node.parentNode;
+    }
+    if (!path.length || !path[0].startsWith('#')) path.unshift('body');
+    return { selector: path.join(' > '), score: bestScore };
+}
+"""
+
+# Visibility and hit testing shared by BATCH_ASSERT_SCRIPT and HOVERABLE_SCRIPT
+ELEMENT_CHECKS = """
+    const isVisible = (el) => {
+        const style = getComputedStyle(el);
+        const rect = el.getBoundingClientRect();
+        return style.visibility !== 'hidden' && style.display !== 'none' && rect.width > 0 && rect.height > 0;
+    };
+    const isHoverable = (el) => {
+        if (!isVisible(el) || getComputedStyle(el).pointerEvents === 'none') return false;
+        const rect = el.getBoundingClientRect();
+        const atPoint = document.elementFromPoint(rect.left + rect.width / 2, rect.top + rect.height / 2);
+        return el === atPoint || el.contains(atPoint);
+    };
+"""
+
+# Evaluates a list of assertions in a single round trip. Selectors are plain CSS
+# (comma-separated fallbacks work natively); Playwright-only syntax such as
+# :has-text() is reported as an invalid selector for that assertion.
+BATCH_ASSERT_SCRIPT = """
+(assertions) => {""" + ELEMENT_CHECKS + """
+    return assertions.map((a) => {
+        let el = null;
+        try {
+            el = document.querySelector(a.selector || 'body');
+        } catch (e) {
+            return { passed: false, detail: `invalid selector: ${e.message}` };
+        }
+        switch (a.type) {
+            case 'exists':
+                return { passed: !!el, detail: el ? null : 'not found' };
+            case 'visible':
+                return { passed: !!el && isVisible(el), detail: el ? null : 'not found' };
+            case 'hoverable':
+                return { passed: !!el && isHoverable(el), detail: el ? null : 'not found' };
+            case 'text_contains': {
+                const text = el ? el.textContent || '' : '';
+                return { passed: !!el && text.includes(a.text), detail: el ? null : 'not found' };
+            }
+            case 'attribute_equals': {
+                const value = el ? el.getAttribute(a.attribute) : null;
+                return { passed: !!el && value === a.value, detail: el ? `actual: ${value}` : 'not found' };
+            }
+            default:
+                return { passed: false, detail: `unknown assertion type: ${a.type}` };
+        }
+    });
+}
+"""
+
+# The "hoverable" assertion of BATCH_ASSERT_SCRIPT for an element handle, so it also
+# works for elements found with Playwright-only selectors. Scrolls the element into
+# view first, since hit testing only sees the viewport.
+HOVERABLE_SCRIPT = """
+(el) => {""" + ELEMENT_CHECKS + """
+    el.scrollIntoView({ block: 'center', inline: 'center' });
+    return isHoverable(el);
+}
+"""
+
+# Searches page text in the browser and returns only counts and a few match
+# locations, so the body text never crosses into Python. Text nodes are joined
+# in-page so matches spanning inline elements (e.g. "Example <b>Domain</b>")
+# are still found, as with textContent.
+TEXT_SEARCH_SCRIPT = """
+({ needles, scope, regex, ignoreCase, maxLocations }) => {
+    const root = scope ? document.querySelector(scope) : document.body;
+    if (!root) return needles.map((needle) => ({ needle, count: 0, locations: [], error: 'scope not found' }));
+
+    const nodes = [], starts = [];
+    let text = '';
+    const walker = document.createTreeWalker(root, NodeFilter.SHOW_TEXT);
+    for (let node = walker.nextNode(); node; node = walker.nextNode()) {
+        starts.push(text.length);
+        nodes.push(node);
+        text += node.nodeValue;
+    }
+    const nodeAt = (offset) => {
+        let lo = 0, hi = starts.length - 1;
+        while (lo < hi) {
+            const mid = (lo + hi + 1) >> 1;
+            if (starts[mid] <= offset) lo = mid; else hi = mid - 1;
+        }
+        return nodes[lo];
+    };
+    const describe = (element) => {
+        if (!element) return null;
+        const tag = element.tagName.toLowerCase();
+        if (element.id) return `${tag}#${element.id}`;
+        const classes = Array.from(element.classList).slice(0, 2).map((c) => '.' + c).join('');
+        return tag + classes;
+    };
+    const escape = (value) => value.replace(/[.*+?^${}()|[\\]\\\\]/g, '\\\\$&');
+
+    return needles.map((needle) => {
+        let pattern;
+        try {
+            pattern = new RegExp(regex ? needle : escape(needle), 'g' + (ignoreCase ? 'i' : ''));
+        } catch (e) {
+            return { needle, count: 0, locations: [], error: `invalid pattern: ${e.message}` };
+        }
+        let count = 0;
+        const locations = [];
+        for (let match = pattern.exec(text); match; match = pattern.exec(text)) {
+            if (match[0].length === 0) { pattern.lastIndex++; continue; }
+            count++;
+            if (locations.length < maxLocations) {
+                const node = nodeAt(match.index);
+                locations.push({
+                    element: describe(node && node.parentElement),
+                    snippet: text.slice(Math.max(0, match.index - 30), match.index + match[0].length + 30)
+                        .replace(/\\s+/g, ' ').trim(),
+                });
+            }
+        }
+        return { needle, count, locations };
+    });
+}
+"""
+
+# Polled by wait_for_function: returns the search results once every needle is found
+WAIT_FOR_TEXT_SCRIPT = (
+    "(args) => { const results = (" + TEXT_SEARCH_SCRIPT + ")(args);"
+    " return results.every((r) => r.count > 0) ? results : false; }"
+)
@@ -1,11 +1,29 @@
-from typing import Optional
+import os
+import re
+import logging
+from typing import Dict, List, Optional, Tuple, Union
 from pathlib import Path
 from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeout
 from ..reporting.test_reporter import TestReport
+from ..reporting.page_metrics import PageMetricsStore
+from ..ops.tracing import get_tracer, traced
+from .page_scripts import (
+    PERF_OBSERVER_SCRIPT, COLLECT_METRICS_SCRIPT, BATCH_ASSERT_SCRIPT, HOVERABLE_SCRIPT, TEXT_SEARCH_SCRIPT,
+    WAIT_FOR_TEXT_SCRIPT
+)
+from .selector_cache import SelectorCache
+
+logger = logging.getLogger(__name__)
+
+NETWORK_MODES = ("live", "record", "replay")
+HAR_NOT_FOUND_POLICIES = ("abort", "fallback")
 
 class PlaywrightSkill:
     def __init__(self, report_dir: Optional[Path] = None, reporting_enabled: bool = True,
-                 timeout: int = 6000, slow_mo: int = 100):
+                 timeout: int = 6000, slow_mo: int = 100, collect_metrics: bool = True,
+                 cdp_metrics: bool = False, metrics_store: Optional[PageMetricsStore] = None,
+                 selector_cache: Optional[SelectorCache] = None, network_mode: Optional[str] = None,
+                 har_dir: Optional[Path] = None, har_not_found: Optional[str] = None):
         """
         Initialize PlaywrightSkill
         Args:
@@ -13,6 +31,16 @@ class PlaywrightSkill:
             reporting_enabled: Whether to generate reports (defaults to True)
             timeout: Default timeout in milliseconds for actions (default 5000ms)
             slow_mo: Delay between actions in milliseconds (default 100ms)
+            collect_metrics: Capture Navigation Timing and Web Vitals on navigate (defaults to True)
+            cdp_metrics: Also capture Chromium CDP Performance metrics (defaults to False)
+            metrics_store: Per-URL metrics history (defaults to page_metrics.json in the report directory)
+            selector_cache: Per-site selector cache (defaults to selector_cache.json in the report
+                directory; disable with SELECTOR_CACHE_ENABLE=false)
+            network_mode: "live", "record" (save a HAR per scenario) or "replay" (serve responses
+                from the scenario's HAR); defaults to PLAYWRIGHT_NETWORK_MODE or "live"
+            har_dir: Directory holding HAR files (defaults to PLAYWRIGHT_HAR_DIR or ./hars)
+            har_not_found: Replay policy for requests missing from the HAR: "abort" (fully offline)
+                or "fallback" (go to the network); defaults to PLAYWRIGHT_HAR_NOT_FOUND or "abort"
         """
         self.browser = None
         self.context = None
@@ -22,9 +50,33 @@ class PlaywrightSkill:
         self.reporting_enabled = reporting_enabled
         self.timeout = timeout
         self.slow_mo = slow_mo
+        self._session_span = None
+        self._session_token = None
+        self._session_network_mode = None
+        self.collect_metrics = collect_metrics
+        self.cdp_metrics = cdp_metrics
+        if metrics_store is None and collect_metrics:
+            metrics_path = (report_dir or TestReport.DEFAULT_REPORT_DIR) / "page_metrics.json"
+            metrics_store = PageMetricsStore(metrics_path if reporting_enabled else None)
+        self.metrics_store = metrics_store
+        self._cdp_session = None
+        if selector_cache is None:
+            selector_cache = SelectorCache.from_env((report_dir or TestReport.DEFAULT_REPORT_DIR) / "selector_cache.json")
+        self.selector_cache = selector_cache
+        self.network_mode = (network_mode or os.getenv("PLAYWRIGHT_NETWORK_MODE", "live")).lower()
+        if self.network_mode not in NETWORK_MODES:
+            raise ValueError(f"network_mode must be one of {NETWORK_MODES}, got {self.network_mode!r}")
+        self.har_not_found = (har_not_found or os.getenv("PLAYWRIGHT_HAR_NOT_FOUND", "abort")).lower()
+        if self.har_not_found not in HAR_NOT_FOUND_POLICIES:
+            raise ValueError(f"har_not_found must be one of {HAR_NOT_FOUND_POLICIES}, got {self.har_not_found!r}")
+        self.har_dir = Path(har_dir or os.getenv("PLAYWRIGHT_HAR_DIR", str(TestReport.DEFAULT_REPORT_DIR.parent / "hars")))
         
     def start_session(self, scenario_name: str):
         """Start a new browser session"""
+        # Every step of the scenario nests under this span until end_session
+        tracer = get_tracer()
+        self._session_span = tracer.start_span("playwright.session", scenario=scenario_name)
+        self._session_token = tracer.activate(self._session_span)
         self.report = TestReport(
             scenario_name,
             report_dir=self.report_dir,
@@ -42,51 +94,142 @@ class PlaywrightSkill:
         self.context = self.browser.new_context(
             viewport={'width': 1280, 'height': 720}
         )
+        if self.collect_metrics:
+            # Observers must be registered before page scripts run to see LCP/CLS/INP
+            self.context.add_init_script(PERF_OBSERVER_SCRIPT)
+        self._session_network_mode = self._setup_network(scenario_name)
         self.page = self.context.new_page()
         # Set default timeout for all operations
         self.page.set_default_timeout(self.timeout)
         self.report.add_step("Started browser session", "Success")
+
+    def har_path(self, scenario_name: str) -> Path:
+        """HAR file used to record or replay a scenario"""
+        slug = re.sub(r"[^a-z0-9]+", "_", scenario_name.lower()).strip("_") or "scenario"
+        return self.har_dir / f"{slug}.har"
+
+    def _setup_network(self, scenario_name: str) -> str:
+        """
+        Route the context through the scenario's HAR when recording or replaying
+        Returns:
+            Network mode of this session; a replay without a HAR runs live
+        """
+        if self.network_mode == "live":
+            return "live"
+        har_path = self.har_path(scenario_name)
+        if self.network_mode == "record":
+            har_path.parent.mkdir(parents=True, exist_ok=True)
+            # The HAR is written when the context closes in end_session
+            self.context.route_from_har(str(har_path), update=True, update_content="embed", update_mode="minimal")
+            self.report.add_step(f"Recording network traffic to {har_path}", "Success")
+            return "record"
+        if har_path.exists():
+            self.context.route_from_har(str(har_path), not_found=self.har_not_found)
+            self.report.add_step(f"Replaying network traffic from {har_path} (unmatched: {self.har_not_found})", "Success")
+            return "replay"
+        self.report.add_step(f"No HAR recorded at {har_path}, using live network", "Warning")
+        return "live"
         
+    @traced("playwright.navigate")
     def navigate(self, url: str, wait_for_load: bool = True):
         """Navigate to a URL"""
         try:
             self.page.goto(url, wait_until='networkidle' if wait_for_load else 'commit', timeout=self.timeout)
-            self.report.add_step(f"Navigated to {url}", "Success")
+            metrics = self.collect_page_metrics() if self.collect_metrics else None
+            self.report.add_step(f"Navigated to {url}", "Success", metrics=metrics)
+            self._check_page_speed(url, metrics)
         except PlaywrightTimeout as e:
-            self.report.add_step(f"Navigation timeout for {url}", "Warning", str(e))
+            metrics = self.collect_page_metrics() if self.collect_metrics else None
+            # Partial metrics go on the report step but not into the page speed history
+            self.report.add_step(f"Navigation timeout for {url}", "Warning", str(e), metrics=metrics)
             # Continue execution as page might have loaded enough
         except Exception as e:
             self.report.add_step(f"Failed to navigate to {url}", "Error", str(e))
             raise
             
+    @traced("playwright.collect_metrics")
+    def collect_page_metrics(self) -> Optional[dict]:
+        """
+        Collect browser-side performance metrics for the current page
+        Returns:
+            Navigation Timing, Web Vitals (LCP/CLS/INP), resource counts and transfer
+            sizes, plus CDP Performance metrics when enabled; None if unavailable
+        """
+        try:
+            metrics = self.page.evaluate(COLLECT_METRICS_SCRIPT)
+            if self.cdp_metrics:
+                if self._cdp_session is None:
+                    self._cdp_session = self.context.new_cdp_session(self.page)
+                    self._cdp_session.send("Performance.enable")
+                result = self._cdp_session.send("Performance.getMetrics")
+                metrics["cdp"] = {m["name"]: m["value"] for m in result.get("metrics", [])}
+            return metrics
+        except Exception as e:
+            logger.warning(f"Could not collect page metrics: {str(e)}")
+            return None
+
+    def _check_page_speed(self, url: str, metrics: Optional[dict]):
+        """Add navigation metrics to the per-URL history and report regressions against earlier runs"""
+        if not metrics or self.metrics_store is None or self._session_network_mode == "replay":
+            # Replayed responses say nothing about the real site's speed
+            return
+        for regression in self.metrics_store.record(url, metrics, run_id=self.report.run_id):
+            self.report.add_step(f"Page speed regression on {url}", "Warning", regression)
+
+    @traced("playwright.resolve_selector")
+    def _resolve_selector(self, selector: str) -> Tuple[str, str]:
+        """Try the cached or first visible alternative before waiting on the full fallback list"""
+        if self.selector_cache is None:
+            return selector, "original"
+        return self.selector_cache.resolve(self.page, selector)
+
+    def _remember_selector(self, selector: str, target: str):
+        if self.selector_cache is not None:
+            self.selector_cache.remember(self.page, selector, target)
+
+    @staticmethod
+    def _describe_selector(selector: str, target: str, resolution: str) -> str:
+        return selector if target == selector else f"{selector} (using {resolution} selector {target})"
+
+    @traced("playwright.fill_form")
     def fill_form(self, selector: str, value: str):
         """Fill a form field"""
         try:
-            self.page.fill(selector, value, timeout=self.timeout)
-            self.report.add_step(f"Filled form field {selector} with value {value}", "Success")
+            target, resolution = self._resolve_selector(selector)
+            self.page.fill(target, value, timeout=self.timeout)
+            self._remember_selector(selector, target)
+            self.report.add_step(
+                f"Filled form field {self._describe_selector(selector, target, resolution)} with value {value}",
+                "Success"
+            )
         except Exception as e:
             self.report.add_step(f"Failed to fill form field {selector}", "Error", str(e))
             raise
             
+    @traced("playwright.click_element")
     def click_element(self, selector: str):
         """Click an element"""
+        target = selector
         try:
+            target, resolution = self._resolve_selector(selector)
             # Wait for element to be visible and clickable
-            element = self.page.wait_for_selector(selector, state='visible', timeout=self.timeout)
+            element = self.page.wait_for_selector(target, state='visible', timeout=self.timeout)
             if element:
+                # Record the match before clicking, the click may navigate away
+                self._remember_selector(selector, target)
                 # Ensure element is in viewport
                 element.scroll_into_view_if_needed()
                 # Small delay to ensure element is stable
-                self.page.wait_for_timeout(500)
+                self._wait(500)
                 element.click(timeout=self.timeout)
-                self.report.add_step(f"Clicked element {selector}", "Success")
+                self.report.add_step(f"Clicked element {self._describe_selector(selector, target, resolution)}", "Success")
             else:
                 raise Exception(f"Element {selector} not found")
         except PlaywrightTimeout as e:
             self.report.add_step(f"Click timeout for {selector}", "Warning", str(e))
             # Try force click as fallback
             try:
-                self.page.evaluate(f"document.querySelector('{selector}').click()")
+                self.page.locator(target).first.evaluate("element => element.click()")
                 self.report.add_step(f"Force clicked element {selector}", "Success")
             except Exception as force_e:
                 raise Exception(f"Both normal and force click failed: {str(e)}, {str(force_e)}")
@@ -94,6 +237,7 @@ class PlaywrightSkill:
             self.report.add_step(f"Failed to click element {selector}", "Error", str(e))
             raise
             
+    @traced("playwright.verify_element_exists")
     def verify_element_exists(self, selector: str):
         """Verify an element exists"""
         try:
@@ -108,20 +252,103 @@ class PlaywrightSkill:
             self.report.add_step(f"Error verifying element {selector}", "Error", str(e))
             raise
             
-    def verify_text_content(self, text: str):
-        """Verify text exists on page"""
+    @traced("playwright.find_text")
+    def find_text(self, needles: Union[str, List[str]], scope: Optional[str] = None, regex: bool = False,
+                  ignore_case: bool = False, timeout: Optional[int] = None, max_locations: int = 5) -> List[Dict]:
+        """
+        Search page text inside the browser, without transferring the page text to Python.
+
+        Args:
+            needles: Text (or list of texts) to look for
+            scope: Optional CSS selector limiting the search (defaults to body)
+            regex: Treat needles as JavaScript regular expressions
+            ignore_case: Case-insensitive matching
+            timeout: If set, wait up to this many milliseconds for every needle to appear
+            max_locations: Maximum match locations returned per needle
+
+        Returns:
+            One dict per needle with "needle", "count" and "locations" (element and snippet)
+        """
+        if isinstance(needles, str):
+            needles = [needles]
+        args = {
+            "needles": needles,
+            "scope": scope,
+            "regex": regex,
+            "ignoreCase": ignore_case,
+            "maxLocations": max_locations,
+        }
+        if timeout:
+            try:
+                handle = self.page.wait_for_function(WAIT_FOR_TEXT_SCRIPT, arg=args, timeout=timeout, polling=100)
+                return handle.json_value()
+            except PlaywrightTimeout:
+                # Fall through and report what is there now
+                pass
+        return self.page.evaluate(TEXT_SEARCH_SCRIPT, args)
+
+    @traced("playwright.verify_text_content")
+    def verify_text_content(self, text: str, scope: Optional[str] = None, regex: bool = False,
+                            ignore_case: bool = False, timeout: Optional[int] = None):
+        """
+        Verify text exists on page
+        Args:
+            text: Text (or pattern when regex=True) to look for
+            scope: Optional CSS selector to search within (defaults to body)
+            regex: Treat text as a JavaScript regular expression
+            ignore_case: Case-insensitive matching
+            timeout: Optional milliseconds to wait for the text to appear
+        Returns:
+            bool: True if the text was found
+        """
         try:
-            content = self.page.text_content('body')
-            if text in content:
-                self.report.add_step(f"Verified text '{text}' exists on page", "Success")
+            result = self.find_text(text, scope=scope, regex=regex, ignore_case=ignore_case, timeout=timeout)[0]
+            if result["count"] > 0:
+                where = f" ({result['count']} matches, first in {result['locations'][0]['element']})"
+                self.report.add_step(f"Verified text '{text}' exists on page{where}", "Success")
                 return True
             else:
-                self.report.add_step(f"Text '{text}' not found on page", "Failed")
+                self.report.add_step(f"Text '{text}' not found on page", "Failed", result.get("error"))
                 return False
         except Exception as e:
             self.report.add_step(f"Error verifying text '{text}'", "Error", str(e))
             raise
             
+    @traced("playwright.verify_all")
+    def verify_all(self, assertions: List[Dict]) -> List[Dict]:
+        """
+        Evaluate several assertions in one injected script call instead of one round trip each.
+
+        Args:
+            assertions: List of dicts with a "type" and CSS "selector" (body when omitted):
+                - {"type": "exists", "selector": "h1"}
+                - {"type": "visible", "selector": "#menu"}
+                - {"type": "text_contains", "text": "Broadband", "selector": "main"}
+                - {"type": "attribute_equals", "selector": "input", "attribute": "name", "value": "postcode"}
+                - {"type": "hoverable", "selector": "a[aria-label=\"Broadband\"]"}
+
+        Returns:
+            List of the input assertions, each extended with "passed" (bool) and "detail"
+        """
+        try:
+            outcomes = self.page.evaluate(BATCH_ASSERT_SCRIPT, assertions)
+        except Exception as e:
+            self.report.add_step(f"Error verifying {len(assertions)} assertions", "Error", str(e))
+            raise
+
+        results = []
+        for assertion, outcome in zip(assertions, outcomes):
+            result = {**assertion, **outcome}
+            results.append(result)
+            target = assertion.get("text") or assertion.get("selector", "body")
+            self.report.add_step(
+                f"Verified {assertion.get('type')} for {target}",
+                "Success" if result["passed"] else "Failed",
+                None if result["passed"] else result.get("detail")
+            )
+        return results
+
+    @traced("playwright.hover_element")
     def hover_element(self, selector: str, timeout: Optional[int] = None):
        """
        Hover over an element with improved error handling and validation.
@@ -139,10 +366,11 @@ class PlaywrightSkill:
        try:
            # Use provided timeout or fall back to default
            actual_timeout = timeout or self.timeout
+           target, resolution = self._resolve_selector(selector)
 
            # First verify element exists and is visible
            element = self.page.wait_for_selector(
-               selector,
+               target,
                state='visible',
                timeout=actual_timeout
            )
@@ -154,68 +382,31 @@ class PlaywrightSkill:
                )
                return False
 
-           # Ensure element is in viewport
-           element.scroll_into_view_if_needed()
-
-           # Wait a moment for any animations to complete
-           self.page.wait_for_timeout(100)
-
-           # Verify element is actually hoverable (not covered/intercepted)
-           is_hoverable = self.page.evaluate("""
-               (selector) => {
-                   const element = document.querySelector(selector);
-                   if (!element) return false;
-
-                   // Check if element or its parents have pointer-events: none
-                   const style = window.getComputedStyle(element);
-                   if (style.pointerEvents === 'none') return false;
-
-                   // Check if element is covered by another element
-                   const rect = element.getBoundingClientRect();
-                   const centerX = rect.left + rect.width / 2;
-                   const centerY = rect.top + rect.height / 2;
-                   const elementAtPoint = document.elementFromPoint(centerX, centerY);
-
-                   return element.contains(elementAtPoint) || element === elementAtPoint;
-               }
-           """, selector)
-
-           if not is_hoverable:
+           # Scroll into view and check it is not covered or disabled, in one round trip
+           if not element.evaluate(HOVERABLE_SCRIPT):
                self.report.add_step(
                    f"Element {selector} found but not hoverable (might be covered or disabled)",
                    "Failed"
                )
                return False
 
-           # Perform the hover
+           # Playwright checks the element receives the pointer and raises otherwise
            element.hover(timeout=actual_timeout)
 
            # Add small delay to allow hover effects to apply
-           self.page.wait_for_timeout(50)
+           self._wait(50)
 
-           # Verify hover was successful by checking hover state
-           hover_success = self.page.evaluate("""
-               (selector) => {
-                   const element = document.querySelector(selector);
-                   if (!element) return false;
-
-                   // Check if element matches :hover pseudo-class
-                   return element.matches(':hover');
-               }
-           """, selector)
-
-           # Take screenshot if hover succeeded (useful for debugging hover-triggered elements)
-           if hover_success:
-               screenshot_name = f"hover_success_{selector.replace(' ', '_').replace('#', '')[:30]}"
-               self.take_screenshot(screenshot_name)
+           # Screenshot the hover state (useful for debugging hover-triggered elements)
+           self._remember_selector(selector, target)
+           screenshot_name = f"hover_success_{selector.replace(' ', '_').replace('#', '')[:30]}"
+           self.take_screenshot(screenshot_name)
 
-           status = "Success" if hover_success else "Failed"
            self.report.add_step(
-               f"Hovered over element {selector}",
-               status
+               f"Hovered over element {self._describe_selector(selector, target, resolution)}",
+               "Success"
            )
 
-           return hover_success
+           return True
 
        except PlaywrightTimeout as e:
            self.report.add_step(
@@ -239,6 +430,7 @@ class PlaywrightSkill:
            self.take_screenshot(screenshot_name)
            raise
             
+    @traced("playwright.take_screenshot")
     def take_screenshot(self, name: str, full_page: bool = False):
         """Take a screenshot"""
         try:
@@ -253,16 +445,33 @@ class PlaywrightSkill:
     def end_session(self, status: str = "Completed"):
         """End the browser session and save report"""
         try:
+            if self._cdp_session:
+                self._cdp_session.detach()
+                self._cdp_session = None
             if self.page:
                 self.page.close()
             if self.context:
                 self.context.close()
             if self.browser:
                 self.browser.close()
+            if self.selector_cache:
+                self.selector_cache.save()
             if self.report:
                 self.report.complete(status)
             self.report.add_step("Ended browser session", "Success")
         except Exception as e:
             if self.report:
                 self.report.add_step("Failed to end session cleanly", "Error", str(e))
-            raise 
\ No newline at end of file
+            raise
+        finally:
+            tracer = get_tracer()
+            tracer.deactivate(self._session_token)
+            tracer.end_span(self._session_span)
+            self._session_span = None
+            self._session_token = None
+            self._session_network_mode = None
+
+    @traced("wait.fixed")
+    def _wait(self, milliseconds: int):
+        """Fixed wait, traced separately so sleeps show up in the timing breakdown"""
+        self.page.wait_for_timeout(milliseconds) 
\ No newline at end of file
@@ -0,0 +1,170 @@
+import os
+import logging
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+from urllib.parse import urlsplit
+from ..ops.json_file import locked_json, read_json
+from .page_scripts import FINGERPRINT_SCRIPT, HEAL_SELECTOR_SCRIPT
+
+logger = logging.getLogger(__name__)
+
+def split_selectors(selector: str) -> List[str]:
+    """
+    Split a comma-separated fallback selector into its alternatives
+    Commas inside quotes, brackets or parentheses (e.g. ':has-text("a, b")') are kept.
+    Args:
+        selector: Selector as written by the agents
+    Returns:
+        List of individual selectors in priority order
+    """
+    parts, current, depth, quote = [], [], 0, None
+    for char in selector:
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in "\"'":
+            quote = char
+        elif char in "([":
+            depth += 1
+        elif char in ")]":
+            depth = max(depth - 1, 0)
+        elif char == "," and depth == 0:
+            parts.append("".join(current).strip())
+            current = []
+            continue
+        current.append(char)
+    parts.append("".join(current).strip())
+    return [part for part in parts if part]
+
+class SelectorCache:
+    """
+    Per-site memory of which concrete selector matched each fallback selector.
+
+    Entries are keyed by host and the selector string the agents sent, and hold the
+    winning alternative plus a fingerprint (tag, role, text, attributes) of the matched
+    element so it can be found again when none of the alternatives match any more.
+    Concurrent scenarios share the file: save() merges the entries this instance
+    changed into the file's current content under a file lock.
+    """
+
+    def __init__(self, path: Optional[Path] = None, heal_min_score: float = 5.0):
+        """
+        Initialize selector cache
+        Args:
+            path: JSON file the cache persists to (in-memory only when None)
+            heal_min_score: Minimum fingerprint similarity score to accept a healed selector; the
+                match must also share the tag and an id, data-testid, aria-label or name
+        """
+        self.path = Path(path) if path else None
+        self.heal_min_score = heal_min_score
+        self.entries: Dict[str, Dict[str, dict]] = read_json(self.path, {}) if self.path else {}
+        self.stats = {"hits": 0, "misses": 0, "healed": 0}
+        self._changed: Set[Tuple[str, str]] = set()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, default_path: Path) -> Optional["SelectorCache"]:
+        """Build a cache from SELECTOR_CACHE_* environment variables, None when disabled"""
+        if os.getenv("SELECTOR_CACHE_ENABLE", "true").lower() != "true":
+            return None
+        return cls(Path(os.getenv("SELECTOR_CACHE_PATH", str(default_path))))
+
+    def save(self):
+        """Persist the entries changed since the last save"""
+        if not self.path or not self._changed:
+            return
+        with self._lock:
+            changed, self._changed = self._changed, set()
+            with locked_json(self.path, {}) as entries:
+                for site, selector in changed:
+                    entries.setdefault(site, {})[selector] = self.entries[site][selector]
+                # Pick up what other scenarios saved meanwhile
+                self.entries = entries
+        logger.info(f"LOG:  Saved selector cache to {self.path} (stats: {self.stats})")
+
+    @staticmethod
+    def _site(page) -> str:
+        return urlsplit(page.url).netloc or "local"
+
+    def get(self, page, selector: str) -> Optional[dict]:
+        return self.entries.get(self._site(page), {}).get(selector)
+
+    @staticmethod
+    def _is_visible(page, selector: str) -> bool:
+        """Immediate visibility probe; never waits for the selector to appear"""
+        try:
+            return page.locator(selector).first.is_visible()
+        except Exception:
+            return False
+
+    def resolve(self, page, selector: str) -> Tuple[str, str]:
+        """
+        Pick the selector to act on without waiting through every alternative
+        Args:
+            page: Playwright page
+            selector: Selector as written by the agents, possibly comma-separated
+        Returns:
+            Tuple of (selector to use, how it was resolved: "cached", "probed", "healed" or "original")
+        """
+        entry = self.get(page, selector)
+        if entry and self._is_visible(page, entry["winner"]):
+            self.stats["hits"] += 1
+            return entry["winner"], "cached"
+        self.stats["misses"] += 1
+
+        alternatives = split_selectors(selector)
+        if len(alternatives) > 1:
+            for alternative in alternatives:
+                if self._is_visible(page, alternative):
+                    return alternative, "probed"
+
+        if entry and entry.get("fingerprint"):
+            try:
+                healed = page.evaluate(HEAL_SELECTOR_SCRIPT, [entry["fingerprint"], self.heal_min_score])
+            except Exception as e:
+                logger.warning(f"Selector healing failed for {selector}: {str(e)}")
+                healed = None
+            if healed:
+                self.stats["healed"] += 1
+                logger.info(f"LOG:  Healed selector {selector} -> {healed['selector']} (score {healed['score']})")
+                return healed["selector"], "healed"
+
+        # Nothing visible yet: let Playwright wait on the full selector as before
+        return selector, "original"
+
+    def remember(self, page, selector: str, matched: str):
+        """
+        Record the alternative that matched and the fingerprint of its element
+        Args:
+            page: Playwright page
+            selector: Selector as written by the agents
+            matched: Selector that was actually acted on
+        """
+        site_entries = self.entries.setdefault(self._site(page), {})
+        previous = site_entries.get(selector, {})
+        if previous.get("winner") == matched and previous.get("fingerprint"):
+            # Cache hit: skip re-fingerprinting to keep the hot path at one round trip
+            previous["hits"] = previous.get("hits", 0) + 1
+            self._changed.add((self._site(page), selector))
+            return
+
+        if matched == selector and len(split_selectors(selector)) > 1:
+            # The full group matched after waiting; find out which alternative it was
+            matched = next(
+                (alt for alt in split_selectors(selector) if self._is_visible(page, alt)), selector
+            )
+        try:
+            fingerprint = page.locator(matched).first.evaluate(FINGERPRINT_SCRIPT)
+        except Exception as e:
+            logger.debug(f"Could not fingerprint {matched}: {str(e)}")
+            fingerprint = None
+
+        site_entries[selector] = {
+            "winner": matched,
+            "fingerprint": fingerprint or previous.get("fingerprint"),
+            "hits": previous.get("hits", 0) + 1,
+            "updated": datetime.now().isoformat(),
+        }
+        self._changed.add((self._site(page), selector))
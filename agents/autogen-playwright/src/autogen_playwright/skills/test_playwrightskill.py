@@ -1,9 +1,13 @@
+import os
 from autogen_playwright import PlaywrightSkill
 
+# Replay recorded HARs by default; record them with PLAYWRIGHT_NETWORK_MODE=record
+NETWORK_MODE = os.getenv("PLAYWRIGHT_NETWORK_MODE", "replay")
+
 def test_ee_broadband_page_navigation_and_validation():
     try:
         # Initialize browser session
-        pws = PlaywrightSkill()
+        pws = PlaywrightSkill(network_mode=NETWORK_MODE)
         pws.start_session('EE Broadband Page Navigation and Validation')
         
         # Step 1: Navigate to ee.co.uk
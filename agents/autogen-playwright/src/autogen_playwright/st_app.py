@@ -13,61 +13,103 @@ import subprocess
 sys.path.append(str(Path(__file__).parent.parent.parent))
 
 from src.autogen_playwright.prompts.prompts import WEB_TESTER_PROMPT
-from src.autogen_playwright.ops.log_analyzer import LogAnalyzer
+from src.autogen_playwright.ops.runtime_logger import start_runtime_logging
+from src.autogen_playwright.ops.cost_tracker import CostTracker, BudgetExceededError
+from src.autogen_playwright.ops.job_queue import Job, JobQueue
+from src.autogen_playwright.ops.transcript_store import TranscriptStore
+from src.autogen_playwright.reporting.thumbnails import ensure_thumbnail, list_screenshots
 import streamlit as st
-import asyncio
 from autogen import AssistantAgent, UserProxyAgent, get_config_list
 import os
+import re
+import math
+import time
+import shutil
 import logging
-import autogen.runtime_logging
 import tempfile
+from typing import List, Optional
 
+# Configure logging; a no-op on reruns, once the root logger has a handler
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
 logger = logging.getLogger(__name__)
 
 # setup page title and description
 st.set_page_config(page_title="AutoGen Chat app", page_icon="🤖", layout="wide")
 
-# Install Playwright browsers
-try:
-    subprocess.run(
-        ["playwright", "install", "chromium"],
-        check=True,
-        capture_output=True
-    )
-except subprocess.CalledProcessError as e:
-    st.error(f"Failed to install Playwright browsers: {e.stderr.decode()}")
+# Seconds between reruns while a test job is running
+POLL_INTERVAL = 1.0
+# Thumbnails shown per gallery page
+GALLERY_PAGE_SIZE = 6
+# TestReport prints each run's directory; the executor output carries it back into the chat
+RUN_DIR_PATTERN = re.compile(r"Test reports will be saved to: (.+)")
+
+@st.cache_resource
+def ensure_playwright_browsers() -> Optional[str]:
+    """Install Playwright browsers once per process; returns the error output on failure"""
+    try:
+        subprocess.run(
+            ["playwright", "install", "chromium"],
+            check=True,
+            capture_output=True
+        )
+        return None
+    except subprocess.CalledProcessError as e:
+        return e.stderr.decode()
+
+install_error = ensure_playwright_browsers()
+if install_error:
+    st.error(f"Failed to install Playwright browsers: {install_error}")
     st.stop()
 
 # Add warning banner
 st.warning("⚠️ This Streamlit interface is only for demonstration purposes", icon="⚠️")
 
-# Setup AutoGen Runtime Logging with SQLite
+# Setup AutoGen Runtime Logging with SQLite, shared by every session in this process
 db_path = Path("runtime_logs/autogen_logs.db")
-db_path.parent.mkdir(exist_ok=True)
-logging_config = {
-    "dbname": str(db_path),
-    "table_name": "agent_logs",
-    "create_table": True
-}
-logging_session_id = autogen.runtime_logging.start(config=logging_config)
-logger.info(f"Started autogen runtime logging with session ID: {logging_session_id}")
+
+@st.cache_resource
+def init_runtime_logging() -> str:
+    session_id = start_runtime_logging(str(db_path))
+    logger.info(f"Started autogen runtime logging with session ID: {session_id}")
+    return session_id
+
+logging_session_id = init_runtime_logging()
+
+@st.cache_resource
+def get_job_queue() -> JobQueue:
+    """Worker pool shared by all users; tests beyond STREAMLIT_MAX_WORKERS wait in the queue"""
+    return JobQueue(max_workers=int(os.getenv("STREAMLIT_MAX_WORKERS", "2")))
+
+job_queue = get_job_queue()
+
+@st.cache_resource
+def get_transcript_store() -> TranscriptStore:
+    """Chat messages persisted per session (job), one row per message"""
+    return TranscriptStore("runtime_logs/transcripts.db")
+
+transcript_store = get_transcript_store()
+
+def load_transcript(session_id: str) -> List[dict]:
+    """Messages of a session, fetching only those added since the last rerun"""
+    cached = st.session_state.setdefault("transcripts", {}).setdefault(session_id, [])
+    cached.extend(transcript_store.messages(session_id, offset=len(cached)))
+    return cached
 
 # Create a custom temporary directory
 TEMP_DIR = Path("./temp")
 TEMP_DIR.mkdir(exist_ok=True)
 logger.info(f"Created temporary directory at {TEMP_DIR}")
 
-def cleanup_temp_files():
-    """Clean up temporary files after execution"""
+def cleanup_temp_files(work_dir: Path):
+    """Clean up a job's temporary files after execution"""
     try:
-        for file in TEMP_DIR.glob("*"):
-            try:
-                file.unlink()
-                logger.debug(f"Deleted temporary file: {file}")
-            except Exception as e:
-                logger.warning(f"Failed to delete {file}: {e}")
+        shutil.rmtree(work_dir, ignore_errors=True)
+        logger.debug(f"Deleted temporary directory: {work_dir}")
     except Exception as e:
-        logger.warning(f"Failed to cleanup temp directory: {e}")
+        logger.warning(f"Failed to cleanup temp directory {work_dir}: {e}")
 
 # Add custom CSS for the chat container
 st.markdown("""
@@ -115,17 +157,49 @@ with st.expander("How to use the Testing Agent", expanded=False):
 st.markdown("Start by providing your OpenAI API key in the sidebar →")
 
 
+def render_cost_stats(tracker: CostTracker):
+    """Redraw the sidebar token usage stats from the in-memory tracker"""
+    stats = tracker.snapshot()
+    with cost_stats.container():
+        cap = f" of ${stats['max_cost']}" if stats["max_cost"] else ""
+        st.markdown(f"💰 Total Cost: ${stats['cost']}{cap}")
+        st.markdown(f"🔤 Total Tokens: {stats['total_tokens']}")
+        st.markdown(f"📤 Prompt Tokens: {stats['prompt_tokens']}")
+        st.markdown(f"📥 Completion Tokens: {stats['completion_tokens']}")
+        st.markdown(f"📝 Total Requests: {stats['requests']}")
+        st.markdown(f"♻️ Cached Responses: {stats['cached_requests']}")
+        for agent_name, totals in stats["by_agent"].items():
+            st.markdown(f"🤖 {agent_name}: {totals['total_tokens']} tokens (${totals['cost']})")
+
+
+def message_content(message) -> str:
+    return message if isinstance(message, str) else str(message.get("content") or "")
+
+
+def track_message(job: Job, sender_name: str, message):
+    """Persist a chat message under the job and note any report run directory it mentions"""
+    content = message_content(message)
+    transcript_store.append(job.id, sender_name, content)
+    for run_dir in RUN_DIR_PATTERN.findall(content):
+        run_dirs = job.progress.setdefault("run_dirs", [])
+        if run_dir.strip() not in run_dirs:
+            run_dirs.append(run_dir.strip())
+
+
 class TrackableAssistantAgent(AssistantAgent):
     """
     A custom AssistantAgent that tracks the messages it receives.
 
-    This is done by overriding the `_process_received_message` method.
+    This is done by overriding the `_process_received_message` method. Agents run on
+    a worker thread, so messages are persisted under the job's session and rendered
+    when the UI polls.
     """
 
+    job: Optional[Job] = None
+
     def _process_received_message(self, message, sender, silent):
-        with chat_history:
-            with st.chat_message(sender.name):
-                st.markdown(message)
+        if self.job is not None:
+            track_message(self.job, sender.name, message)
         return super()._process_received_message(message, sender, silent)
 
 
@@ -133,16 +207,84 @@ class TrackableUserProxyAgent(UserProxyAgent):
     """
     A custom UserProxyAgent that tracks the messages it receives.
 
-    This is done by overriding the `_process_received_message` method.
+    This is done by overriding the `_process_received_message` method. Agents run on
+    a worker thread, so messages are persisted under the job's session and rendered
+    when the UI polls.
     """
 
+    job: Optional[Job] = None
+
     def _process_received_message(self, message, sender, silent):
-        with chat_history:
-            with st.chat_message(sender.name):
-                st.markdown(message)
+        if self.job is not None:
+            track_message(self.job, sender.name, message)
         return super()._process_received_message(message, sender, silent)
 
 
+def run_chat_job(job: Job, steps_formatted: str, llm_config: dict, model: str,
+                 max_turns: int, max_replies: int, spend_cap: float) -> dict:
+    """
+    Run one test chat on a worker thread
+    Args:
+        job: Job to report messages and progress on
+        steps_formatted: Numbered test steps sent to the assistant
+        llm_config: autogen LLM config
+        model: Selected model name, for cost tracking
+        max_turns: Maximum conversation turns
+        max_replies: Maximum consecutive auto-replies
+        spend_cap: Spend cap in USD (0 for none)
+    Returns:
+        Dictionary with the test report message, if the agents produced one
+    """
+    work_dir = TEMP_DIR / job.id
+    work_dir.mkdir(parents=True, exist_ok=True)
+    try:
+        # create an AssistantAgent instance named "assistant"
+        assistant = TrackableAssistantAgent(name="assistant", system_message=WEB_TESTER_PROMPT, llm_config=llm_config)
+
+        # create a UserProxyAgent instance named "user"
+        # human_input_mode is set to "NEVER" to prevent the agent from asking for user input
+        user_proxy = TrackableUserProxyAgent(
+            name="user",
+            human_input_mode="NEVER",
+            llm_config=llm_config,
+            is_termination_msg=lambda x: x.get("content", "").strip().endswith("TERMINATE") or any(phrase in x.get("content", "") for phrase in ["Test Summary", "If you have any further questions", "The execution succeeded"]),
+            code_execution_config={
+                "use_docker": False,
+                "work_dir": str(work_dir),
+                "last_n_messages": 3
+            }
+        )
+        assistant.job = user_proxy.job = job
+
+        # Track spend from LLM responses as they arrive; the cap stops further calls
+        cost_tracker = CostTracker(max_cost=spend_cap or None)
+        cost_tracker.instrument(assistant, model=model)
+        cost_tracker.instrument(user_proxy, model=model)
+        job.progress["cost_tracker"] = cost_tracker
+
+        try:
+            user_proxy.initiate_chat(
+                assistant,
+                message=steps_formatted,
+                max_consecutive_auto_reply=max_replies,
+                max_turns=max_turns,
+                is_termination_msg=lambda x: (
+                    job.cancelled or
+                    x.get("content", "").strip().endswith("TERMINATE") or
+                    any(phrase in x.get("content", "") for phrase in ["Test Summary", "The execution succeeded"])
+                ),
+            )
+        except BudgetExceededError as e:
+            job.progress["stopped"] = str(e)
+
+        # The test report is the last message flagged as a report when it was stored
+        return {"report": transcript_store.latest_report(job.id)}
+    finally:
+        # Clean up temporary files
+        cleanup_temp_files(work_dir)
+        logger.info(f"Cleaned up temporary files for job {job.id}")
+
+
 # add placeholders for selected model and key
 selected_model = None
 selected_key = None
@@ -184,6 +326,23 @@ with st.sidebar:
     st.header("Test Configuration")
     max_turns = st.slider("Maximum Conversation Turns", min_value=1, max_value=10, value=5)
     max_replies = st.slider("Maximum Consecutive Auto-Replies", min_value=1, max_value=5, value=2)
+    spend_cap = st.number_input("Spend Cap (USD, 0 for none)", min_value=0.0, value=1.0, step=0.5)
+
+    st.markdown("---")
+    st.header("Token Usage Stats")
+    cost_stats = st.empty()
+
+    st.markdown("---")
+    st.header("Session History")
+    history = {row["session_id"]: row for row in transcript_store.sessions()}
+    if history:
+        previous_session = st.selectbox(
+            "Previous Sessions", list(history),
+            format_func=lambda x: f"{time.strftime('%Y-%m-%d %H:%M', time.localtime(history[x]['updated']))}"
+                                  f" ({history[x]['messages']} messages)"
+        )
+        if st.button("Open Session", use_container_width=True):
+            st.session_state.job_id = previous_session
 
 def get_reports_dir() -> Path:
     """Get the reports directory relative to this script's location"""
@@ -196,6 +355,59 @@ def get_reports_dir() -> Path:
     print(project_root)
     return project_root / "reports"
 
+def run_mtime(run_dir: Path) -> float:
+    """Latest change to a run: the directory (screenshots added) or its report"""
+    report_file = run_dir / "report.md"
+    return max(run_dir.stat().st_mtime, report_file.stat().st_mtime if report_file.exists() else 0)
+
+@st.cache_data(show_spinner=False)
+def load_report(run_dir: str, mtime: float) -> Optional[str]:
+    """Report markdown for a run, memoized per run and modification time"""
+    report_file = Path(run_dir) / "report.md"
+    return report_file.read_text() if report_file.exists() else None
+
+@st.cache_data(show_spinner=False)
+def load_screenshots(run_dir: str, mtime: float) -> List[str]:
+    """Screenshot paths for a run, memoized per run and modification time"""
+    return [str(path) for path in list_screenshots(Path(run_dir))]
+
+def render_screenshots(run_dir: Path, key: str):
+    """
+    Paginated screenshot gallery; thumbnails are generated only for the page shown
+    Args:
+        run_dir: Report run directory
+        key: Widget key prefix, unique per gallery on the page
+    """
+    screenshots = load_screenshots(str(run_dir), run_mtime(run_dir))
+    if not screenshots:
+        st.info("No screenshots found in this test run")
+        return
+
+    st.markdown("## Test Screenshots")
+    pages = math.ceil(len(screenshots) / GALLERY_PAGE_SIZE)
+    page = 1
+    if pages > 1:
+        page = st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, value=1, key=f"{key}_page")
+    page_screenshots = screenshots[(page - 1) * GALLERY_PAGE_SIZE:page * GALLERY_PAGE_SIZE]
+
+    # Create columns for screenshots
+    cols = st.columns(2)
+    for idx, screenshot in enumerate(page_screenshots):
+        with cols[idx % 2]:
+            st.image(
+                str(ensure_thumbnail(Path(screenshot))),
+                caption=f"Step: {Path(screenshot).stem}",
+                use_column_width=True
+            )
+
+    # Full-resolution images are only sent on request
+    full_size = st.selectbox(
+        "View full size", [None] + page_screenshots, key=f"{key}_full",
+        format_func=lambda x: "-" if x is None else Path(x).stem
+    )
+    if full_size:
+        st.image(full_size, caption=f"Step: {Path(full_size).stem}", use_column_width=True)
+
 # setup main area: user input and chat messages
 chat_container = st.container()
 with chat_container:
@@ -218,43 +430,47 @@ with chat_container:
                         format_func=lambda x: f"Run {x.split('_')[1]}_{x.split('_')[2]}"
                     )
                 with col2:
-                    load_report = st.button("🔄 Load Report", type="primary", use_container_width=True)
+                    if st.button("🔄 Load Report", type="primary", use_container_width=True):
+                        # Remembered so paging through the gallery keeps the report open
+                        st.session_state.loaded_run = selected_run
                 
-                if load_report:
+                if st.session_state.get("loaded_run") == selected_run:
                     selected_dir = reports_dir / selected_run
                     # Load and display the report
-                    report_file = selected_dir / "report.md"
-                    if report_file.exists():
+                    report_content = load_report(str(selected_dir), run_mtime(selected_dir))
+                    if report_content:
                         st.markdown("## Test Execution Report")
-                        with report_file.open() as f:
-                            report_content = f.read()
-                            st.markdown(report_content)
+                        st.markdown(report_content)
                     
                     # Display screenshots from the run directory
-                    screenshots = list(selected_dir.glob("*.png"))
-                    if screenshots:
-                        st.markdown("## Test Screenshots")
-                        # Sort screenshots by creation time
-                        screenshots.sort(key=lambda x: x.stat().st_mtime)
-                        # Create columns for screenshots
-                        cols = st.columns(2)
-                        for idx, screenshot in enumerate(screenshots):
-                            with cols[idx % 2]:
-                                st.image(
-                                    str(screenshot),
-                                    caption=f"Step: {screenshot.stem}",
-                                    use_column_width=True
-                                )
-                    else:
-                        st.info("No screenshots found in this test run")
+                    render_screenshots(selected_dir, key="loaded_run")
             else:
                 st.warning("No test reports found")
         else:
             st.warning("Reports directory not found")
     
     with chat_tab:
+        session_id = st.session_state.get("job_id")
+        current_job = job_queue.get(session_id) if session_id else None
+
         # Create a container for the chat history with a fixed height
         chat_history = st.container()
+        with chat_history:
+            if session_id:
+                for message in load_transcript(session_id):
+                    with st.chat_message(message["sender"]):
+                        st.markdown(message["content"])
+            if current_job is not None:
+                if current_job.status == "queued":
+                    st.info(f"Test queued (position {job_queue.position(current_job.id)})")
+                elif current_job.status == "running":
+                    st.caption("Test running...")
+                elif current_job.status == "failed":
+                    st.error(f"Test failed: {current_job.error}")
+                elif current_job.status == "cancelled":
+                    st.warning("Test stopped")
+                if current_job.progress.get("stopped"):
+                    st.warning(f"Stopped the test: {current_job.progress['stopped']}", icon="⚠️")
         
         # Add a horizontal line to separate chat and input
         st.markdown("---")
@@ -267,7 +483,8 @@ with chat_container:
         with button_col:
             st.markdown("<br>", unsafe_allow_html=True)  # Add some spacing
             if st.button("🛑 Stop", type="secondary", use_container_width=True):
-                st.session_state.should_stop = True
+                if current_job is not None:
+                    job_queue.cancel(current_job.id)
                 st.rerun()
         
         # Add the send button below the input
@@ -283,7 +500,7 @@ with chat_container:
         
         steps_formatted = "\n".join(f"{i+1}. {step}" for i, step in enumerate(steps))
         
-        # Process input when send is pressed
+        # Queue the test when send is pressed; it runs on the worker pool
         if send_pressed:
             if not user_input:  # Skip if user input is empty
                 st.stop()
@@ -291,6 +508,10 @@ with chat_container:
             if not selected_key or not selected_model:
                 st.warning("You must provide valid API key and choose preferred model", icon="⚠️")
                 st.stop()
+
+            if current_job is not None and not current_job.done:
+                st.warning("A test is already running; stop it before starting another", icon="⚠️")
+                st.stop()
             
             # setup request timeout and config list
             if llm_provider == "OpenAI":
@@ -323,128 +544,42 @@ with chat_container:
                 "seed": 42,  # seed for reproducibility
                 "temperature": 0  # temperature of 0 means deterministic output
             }
-            # create an AssistantAgent instance named "assistant"
-            assistant = TrackableAssistantAgent(name="assistant", system_message=WEB_TESTER_PROMPT, llm_config=llm_config)
-
-            # create a UserProxyAgent instance named "user"
-            # human_input_mode is set to "NEVER" to prevent the agent from asking for user input
-            user_proxy = TrackableUserProxyAgent(
-                name="user",
-                human_input_mode="NEVER",
-                llm_config=llm_config,
-                is_termination_msg=lambda x: x.get("content", "").strip().endswith("TERMINATE") or any(phrase in x.get("content", "") for phrase in ["Test Summary", "If you have any further questions", "The execution succeeded"]),
-                code_execution_config={
-                    "use_docker": False,
-                    "work_dir": str(TEMP_DIR),
-                    "last_n_messages": 3
-                }
-            )
-
-            # Create an event loop: this is needed to run asynchronous functions
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-
-            # Define an asynchronous function: this is needed to use await
-            if "chat_initiated" not in st.session_state:
-                st.session_state.chat_initiated = False  # Initialize the session state
-
-            if not st.session_state.chat_initiated:
-                # Initialize should_stop state if not exists
-                if 'should_stop' not in st.session_state:
-                    st.session_state.should_stop = False
-
-                async def initiate_chat():
-                    try:
-                        await user_proxy.a_initiate_chat(
-                            assistant,
-                            message=steps_formatted,
-                            max_consecutive_auto_reply=max_replies,
-                            max_turns=max_turns,
-                            is_termination_msg=lambda x: (
-                                st.session_state.should_stop or 
-                                x.get("content", "").strip().endswith("TERMINATE") or 
-                                any(phrase in x.get("content", "") for phrase in ["Test Summary", "The execution succeeded"])
-                            ),
-                        )
-                        
-                        # Get and display token usage statistics using LogAnalyzer
-                        log_analyzer = LogAnalyzer(str(db_path))
-                        stats = log_analyzer.get_session_stats(logging_session_id)
-                        
-                        if stats:
-                            st.sidebar.markdown("---")
-                            st.sidebar.header("Token Usage Stats")
-                            st.sidebar.markdown(f"💰 Total Cost: ${stats['total_cost']}")
-                            st.sidebar.markdown(f"🔤 Total Tokens: {stats['total_tokens']}")
-                            st.sidebar.markdown(f"📤 Prompt Tokens: {stats['prompt_tokens']}")
-                            st.sidebar.markdown(f"📥 Completion Tokens: {stats['completion_tokens']}")
-                            st.sidebar.markdown(f"📊 Average Tokens/Request: {stats['average_tokens_per_request']}")
-                            st.sidebar.markdown(f"📝 Total Requests: {stats['request_count']}")
-                        
-                        # Get conversation flow to extract the test report
-                        conversation = log_analyzer.get_conversation_flow(logging_session_id)
-                        if not conversation.empty:
-                            # Find messages containing Test Summary or execution success
-                            report_messages = conversation[
-                                conversation['response_content'].str.contains(
-                                    'Test Summary|The execution succeeded|test scenario completed', 
-                                    case=False, 
-                                    na=False
-                                )
-                            ]
-                            
-                            if not report_messages.empty:
-                                with report_tab:
-                                    st.markdown("## Test Execution Report")
-                                    # Get the last report message
-                                    report_content = report_messages.iloc[-1]['response_content']
-                                    
-                                    # Format the report content
-                                    if "```" in report_content:
-                                        # If there's a code block, preserve it
-                                        st.markdown(report_content)
-                                    else:
-                                        # Otherwise, format with markdown
-                                        st.markdown(f"""
-                                        {report_content}
-                                        """)
-                                    
-                                    # Find the latest report directory
-                                    reports_dir = get_reports_dir()
-                                    if reports_dir.exists():
-                                        run_dirs = sorted(list(reports_dir.glob("run_*")), reverse=True)
-                                        if run_dirs:
-                                            latest_run = run_dirs[0]
-                                            # Display screenshots from the run directory
-                                            screenshots = list(latest_run.glob("*.png"))
-                                            if screenshots:
-                                                st.markdown("## Test Screenshots")
-                                                # Sort screenshots by creation time
-                                                screenshots.sort(key=lambda x: x.stat().st_mtime)
-                                                # Create columns for screenshots
-                                                cols = st.columns(2)
-                                                for idx, screenshot in enumerate(screenshots):
-                                                    with cols[idx % 2]:
-                                                        st.image(
-                                                            str(screenshot),
-                                                            caption=f"Step: {screenshot.stem}",
-                                                            use_column_width=True
-                                                        )
-                                            else:
-                                                st.info("No screenshots were captured during this test run")
-                    
-                    finally:
-                        # Clean up temporary files
-                        cleanup_temp_files()
-                        logger.info("Cleaned up temporary files")
-
-                # Run the asynchronous function within the event loop
-                loop.run_until_complete(initiate_chat())
 
-                # Close the event loop
-                loop.close()
+            job = job_queue.submit(
+                steps[0] if steps else "test", run_chat_job, steps_formatted, llm_config,
+                selected_model, max_turns, max_replies, spend_cap
+            )
+            st.session_state.job_id = job.id
+            st.rerun()
+
+if current_job is not None and "cost_tracker" in current_job.progress:
+    render_cost_stats(current_job.progress["cost_tracker"])
+
+if session_id and (current_job is None or current_job.done):
+    report = transcript_store.latest_report(session_id)
+    if report:
+        with report_tab:
+            st.markdown("## Test Execution Report")
+            # Format the report content
+            if "```" in report:
+                # If there's a code block, preserve it
+                st.markdown(report)
+            else:
+                # Otherwise, format with markdown
+                st.markdown(f"""
+                {report}
+                """)
+            
+            # Display screenshots from this job's own (latest) report run
+            if current_job is not None:
+                run_dirs = [Path(d) for d in current_job.progress.get("run_dirs", []) if Path(d).is_dir()]
+                if run_dirs:
+                    render_screenshots(run_dirs[-1], key="job_run")
 
-                st.session_state.chat_initiated = True  # Set the state to True after running the chat
+# Poll the job until it finishes; each rerun loads only the messages received since the last one
+if current_job is not None and not current_job.done:
+    time.sleep(POLL_INTERVAL)
+    st.rerun()
 
 # stop app after termination command
-st.stop()
\ No newline at end of file
+st.stop()
@@ -0,0 +1,11 @@
+"""
+Local fixtures for testing and benchmarking without external sites.
+"""
+
+from .mock_site import MockSite
+from .fake_llm import FakeLLMServer
+
+__all__ = [
+    'MockSite',
+    'FakeLLMServer'
+]
@@ -0,0 +1,126 @@
+import json
+import time
+import logging
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+class FakeLLMServer:
+    """
+    Local stand-in for the OpenAI chat-completions endpoint that replays scripted responses.
+
+    Responses are chosen by matching substrings of the request's system message, so each
+    agent can follow its own script; each script cycles once exhausted. Requests whose
+    system message matches no key use the "default" script.
+    """
+
+    def __init__(self, responses: Dict[str, List[str]], latency_ms: int = 0,
+                 completion_tokens: Optional[int] = None, host: str = "127.0.0.1", port: int = 0):
+        """
+        Initialize fake LLM server
+        Args:
+            responses: Mapping of system-message substring to the replies to return in order
+            latency_ms: Delay before every response, to mimic model latency
+            completion_tokens: Fixed completion token count to report (defaults to len(text) // 4)
+            host: Interface to bind
+            port: Port to bind (0 picks a free port)
+        """
+        self.responses = responses
+        self.latency_ms = latency_ms
+        self.completion_tokens = completion_tokens
+        self.host = host
+        self.port = port
+        self.request_count = 0
+        self._positions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}/v1"
+
+    def config(self, model: str = "fake-gpt-4") -> Dict[str, str]:
+        """autogen config entry pointing at this server"""
+        return {"model": model, "base_url": self.base_url, "api_key": "fake-key"}
+
+    def reset(self):
+        with self._lock:
+            self._positions.clear()
+            self.request_count = 0
+
+    def start(self) -> "FakeLLMServer":
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                server._handle(self)
+
+            def log_message(self, format, *args):
+                logger.debug("FakeLLMServer: " + format, *args)
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        threading.Thread(target=self._server.serve_forever, name="fake-llm", daemon=True).start()
+        logger.info(f"LOG:  Fake LLM serving at {self.base_url}")
+        return self
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "FakeLLMServer":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def next_response(self, messages: List[dict]) -> str:
+        """Pick the next scripted reply for the agent that sent these messages"""
+        system = next((m.get("content") or "" for m in messages if m.get("role") == "system"), "")
+        key = next((k for k in self.responses if k != "default" and k in system), "default")
+        script = self.responses.get(key) or [""]
+        with self._lock:
+            position = self._positions.get(key, 0)
+            self._positions[key] = position + 1
+            self.request_count += 1
+        return script[position % len(script)]
+
+    def _handle(self, request: BaseHTTPRequestHandler):
+        if not request.path.rstrip("/").endswith("/chat/completions"):
+            request.send_error(404)
+            return
+        length = int(request.headers.get("Content-Length", 0))
+        body = json.loads(request.rfile.read(length) or b"{}")
+        messages = body.get("messages", [])
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+
+        content = self.next_response(messages)
+        prompt_tokens = sum(len(str(m.get("content") or "")) for m in messages) // 4
+        completion_tokens = self.completion_tokens if self.completion_tokens is not None else len(content) // 4
+        payload = json.dumps({
+            "id": f"chatcmpl-fake-{self.request_count}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "fake-gpt-4"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        }).encode("utf-8")
+        request.send_response(200)
+        request.send_header("Content-Type", "application/json")
+        request.send_header("Content-Length", str(len(payload)))
+        request.end_headers()
+        request.wfile.write(payload)
@@ -0,0 +1,189 @@
+import time
+import html
+import logging
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Optional
+from urllib.parse import urlsplit, parse_qs
+
+logger = logging.getLogger(__name__)
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<style>
+  body {{ font-family: sans-serif; margin: 0; }}
+  #onetrust-banner-sdk {{ position: fixed; bottom: 0; left: 0; right: 0; padding: 16px;
+                          background: #222; color: #fff; z-index: 10; }}
+  nav ul {{ display: flex; list-style: none; margin: 0; padding: 0 16px; background: #007b85; }}
+  nav li {{ position: relative; padding: 12px 16px; }}
+  nav li > a {{ color: #fff; }}
+  .mega-menu {{ display: none; position: absolute; top: 100%; left: 0; width: 320px;
+                background: #fff; border: 1px solid #ccc; padding: 12px; }}
+  nav li:hover .mega-menu {{ display: block; }}
+  main {{ padding: 16px; }}
+</style>
+</head>
+<body>
+<div id="onetrust-banner-sdk" role="dialog" aria-label="Cookie banner">
+  <p>We use cookies to improve your experience.</p>
+  <button id="onetrust-accept-btn-handler" aria-label="Accept Cookies">Accept All Cookies</button>
+  <button id="onetrust-reject-all-handler">Reject All</button>
+</div>
+<nav aria-label="Global navigation"><ul>{menu}</ul></nav>
+<main>
+{body}
+</main>
+<script>
+  const banner = document.getElementById('onetrust-banner-sdk');
+  if (document.cookie.includes('OptanonAlertBoxClosed')) banner.remove();
+  document.querySelectorAll('#onetrust-banner-sdk button').forEach((button) => {{
+    button.addEventListener('click', () => {{
+      document.cookie = 'OptanonAlertBoxClosed=1; path=/';
+      banner.remove();
+    }});
+  }});
+</script>
+</body>
+</html>
+"""
+
+MENU_SECTIONS = ["Broadband", "Mobile", "TV", "Shop", "Help"]
+
+class MockSite:
+    """
+    Local HTTP server with synthetic pages for benchmarking PlaywrightSkill.
+
+    Pages:
+        /            Home page with a OneTrust-style cookie banner and hover mega-menus
+        /broadband   Postcode form ("input[name=postcode]" and a Continue button)
+        /results     Result page echoing the submitted postcode
+        /late        Button ("#late-button") that is only added after late_element_ms
+        /slow        Any page delayed server-side by ?delay=<ms>
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency_ms: int = 0,
+                 late_element_ms: int = 1000, filler_paragraphs: int = 20):
+        """
+        Initialize mock site
+        Args:
+            host: Interface to bind
+            port: Port to bind (0 picks a free port)
+            latency_ms: Delay added to every response
+            late_element_ms: Delay before /late inserts its button
+            filler_paragraphs: Paragraphs of filler text per page, to control page size
+        """
+        self.host = host
+        self.port = port
+        self.latency_ms = latency_ms
+        self.late_element_ms = late_element_ms
+        self.filler_paragraphs = filler_paragraphs
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def start(self) -> "MockSite":
+        site = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                site._handle(self)
+
+            def log_message(self, format, *args):
+                logger.debug("MockSite: " + format, *args)
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name="mock-site", daemon=True)
+        self._thread.start()
+        logger.info(f"LOG:  Mock site serving at {self.url}")
+        return self
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "MockSite":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _filler(self) -> str:
+        sentence = "Fast fibre broadband with unlimited data and a wifi guarantee for every room. "
+        return "\n".join(f"<p>{sentence * 5}</p>" for _ in range(self.filler_paragraphs))
+
+    def _menu(self) -> str:
+        items = []
+        for section in MENU_SECTIONS:
+            slug = section.lower()
+            items.append(
+                f'<li><a href="/{slug}" aria-label="{section}">{section}</a>'
+                f'<div class="mega-menu"><a href="/{slug}">explore {slug}</a>'
+                f'<a href="/{slug}#deals">{section} deals</a></div></li>'
+            )
+        return "".join(items)
+
+    def _page(self, title: str, body: str) -> str:
+        return PAGE_TEMPLATE.format(title=title, menu=self._menu(), body=body + self._filler())
+
+    def render(self, path: str, query: dict) -> Optional[str]:
+        """Render a page for a path, or None for unknown paths"""
+        if path == "/":
+            return self._page("Mock Shop", "<h1>Mock Shop</h1>")
+        if path == "/broadband":
+            return self._page("Broadband", """
+<h1>Broadband</h1>
+<form action="/results" method="get">
+  <label for="postcode">Enter your postcode</label>
+  <input id="postcode" name="postcode" type="text" autocomplete="postal-code">
+  <button type="submit" aria-label="Continue">Continue</button>
+</form>
+""")
+        if path == "/results":
+            postcode = html.escape(query.get("postcode", [""])[0])
+            return self._page("Results", f"<h1>Broadband deals for {postcode}</h1>")
+        if path == "/late":
+            return self._page("Late", f"""
+<h1>Late loading</h1>
+<div id="late-container"></div>
+<script>
+  setTimeout(() => {{
+    const button = document.createElement('button');
+    button.id = 'late-button';
+    button.textContent = 'Loaded late';
+    document.getElementById('late-container').appendChild(button);
+  }}, {self.late_element_ms});
+</script>
+""")
+        if path in ("/mobile", "/tv", "/shop", "/help"):
+            return self._page(path[1:].title(), f"<h1>{path[1:].title()}</h1>")
+        return None
+
+    def _handle(self, request: BaseHTTPRequestHandler):
+        parts = urlsplit(request.path)
+        query = parse_qs(parts.query)
+        path = parts.path
+        delay_ms = self.latency_ms
+        if path == "/slow":
+            delay_ms += int(query.get("delay", ["1000"])[0])
+            path = query.get("page", ["/"])[0]
+        if delay_ms:
+            time.sleep(delay_ms / 1000)
+
+        body = self.render(path, query)
+        status = 200 if body is not None else 404
+        payload = (body or "<h1>Not found</h1>").encode("utf-8")
+        request.send_response(status)
+        request.send_header("Content-Type", "text/html; charset=utf-8")
+        request.send_header("Content-Length", str(len(payload)))
+        request.end_headers()
+        request.wfile.write(payload)
@@ -0,0 +1,44 @@
+import pytest
+
+pytest.importorskip("playwright")
+pytest.importorskip("pytest_benchmark")
+
+from autogen_playwright.testing import MockSite
+
+@pytest.fixture(scope="session")
+def mock_site():
+    """Local synthetic site shared by all benchmarks"""
+    # navigate() waits for networkidle (500 ms without requests), so /late inserts its
+    # button well after that and click_element has to wait for it
+    with MockSite(late_element_ms=1500) as site:
+        yield site
+
+SCRIPTED_RESPONSES = {
+    # web_tester alternates between a code block and the final summary
+    "web testing expert": [
+        "```python\nprint('navigated and verified')\n```",
+        "Test Summary: all steps passed.\nYou can find the full test report at: reports/run_fake/report.md",
+    ],
+    "security-focused code reviewer": ["APPROVED: the code only prints"],
+    "debugging expert": ["1. ERROR ANALYSIS: none\n2. ROOT CAUSE: none\n3. SUGGESTED FIX: none\n4. PREVENTION: none"],
+    "default": ["OK"],
+}
+
+@pytest.fixture(scope="session")
+def fake_llm():
+    """Deterministic OpenAI-compatible endpoint with scripted agent replies"""
+    from autogen_playwright.testing import FakeLLMServer
+    with FakeLLMServer(SCRIPTED_RESPONSES, latency_ms=0) as server:
+        yield server
+
+@pytest.fixture
+def fake_llm_env(fake_llm, monkeypatch):
+    """Point LLMProvider at the fake endpoint with caching off so every turn hits it"""
+    monkeypatch.setenv("LLM_PROVIDER", "openai")
+    monkeypatch.setenv("LLM_API_KEY", "fake-key")
+    monkeypatch.setenv("LLM_MODEL", "fake-gpt-4")
+    monkeypatch.setenv("LLM_BASE_URL", fake_llm.base_url)
+    monkeypatch.setenv("LLM_CACHE_ENABLE", "false")
+    monkeypatch.setenv("TRACING_ENABLE", "false")
+    fake_llm.reset()
+    return fake_llm
@@ -0,0 +1,81 @@
+"""
+Benchmarks for the agent loop using the fake LLM, so no API spend or model latency.
+
+Run with:
+    pytest tests/benchmarks/test_agent_loop_benchmark.py --benchmark-autosave
+and fail on regressions against the last saved run with:
+    pytest tests/benchmarks --benchmark-compare --benchmark-compare-fail=mean:10%
+"""
+import time
+from types import SimpleNamespace
+import pytest
+
+autogen = pytest.importorskip("autogen")
+
+from autogen_playwright.agents.web_testing_agents import (
+    create_web_testing_agents, custom_speaker_selection, is_test_complete, ConversationMonitor
+)
+
+TEST_MESSAGE = "Execute the following test scenario:\n1. Navigate to the mock site\n2. Verify the heading"
+
+def run_scenarios(count: int) -> int:
+    """Run count group chats end to end and return the number of rounds"""
+    rounds = 0
+    for _ in range(count):
+        testing_agent, debug_agent, admin_agent, executor, manager = create_web_testing_agents(use_group_chat=True)
+        executor.initiate_chat(manager, message=TEST_MESSAGE, max_turns=10)
+        rounds += len(manager.groupchat.messages)
+    return rounds
+
+def test_create_agents(benchmark, fake_llm_env):
+    benchmark(create_web_testing_agents, use_group_chat=True)
+
+@pytest.mark.parametrize("runtime_logging", [False, True], ids=["no-logging", "sqlite-logging"])
+@pytest.mark.parametrize("scenarios", [1, 5, 10])
+def test_group_chat_rounds(benchmark, fake_llm_env, tmp_path, scenarios, runtime_logging):
+    if runtime_logging:
+        autogen.runtime_logging.start(config={"dbname": str(tmp_path / "autogen_logs.db")})
+    try:
+        started = time.perf_counter()
+        rounds = benchmark.pedantic(run_scenarios, args=(scenarios,), rounds=3)
+        elapsed = time.perf_counter() - started
+    finally:
+        if runtime_logging:
+            autogen.runtime_logging.stop()
+
+    benchmark.extra_info["rounds_per_scenario"] = rounds / scenarios
+    benchmark.extra_info["rounds_per_sec"] = round(rounds * 3 / elapsed, 2)
+    benchmark.extra_info["llm_requests"] = fake_llm_env.request_count
+
+def make_groupchat(message_count: int):
+    agents = [SimpleNamespace(name=name) for name in ("web_tester", "debug_agent", "security_admin", "executor")]
+    contents = [
+        "```python\nprint('x')\n```",
+        "APPROVED: looks safe",
+        "exitcode: 1 (execution failed)\nError: element #submit not found",
+        "1. ERROR ANALYSIS: selector changed",
+    ]
+    messages = [{"content": contents[i % len(contents)] * 20} for i in range(message_count)]
+    return agents, SimpleNamespace(agents=agents, messages=messages)
+
+def test_speaker_selection(benchmark):
+    agents, groupchat = make_groupchat(50)
+    history = groupchat.messages
+
+    def select_all():
+        # Selection only inspects the latest message, so replay the history one message at a time
+        for i, message in enumerate(history):
+            groupchat.messages = [message]
+            custom_speaker_selection(agents[i % len(agents)], groupchat)
+
+    benchmark(select_all)
+
+def test_termination_checks(benchmark):
+    _, groupchat = make_groupchat(200)
+    monitor = ConversationMonitor(max_consecutive_empty=3)
+
+    def check_all():
+        for message in groupchat.messages:
+            monitor.check_message(message) or is_test_complete(message)
+
+    benchmark(check_all)
@@ -0,0 +1,128 @@
+"""
+Throughput benchmarks for PlaywrightSkill against the local mock site.
+
+Run with:
+    pytest tests/benchmarks --benchmark-autosave
+and compare against the previous run with --benchmark-compare.
+
+Warmup sessions run before the measured rounds and are left out of every statistic.
+"""
+import time
+import tracemalloc
+import statistics
+import pytest
+from autogen_playwright.skills.playwright_skill import PlaywrightSkill
+from autogen_playwright.skills.selector_cache import SelectorCache
+from autogen_playwright.reporting.page_metrics import PageMetricsStore
+
+ROUNDS = 5
+WARMUP_ROUNDS = 1
+NETWORK_IDLE_MS = 500
+
+@pytest.fixture(autouse=True)
+def working_dir(tmp_path, monkeypatch):
+    """hover_element saves a screenshot to the working directory; keep those out of the repo"""
+    monkeypatch.chdir(tmp_path)
+
+def make_skill() -> PlaywrightSkill:
+    """
+    Skill without report files, metrics or selector cache files and artificial delays.
+    The hover screenshot is the one disk write left, so its cost is part of the timings.
+    """
+    return PlaywrightSkill(
+        reporting_enabled=False,
+        slow_mo=0,
+        metrics_store=PageMetricsStore(),
+        selector_cache=SelectorCache(),
+        network_mode="live",
+    )
+
+def broadband_scenario(base_url: str):
+    """The EE broadband journey from run_web_test, pointed at the mock site"""
+    return [
+        lambda s: s.navigate(base_url),
+        lambda s: s.click_element('#onetrust-accept-btn-handler, [aria-label="Accept Cookies"], button:has-text("Accept")'),
+        lambda s: s.hover_element('a[aria-label="Broadband"]'),
+        lambda s: s.click_element('text=explore broadband'),
+        lambda s: s.verify_text_content("Broadband"),
+        lambda s: s.fill_form('input[name="postcode"]', "UB87PE"),
+        lambda s: s.click_element('button[type="submit"], button:has-text("Continue"), [aria-label="Continue"]'),
+        lambda s: s.verify_text_content("UB87PE", timeout=2000),
+    ]
+
+class SessionStats:
+    """Step latencies, JS heap and Python allocation peak of each measured session"""
+
+    def __init__(self):
+        self.step_latencies = []
+        self.js_heap = []
+        self.python_peaks = []
+        self._baseline = 0
+
+    def begin(self):
+        if not tracemalloc.is_tracing():
+            return
+        # Peak of this session only, above what earlier sessions left allocated
+        tracemalloc.reset_peak()
+        self._baseline, _ = tracemalloc.get_traced_memory()
+
+    def end(self, skill: PlaywrightSkill):
+        self.js_heap.append(skill.page.evaluate("performance.memory ? performance.memory.usedJSHeapSize : 0"))
+        self.python_peaks.append(tracemalloc.get_traced_memory()[1] - self._baseline)
+
+    def record(self, benchmark):
+        total = sum(self.step_latencies)
+        benchmark.extra_info["steps_per_sec"] = round(len(self.step_latencies) / total, 2)
+        benchmark.extra_info["p95_step_latency_ms"] = round(
+            statistics.quantiles(self.step_latencies, n=20)[-1] * 1000, 1
+        )
+        benchmark.extra_info["js_heap_bytes_per_session"] = int(statistics.mean(self.js_heap))
+        benchmark.extra_info["python_peak_bytes_per_session"] = int(statistics.mean(self.python_peaks))
+
+def run_measured(benchmark, session):
+    """Warm up outside the measurement, then benchmark session(stats) with tracemalloc on"""
+    for _ in range(WARMUP_ROUNDS):
+        session(SessionStats())
+    stats = SessionStats()
+    tracemalloc.start()
+    try:
+        benchmark.pedantic(session, args=(stats,), rounds=ROUNDS, warmup_rounds=0)
+    finally:
+        tracemalloc.stop()
+    assert len(stats.python_peaks) == ROUNDS
+    stats.record(benchmark)
+    return stats
+
+def test_broadband_journey_throughput(benchmark, mock_site):
+    def run(stats: SessionStats):
+        skill = make_skill()
+        stats.begin()
+        skill.start_session("Benchmark broadband journey")
+        try:
+            for step in broadband_scenario(mock_site.url):
+                started = time.perf_counter()
+                step(skill)
+                stats.step_latencies.append(time.perf_counter() - started)
+            stats.end(skill)
+        finally:
+            skill.end_session()
+
+    run_measured(benchmark, run)
+
+def test_late_element_click(benchmark, mock_site):
+    def run(stats: SessionStats):
+        skill = make_skill()
+        stats.begin()
+        skill.start_session("Benchmark late element")
+        try:
+            skill.navigate(f"{mock_site.url}/late")
+            started = time.perf_counter()
+            skill.click_element("#late-button")
+            stats.step_latencies.append(time.perf_counter() - started)
+            stats.end(skill)
+        finally:
+            skill.end_session()
+
+    stats = run_measured(benchmark, run)
+    # The button is inserted after navigate() returns, so every click had to wait for it
+    assert min(stats.step_latencies) * 1000 >= mock_site.late_element_ms - 2 * NETWORK_IDLE_MS
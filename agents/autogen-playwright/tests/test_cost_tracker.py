@@ -0,0 +1,75 @@
+from types import SimpleNamespace
+import pytest
+
+from autogen_playwright.ops.cost_tracker import CostTracker, BudgetExceededError
+
+def _agent(name, prompt_tokens, completion_tokens, model="gpt-4"):
+    response = SimpleNamespace(model=model, usage=SimpleNamespace(
+        prompt_tokens=prompt_tokens, completion_tokens=completion_tokens))
+    client = SimpleNamespace(create=lambda **params: response)
+    return SimpleNamespace(name=name, client=client)
+
+def test_totals_are_broken_down_by_agent_model_and_scenario():
+    tracker = CostTracker()
+    tester = _agent("web_tester", 1000, 500)
+    debugger = _agent("debug_agent", 2000, 0, model="gpt-3.5-turbo-0125")
+    tracker.instrument(tester)
+    tracker.instrument(debugger)
+
+    with tracker.scenario("checkout"):
+        tester.client.create(messages=[])
+        debugger.client.create(messages=[])
+    tester.client.create(messages=[])
+
+    stats = tracker.snapshot()
+    assert stats["requests"] == 3
+    assert stats["total_tokens"] == 5000
+    assert stats["by_agent"]["web_tester"]["cost"] == pytest.approx(0.12)
+    assert stats["by_model"]["gpt-3.5-turbo-0125"]["cost"] == pytest.approx(0.001)
+    assert stats["by_scenario"]["checkout"]["requests"] == 2
+
+def test_spend_cap_stops_further_calls():
+    tracker = CostTracker(max_cost=0.05)
+    agent = _agent("web_tester", 1000, 500)
+    tracker.instrument(agent)
+
+    agent.client.create(messages=[])
+    with pytest.raises(BudgetExceededError):
+        agent.client.create(messages=[])
+    assert tracker.snapshot()["requests"] == 1
+
+def test_gpt_4o_mini_is_not_priced_as_gpt_4o():
+    tracker = CostTracker()
+    assert tracker.price("gpt-4o-mini-2024-07-18", 1000, 1000) == pytest.approx(0.00075)
+    assert tracker.price("gpt-4o-2024-05-13", 1000, 1000) == pytest.approx(0.02)
+
+class CachingClient:
+    """OpenAIWrapper stand-in: only responses that reach the API update actual_usage_summary"""
+
+    def __init__(self):
+        self.actual_usage_summary = None
+        self.seen = set()
+
+    def create(self, **params):
+        key = str(params["messages"])
+        if key not in self.seen:
+            self.seen.add(key)
+            summary = self.actual_usage_summary or {"total_cost": 0.0}
+            self.actual_usage_summary = {**summary, "total_cost": summary["total_cost"] + 0.06}
+        return SimpleNamespace(model="gpt-4", usage=SimpleNamespace(prompt_tokens=1000, completion_tokens=500))
+
+def test_cached_responses_do_not_count_towards_the_caps():
+    tracker = CostTracker(max_cost=0.1)
+    agent = SimpleNamespace(name="web_tester", client=CachingClient())
+    tracker.instrument(agent)
+
+    for _ in range(5):
+        agent.client.create(messages=["same prompt"])
+    stats = tracker.snapshot()
+    assert (stats["requests"], stats["cached_requests"]) == (1, 4)
+    assert stats["cost"] == pytest.approx(0.06)
+    assert stats["by_agent"]["web_tester"]["cached_requests"] == 4
+
+    agent.client.create(messages=["new prompt"])
+    with pytest.raises(BudgetExceededError):
+        agent.client.create(messages=["same prompt"])
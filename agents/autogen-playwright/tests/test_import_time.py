@@ -0,0 +1,44 @@
+import os
+import sys
+import json
+import subprocess
+import pytest
+
+# Cold-start budget for a generated test script's "from autogen_playwright import PlaywrightSkill"
+IMPORT_BUDGET_MS = float(os.getenv("IMPORT_TIME_BUDGET_MS", "1500"))
+
+def run_cold(code: str) -> dict:
+    """Run code in a fresh interpreter and return what it printed as JSON"""
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def test_package_import_is_lazy():
+    loaded = run_cold(
+        "import sys, json, autogen_playwright, autogen_playwright.ops;"
+        "print(json.dumps([m for m in ('autogen', 'openai', 'playwright', 'pandas') if m in sys.modules]))"
+    )
+    assert loaded == []
+
+def test_tracing_does_not_import_pandas():
+    loaded = run_cold(
+        "import sys, json; from autogen_playwright.ops.tracing import get_tracer;"
+        "print(json.dumps([m for m in ('autogen', 'openai', 'pandas') if m in sys.modules]))"
+    )
+    assert loaded == []
+
+def test_playwright_skill_import_budget():
+    pytest.importorskip("playwright")
+    stats = run_cold(
+        "import sys, json, time; started = time.perf_counter();"
+        "from autogen_playwright import PlaywrightSkill;"
+        "elapsed = (time.perf_counter() - started) * 1000;"
+        "print(json.dumps({'ms': elapsed, 'heavy': [m for m in ('autogen', 'openai', 'pandas') if m in sys.modules]}))"
+    )
+    assert stats["heavy"] == []
+    assert stats["ms"] < IMPORT_BUDGET_MS, f"PlaywrightSkill import took {stats['ms']:.0f}ms (budget {IMPORT_BUDGET_MS:.0f}ms)"
+
+def test_lazy_attributes_resolve():
+    import autogen_playwright
+    assert "PlaywrightSkill" in dir(autogen_playwright)
+    with pytest.raises(AttributeError):
+        autogen_playwright.does_not_exist
@@ -0,0 +1,49 @@
+import time
+import threading
+
+from autogen_playwright.ops.job_queue import JobQueue
+
+def _wait_until_done(job, timeout=5.0):
+    deadline = time.time() + timeout
+    while not job.done and time.time() < deadline:
+        time.sleep(0.01)
+
+def test_jobs_run_in_background_and_report_progress():
+    queue = JobQueue(max_workers=2)
+    release = threading.Event()
+
+    def work(job, steps):
+        for step in steps:
+            job.progress["step"] = step
+        release.wait(5)
+        return {"report": "Test Summary"}
+
+    job = queue.submit("checkout", work, ["open page", "click buy"])
+    time.sleep(0.05)
+    assert job.status == "running"
+    assert job.progress["step"] == "click buy"
+
+    release.set()
+    _wait_until_done(job)
+    assert job.status == "succeeded"
+    assert job.result == {"report": "Test Summary"}
+    queue.shutdown()
+
+def test_queued_jobs_wait_for_a_worker_and_can_be_cancelled():
+    queue = JobQueue(max_workers=1)
+    started, release = threading.Event(), threading.Event()
+    running = queue.submit("first", lambda job: started.set() or release.wait(5))
+    queued = queue.submit("second", lambda job: None)
+    failing = queue.submit("third", lambda job: 1 / 0)
+    started.wait(5)
+
+    assert queue.position(queued.id) == 1
+    assert queue.cancel(queued.id)
+    release.set()
+    _wait_until_done(running)
+    _wait_until_done(failing)
+
+    assert queued.status == "cancelled"
+    assert failing.status == "failed"
+    assert "division by zero" in failing.error
+    queue.shutdown()
@@ -0,0 +1,79 @@
+import pytest
+
+pytest.importorskip("playwright")
+
+from autogen_playwright.skills.playwright_skill import PlaywrightSkill
+
+class FakeContext:
+    def __init__(self):
+        self.routes = []
+
+    def route_from_har(self, path, **options):
+        self.routes.append((path, options))
+
+class FakeReport:
+    run_id = "run-1"
+
+    def __init__(self):
+        self.steps = []
+
+    def add_step(self, description, status, details=None, metrics=None):
+        self.steps.append((description, status))
+
+class FakeMetricsStore:
+    def __init__(self):
+        self.recorded = []
+
+    def record(self, url, metrics, run_id=None):
+        self.recorded.append(url)
+        return []
+
+def make_skill(tmp_path, network_mode):
+    skill = PlaywrightSkill(report_dir=tmp_path, reporting_enabled=False, collect_metrics=False,
+                            metrics_store=FakeMetricsStore(), network_mode=network_mode, har_dir=tmp_path / "hars")
+    skill.context = FakeContext()
+    skill.report = FakeReport()
+    return skill
+
+def start(skill, scenario_name):
+    skill._session_network_mode = skill._setup_network(scenario_name)
+    skill._check_page_speed("https://example.com", {"load_event_ms": 100})
+
+def test_live_mode_does_not_route_through_a_har(tmp_path):
+    skill = make_skill(tmp_path, "live")
+    start(skill, "Checkout")
+    assert skill.context.routes == []
+    assert skill.metrics_store.recorded == ["https://example.com"]
+
+def test_record_mode_writes_the_scenario_har(tmp_path):
+    skill = make_skill(tmp_path, "record")
+    start(skill, "Checkout Flow")
+    (path, options), = skill.context.routes
+    assert path == str(tmp_path / "hars" / "checkout_flow.har")
+    assert options["update"] is True
+    assert skill.metrics_store.recorded == ["https://example.com"]
+
+def test_replay_mode_serves_the_har_and_skips_speed_history(tmp_path):
+    skill = make_skill(tmp_path, "replay")
+    skill.har_path("Checkout").parent.mkdir(parents=True)
+    skill.har_path("Checkout").write_text("{}")
+    start(skill, "Checkout")
+    (path, options), = skill.context.routes
+    assert options["not_found"] == "abort"
+    assert skill.metrics_store.recorded == []
+
+def test_replay_without_a_har_runs_that_session_live_only(tmp_path):
+    skill = make_skill(tmp_path, "replay")
+    start(skill, "Not Recorded")
+    assert skill.context.routes == []
+    assert skill.report.steps[-1][1] == "Warning"
+    assert skill.metrics_store.recorded == ["https://example.com"]
+
+    # The next scenario with a HAR is replayed again
+    skill.har_path("Recorded").parent.mkdir(parents=True, exist_ok=True)
+    skill.har_path("Recorded").write_text("{}")
+    skill.context = FakeContext()
+    start(skill, "Recorded")
+    assert skill.network_mode == "replay"
+    assert len(skill.context.routes) == 1
+    assert skill.metrics_store.recorded == ["https://example.com"]
@@ -0,0 +1,52 @@
+import threading
+
+from autogen_playwright.reporting.page_metrics import PageMetricsStore, url_key
+
+def test_samples_are_grouped_by_url_without_query():
+    assert url_key("https://ee.co.uk/broadband?utm=1#plans") == "https://ee.co.uk/broadband"
+    assert url_key("https://example.com") == "https://example.com/"
+
+def test_regression_flagged_against_baseline_median(tmp_path):
+    store = PageMetricsStore(tmp_path / "page_metrics.json", min_baseline_samples=3, tolerance=0.2)
+    for lcp in (1000, 1100, 900):
+        assert store.record("https://example.com", {"lcp_ms": lcp, "cls": 0.01}) == []
+
+    regressions = store.record("https://example.com", {"lcp_ms": 1500, "cls": 0.01})
+    assert len(regressions) == 1
+    assert regressions[0].startswith("lcp_ms 1500")
+
+def test_history_persists_across_runs_and_is_bounded(tmp_path):
+    path = tmp_path / "page_metrics.json"
+    store = PageMetricsStore(path, max_samples=2)
+    for ttfb in (100, 200, 300):
+        store.record("https://example.com", {"ttfb_ms": ttfb}, run_id=str(ttfb))
+
+    reloaded = PageMetricsStore(path)
+    samples = reloaded.history["https://example.com/"]
+    assert [s["ttfb_ms"] for s in samples] == [200, 300]
+    assert samples[-1]["run_id"] == "300"
+
+def test_concurrent_stores_do_not_lose_samples(tmp_path):
+    path = tmp_path / "page_metrics.json"
+
+    def run_scenario(i):
+        store = PageMetricsStore(path)
+        for step in range(10):
+            store.record(f"https://example.com/page{i}", {"ttfb_ms": step})
+
+    threads = [threading.Thread(target=run_scenario, args=(i,)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    history = PageMetricsStore(path).history
+    assert sorted(history) == [f"https://example.com/page{i}" for i in range(4)]
+    assert all(len(samples) == 10 for samples in history.values())
+    assert [p.name for p in tmp_path.iterdir() if p.suffix == ".tmp"] == []
+
+def test_incomplete_navigation_is_not_added_to_the_baseline(tmp_path):
+    store = PageMetricsStore(tmp_path / "page_metrics.json", min_baseline_samples=1)
+    store.record("https://example.com", {"load_event_ms": 800, "lcp_ms": 1000})
+    assert store.record("https://example.com", {"load_event_ms": 0, "lcp_ms": 5000}) == []
+    assert [s["lcp_ms"] for s in store.history["https://example.com/"]] == [1000]
@@ -0,0 +1,177 @@
+import pytest
+
+pytest.importorskip("playwright")
+
+from playwright.sync_api import sync_playwright
+
+from autogen_playwright.skills.playwright_skill import PlaywrightSkill
+from autogen_playwright.skills.page_scripts import HEAL_SELECTOR_SCRIPT
+from autogen_playwright.skills.selector_cache import SelectorCache
+
+PAGE = """
+<main>
+  <h1 id="title">Broadband</h1>
+  <nav><a id="menu" aria-label="Broadband" href="/broadband">Broadband</a></nav>
+  <form><input name="postcode" type="text"></form>
+  <p id="hidden" style="display: none">Hidden</p>
+  <div style="position: relative">
+    <button id="covered">Covered</button>
+    <div style="position: absolute; inset: 0; background: white"></div>
+  </div>
+</main>
+"""
+
+class FakeReport:
+    def __init__(self):
+        self.steps = []
+
+    def add_step(self, description, status, details=None, metrics=None):
+        self.steps.append((description, status))
+
+    def add_screenshot(self, path):
+        pass
+
+@pytest.fixture(scope="module")
+def browser():
+    with sync_playwright() as playwright:
+        try:
+            browser = playwright.chromium.launch(headless=True)
+        except Exception as e:
+            pytest.skip(f"Chromium is not installed: {e}")
+        yield browser
+        browser.close()
+
+@pytest.fixture
+def skill(browser, tmp_path, monkeypatch):
+    # hover_element writes its screenshot to the working directory
+    monkeypatch.chdir(tmp_path)
+    skill = PlaywrightSkill(reporting_enabled=False, collect_metrics=False, timeout=1000,
+                            selector_cache=SelectorCache(tmp_path / "selector_cache.json"))
+    skill.page = browser.new_page()
+    skill.page.set_content(PAGE)
+    skill.report = FakeReport()
+    yield skill
+    skill.page.close()
+
+def outcomes(results):
+    return [(result["type"], result["passed"]) for result in results]
+
+def test_verify_all_covers_every_assertion_type(skill):
+    results = skill.verify_all([
+        {"type": "exists", "selector": "h1"},
+        {"type": "exists", "selector": "#missing"},
+        {"type": "visible", "selector": "#menu"},
+        {"type": "visible", "selector": "#hidden"},
+        {"type": "hoverable", "selector": "#menu"},
+        {"type": "hoverable", "selector": "#covered"},
+        {"type": "text_contains", "selector": "main", "text": "Broadband"},
+        {"type": "text_contains", "text": "Mobile"},
+        {"type": "attribute_equals", "selector": "input", "attribute": "name", "value": "postcode"},
+        {"type": "attribute_equals", "selector": "input", "attribute": "type", "value": "email"},
+    ])
+    assert outcomes(results) == [
+        ("exists", True), ("exists", False),
+        ("visible", True), ("visible", False),
+        ("hoverable", True), ("hoverable", False),
+        ("text_contains", True), ("text_contains", False),
+        ("attribute_equals", True), ("attribute_equals", False),
+    ]
+    assert results[1]["detail"] == "not found"
+    assert results[9]["detail"] == "actual: text"
+    assert [status for _, status in skill.report.steps].count("Failed") == 5
+
+def test_verify_all_reports_bad_assertions_without_raising(skill):
+    unknown, playwright_only, invalid, fallback = skill.verify_all([
+        {"type": "focused", "selector": "h1"},
+        {"type": "exists", "selector": 'button:has-text("Covered")'},
+        {"type": "exists", "selector": "h1[["},
+        {"type": "exists", "selector": "#missing, h1"},
+    ])
+    assert not unknown["passed"] and unknown["detail"] == "unknown assertion type: focused"
+    assert not playwright_only["passed"] and playwright_only["detail"].startswith("invalid selector")
+    assert not invalid["passed"] and invalid["detail"].startswith("invalid selector")
+    assert fallback["passed"]
+
+def test_hover_element_hovers_visible_elements(skill):
+    assert skill.hover_element('a[aria-label="Broadband"]')
+    assert skill.page.evaluate("document.querySelector('#menu').matches(':hover')")
+    assert skill.report.steps[-1][1] == "Success"
+
+def test_hover_element_also_accepts_playwright_selectors(skill):
+    assert skill.hover_element('a:has-text("Broadband")')
+    assert skill.page.evaluate("document.querySelector('#menu').matches(':hover')")
+
+def test_hover_element_rejects_covered_elements(skill):
+    assert not skill.hover_element("#covered")
+    assert skill.report.steps[-1] == ("Element #covered found but not hoverable (might be covered or disabled)", "Failed")
+
+def test_find_text_matches_across_inline_elements(skill):
+    skill.page.set_content("<p id='intro'>Example <b>Domain</b> text</p>")
+    result, = skill.find_text("Example Domain")
+    assert result["count"] == 1
+    assert result["locations"][0]["element"] == "p#intro"
+    assert skill.verify_text_content("Example Domain")
+
+def test_find_text_regex_and_ignore_case(skill):
+    skill.page.set_content("<p>Postcode UB8 7PE</p><p>postcode SW1A 1AA</p>")
+    postcode, = skill.find_text(r"[A-Z]{1,2}\d[A-Z\d]? \d[A-Z]{2}", regex=True)
+    assert postcode["count"] == 2
+    exact, folded = skill.find_text(["postcode", "POSTCODE"], ignore_case=False), skill.find_text("POSTCODE", ignore_case=True)
+    assert [result["count"] for result in exact] == [1, 0]
+    assert folded[0]["count"] == 2
+    assert skill.verify_text_content("ub8", ignore_case=True)
+
+def test_find_text_scope(skill):
+    assert skill.find_text("Broadband", scope="nav")[0]["count"] == 1
+    missing, = skill.find_text("Broadband", scope="#missing")
+    assert missing == {"needle": "Broadband", "count": 0, "locations": [], "error": "scope not found"}
+    assert not skill.verify_text_content("Broadband", scope="#missing")
+    assert skill.report.steps[-1][1] == "Failed"
+
+def test_find_text_reports_an_invalid_regex(skill):
+    invalid, valid = skill.find_text(["(unclosed", "Broad"], regex=True)
+    assert invalid["count"] == 0 and invalid["error"].startswith("invalid pattern")
+    assert valid["count"] == 2
+
+def test_find_text_caps_locations(skill):
+    skill.page.set_content("<ul>" + "<li>item</li>" * 10 + "</ul>")
+    result, = skill.find_text("item", max_locations=3)
+    assert result["count"] == 10
+    assert len(result["locations"]) == 3
+
+def test_find_text_waits_then_falls_back_to_the_current_text(skill):
+    skill.page.set_content("<div id='late'></div><script>"
+                           "setTimeout(() => { document.getElementById('late').textContent = 'Loaded late'; }, 200)"
+                           "</script>")
+    assert skill.find_text("Loaded late", timeout=2000)[0]["count"] == 1
+    assert skill.verify_text_content("Loaded late", timeout=2000)
+
+    # Not every needle appears: the wait times out and the current matches are returned
+    found, missing = skill.find_text(["Loaded late", "Never shown"], timeout=200)
+    assert (found["count"], missing["count"]) == (1, 0)
+
+def remember(skill, selector):
+    skill.selector_cache.remember(skill.page, selector, selector)
+
+def test_changed_id_is_healed_from_the_fingerprint(skill):
+    skill.page.set_content("<form><button id='continue-btn' name='continue'>Continue</button></form>")
+    remember(skill, "#continue-btn")
+    skill.page.set_content("<form><button id='continue-v2' name='continue'>Continue</button></form>")
+
+    assert skill.selector_cache.resolve(skill.page, "#continue-btn") == ("#continue-v2", "healed")
+    assert skill.selector_cache.stats["healed"] == 1
+
+def test_nothing_similar_is_left_to_playwright(skill):
+    skill.page.set_content("<form><button id='continue-btn' name='continue'>Continue</button></form>")
+    remember(skill, "#continue-btn")
+    # Same tag and text, but no identifying attribute in common
+    skill.page.set_content("<form><button id='other' name='back'>Continue</button></form>")
+
+    assert skill.selector_cache.resolve(skill.page, "#continue-btn") == ("#continue-btn", "original")
+    assert skill.selector_cache.stats["healed"] == 0
+
+def test_healing_the_body_falls_back_to_a_body_selector(skill):
+    skill.page.set_content("<div id='page'>Duplicate id</div>")
+    skill.page.evaluate("document.body.id = 'page'")
+    fingerprint = {"tag": "body", "id": "page"}
+    assert skill.page.evaluate(HEAL_SELECTOR_SCRIPT, [fingerprint, 5.0]) == {"selector": "body", "score": 5}
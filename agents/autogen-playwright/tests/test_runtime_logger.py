@@ -0,0 +1,38 @@
+import sqlite3
+import pytest
+
+pytest.importorskip("autogen")
+
+from autogen_playwright.ops.runtime_logger import BatchedSqliteLogger, shard_path
+
+def test_queued_inserts_are_written_in_batches_on_stop(tmp_path):
+    db_path = str(tmp_path / "autogen_logs.db")
+    batched_logger = BatchedSqliteLogger({"dbname": db_path}, batch_size=10, flush_interval=0.01, max_queue=5)
+    batched_logger.start()
+    batched_logger._run_query("CREATE TABLE IF NOT EXISTS events(value INTEGER)")
+    for value in range(50):
+        batched_logger._run_query("INSERT INTO events(value) VALUES (?)", (value,))
+    batched_logger.stop()
+
+    con = sqlite3.connect(db_path)
+    assert con.execute("SELECT COUNT(*) FROM events").fetchone()[0] == 50
+    assert con.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    con.close()
+
+def test_shards_sit_next_to_main_database():
+    assert shard_path("runtime_logs/autogen_logs.db", "worker1") == "runtime_logs/autogen_logs.worker1.db"
+
+def test_log_analyzer_reads_shards_as_one(tmp_path):
+    pytest.importorskip("pandas")
+    from autogen_playwright.ops.log_analyzer import LogAnalyzer
+
+    main = tmp_path / "autogen_logs.db"
+    for path in (main, tmp_path / "autogen_logs.1.db", tmp_path / "autogen_logs.2.db"):
+        con = sqlite3.connect(path)
+        con.execute("CREATE TABLE chat_completions(session_id TEXT)")
+        con.execute("INSERT INTO chat_completions VALUES (?)", (path.name,))
+        con.commit()
+        con.close()
+
+    rows = LogAnalyzer(str(main)).get_log_data()
+    assert sorted(row["session_id"] for row in rows) == ["autogen_logs.1.db", "autogen_logs.2.db", "autogen_logs.db"]
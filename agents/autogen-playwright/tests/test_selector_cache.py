@@ -0,0 +1,80 @@
+from autogen_playwright.skills.selector_cache import SelectorCache, split_selectors
+
+class FakeLocator:
+    def __init__(self, page, selector):
+        self.page = page
+        self.selector = selector
+        self.first = self
+
+    def is_visible(self):
+        self.page.probes.append(self.selector)
+        return self.selector in self.page.visible
+
+    def evaluate(self, script):
+        return {"tag": "button", "text": self.selector}
+
+class FakePage:
+    def __init__(self, visible, url="https://ee.co.uk/broadband"):
+        self.visible = set(visible)
+        self.url = url
+        self.probes = []
+        self.healed = None
+
+    def locator(self, selector):
+        return FakeLocator(self, selector)
+
+    def evaluate(self, script, arg=None):
+        self.heal_args = arg
+        return self.healed
+
+def test_split_selectors_respects_quotes_and_parentheses():
+    selector = '#onetrust-accept-btn-handler, button:has-text("Yes, accept"), :is(a, button)[aria-label="Accept"]'
+    assert split_selectors(selector) == [
+        "#onetrust-accept-btn-handler",
+        'button:has-text("Yes, accept")',
+        ':is(a, button)[aria-label="Accept"]',
+    ]
+
+def test_cached_winner_is_tried_first(tmp_path):
+    selector = '#missing, [aria-label="Accept"], button:has-text("Accept")'
+    cache = SelectorCache(tmp_path / "selector_cache.json")
+
+    page = FakePage(visible={'button:has-text("Accept")'})
+    target, resolution = cache.resolve(page, selector)
+    assert (target, resolution) == ('button:has-text("Accept")', "probed")
+    cache.remember(page, selector, target)
+    cache.save()
+
+    # A new run loads the cache and needs a single probe
+    cache = SelectorCache(tmp_path / "selector_cache.json")
+    page = FakePage(visible={'button:has-text("Accept")'})
+    assert cache.resolve(page, selector) == ('button:has-text("Accept")', "cached")
+    assert page.probes == ['button:has-text("Accept")']
+
+def test_heals_by_fingerprint_when_no_alternative_matches():
+    selector = "#old-id, .old-class"
+    cache = SelectorCache()
+    cache.remember(FakePage(visible={"#old-id"}), selector, "#old-id")
+
+    page = FakePage(visible=set())
+    page.healed = {"selector": "#new-id", "score": 8}
+    assert cache.resolve(page, selector) == ("#new-id", "healed")
+    assert cache.stats["healed"] == 1
+    assert page.heal_args[1] == cache.heal_min_score >= 5
+
+def test_falls_back_to_original_selector():
+    cache = SelectorCache()
+    page = FakePage(visible=set())
+    assert cache.resolve(page, "#a, #b") == ("#a, #b", "original")
+
+def test_concurrent_caches_merge_their_entries(tmp_path):
+    path = tmp_path / "selector_cache.json"
+    first, second = SelectorCache(path), SelectorCache(path)
+    first.remember(FakePage(visible={"#accept"}), "#accept, .accept", "#accept")
+    second.remember(FakePage(visible={"#search"}), "#search, .search", "#search")
+    first.save()
+    second.save()
+
+    merged = SelectorCache(path).entries["ee.co.uk"]
+    assert sorted(merged) == ["#accept, .accept", "#search, .search"]
+    assert sorted(second.entries["ee.co.uk"]) == sorted(merged)
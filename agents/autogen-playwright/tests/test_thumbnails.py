@@ -0,0 +1,27 @@
+import os
+import pytest
+
+Image = pytest.importorskip("PIL.Image")
+
+from autogen_playwright.reporting.thumbnails import ensure_thumbnail, list_screenshots
+
+def test_thumbnail_is_generated_once_and_refreshed_when_screenshot_changes(tmp_path):
+    screenshot = tmp_path / "step_1.png"
+    Image.new("RGB", (1920, 1080), "white").save(screenshot)
+
+    thumbnail = ensure_thumbnail(screenshot, size=(480, 320))
+    with Image.open(thumbnail) as image:
+        assert image.size == (480, 270)
+    first_mtime = thumbnail.stat().st_mtime_ns
+    assert ensure_thumbnail(screenshot, size=(480, 320)).stat().st_mtime_ns == first_mtime
+
+    later = thumbnail.stat().st_mtime + 10
+    Image.new("RGB", (800, 800), "black").save(screenshot)
+    os.utime(screenshot, (later, later))
+    with Image.open(ensure_thumbnail(screenshot, size=(480, 320))) as image:
+        assert image.size == (320, 320)
+
+def test_thumbnails_are_not_listed_as_screenshots(tmp_path):
+    Image.new("RGB", (100, 100)).save(tmp_path / "step_1.png")
+    ensure_thumbnail(tmp_path / "step_1.png")
+    assert [path.name for path in list_screenshots(tmp_path)] == ["step_1.png"]
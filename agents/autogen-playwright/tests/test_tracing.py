@@ -0,0 +1,91 @@
+import atexit
+import pytest
+from autogen_playwright.ops import tracing
+from autogen_playwright.ops.tracing import (
+    Tracer, FileSpanExporter, TRACEPARENT_ENV, flame_graph, load_spans, time_breakdown
+)
+
+def test_spans_nest_under_current_span():
+    tracer = Tracer()
+    with tracer.span("scenario") as root:
+        with tracer.span("playwright.navigate", url="https://example.com") as child:
+            assert tracer.current_span() is child
+        assert tracer.current_span() is root
+
+    spans = {span["name"]: span for span in tracer.finished}
+    assert spans["playwright.navigate"]["parent_id"] == root.span_id
+    assert spans["playwright.navigate"]["trace_id"] == root.trace_id
+    assert spans["playwright.navigate"]["attributes"]["url"] == "https://example.com"
+    assert spans["scenario"]["parent_id"] is None
+
+def test_span_records_errors():
+    tracer = Tracer()
+    with pytest.raises(ValueError):
+        with tracer.span("executor.run"):
+            raise ValueError("boom")
+
+    assert tracer.finished[0]["status"] == "ERROR"
+    assert tracer.finished[0]["attributes"]["error"] == "boom"
+    assert tracer.current_span() is None
+
+def test_disabled_tracer_records_nothing():
+    tracer = Tracer(enabled=False)
+    with tracer.span("scenario") as span:
+        assert span is None
+    assert not tracer.finished
+
+def test_finished_spans_are_bounded():
+    tracer = Tracer(max_finished=3)
+    for i in range(5):
+        with tracer.span(f"step.{i}"):
+            pass
+    assert [span["name"] for span in tracer.finished] == ["step.2", "step.3", "step.4"]
+
+def test_tracers_share_one_exit_hook(tmp_path, monkeypatch):
+    registered = []
+    monkeypatch.setattr(atexit, "register", registered.append)
+    path = tmp_path / "traces.jsonl"
+    tracer = Tracer(exporters=[FileSpanExporter(str(path))], batch_size=100)
+    assert registered == []
+
+    with tracer.span("scenario"):
+        with tracer.span("playwright.navigate"):
+            pass
+        tracing._flush_open_tracers()
+        assert [span["name"] for span in load_spans(str(path))] == ["playwright.navigate"]
+
+    tracer.close()
+    assert tracer not in tracing._open_tracers
+
+def test_file_export_and_subprocess_propagation(tmp_path, monkeypatch):
+    path = tmp_path / "traces.jsonl"
+    tracer = Tracer(exporters=[FileSpanExporter(str(path))])
+    with tracer.span("executor.run") as run:
+        env = tracer.propagation_env()
+    assert env["TRACING_ENABLE"] == "true"
+
+    # A tracer in the executor subprocess continues the same trace
+    monkeypatch.setenv(TRACEPARENT_ENV, env[TRACEPARENT_ENV])
+    child_tracer = Tracer(exporters=[FileSpanExporter(env["TRACING_PATH"])])
+    with child_tracer.span("playwright.click_element"):
+        pass
+    child_tracer.flush()
+
+    spans = load_spans(str(path), run.trace_id)
+    assert {span["name"] for span in spans} == {"executor.run", "playwright.click_element"}
+    child = next(span for span in spans if span["name"] == "playwright.click_element")
+    assert child["parent_id"] == run.span_id
+
+def test_flame_graph_uses_self_time():
+    spans = [
+        {"name": "scenario", "span_id": "a", "parent_id": None, "duration_ms": 10.0},
+        {"name": "llm.completion", "span_id": "b", "parent_id": "a", "duration_ms": 6.0},
+        {"name": "wait.fixed", "span_id": "c", "parent_id": "a", "duration_ms": 3.0},
+    ]
+
+    assert flame_graph(spans) == [
+        "scenario 1000",
+        "scenario;llm.completion 6000",
+        "scenario;wait.fixed 3000",
+    ]
+    assert time_breakdown(spans) == {"llm": 6.0, "wait": 3.0, "scenario": 1.0}
@@ -0,0 +1,25 @@
+from autogen_playwright.ops.transcript_store import TranscriptStore
+
+def test_messages_reload_by_offset_per_session(tmp_path):
+    store = TranscriptStore(str(tmp_path / "transcripts.db"))
+    store.append("job-a", "user", "1. go to example.com")
+    store.append("job-b", "user", "1. go to other.com")
+    store.append("job-a", "assistant", "Navigating")
+    store.append("job-a", "user", "exitcode: 0")
+
+    assert [m["content"] for m in store.messages("job-a", offset=1)] == ["Navigating", "exitcode: 0"]
+    assert store.messages("job-a", offset=3) == []
+    assert store.count("job-b") == 1
+    assert [row["session_id"] for row in store.sessions()][0] == "job-a"
+
+def test_latest_report_is_found_through_the_report_flag(tmp_path):
+    db_path = str(tmp_path / "transcripts.db")
+    store = TranscriptStore(db_path)
+    store.append("job-a", "assistant", "Test Summary: 2 of 3 steps passed")
+    store.append("job-a", "assistant", "Retrying step 3")
+    store.append("job-a", "assistant", "test scenario completed: all steps passed")
+    store.close()
+
+    reopened = TranscriptStore(db_path)
+    assert reopened.latest_report("job-a") == "test scenario completed: all steps passed"
+    assert reopened.latest_report("job-b") is None
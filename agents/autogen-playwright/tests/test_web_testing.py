@@ -1,10 +1,14 @@
+import os
 import pytest
 from pathlib import Path
 from autogen_playwright.skills.playwright_skill import PlaywrightSkill
 from autogen_playwright.utils.constants import SCREENSHOTS_DIR, REPORTS_DIR
 
+# Replay recorded HARs by default; record them with PLAYWRIGHT_NETWORK_MODE=record
+NETWORK_MODE = os.getenv("PLAYWRIGHT_NETWORK_MODE", "replay")
+
 def test_playwright_skill_can_navigate_and_interact():
-    skill = PlaywrightSkill()
+    skill = PlaywrightSkill(network_mode=NETWORK_MODE)
     
     # Test session start
     result = skill.start_session()
@@ -23,14 +27,14 @@ def test_playwright_skill_can_navigate_and_interact():
     assert "Filled" in result or "Error filling form" in result
 
 def test_can_handle_invalid_selectors():
-    skill = PlaywrightSkill()
+    skill = PlaywrightSkill(network_mode=NETWORK_MODE)
     skill.start_session()
     
     result = skill.click_element("invalid-selector-that-doesnt-exist")
     assert "Error" in result 
 
 def test_playwright_skill_handles_complex_scenarios():
-    skill = PlaywrightSkill()
+    skill = PlaywrightSkill(network_mode=NETWORK_MODE)
     skill.start_session("Complex Navigation Test")
     
     # Test navigation with wait
@@ -51,7 +55,7 @@ def test_playwright_skill_handles_complex_scenarios():
     skill.end_session()
 
 def test_error_recovery_and_reporting():
-    skill = PlaywrightSkill()
+    skill = PlaywrightSkill(network_mode=NETWORK_MODE)
     skill.start_session("Error Recovery Test")
     
     # Test invalid selector with retry
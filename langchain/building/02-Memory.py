@@ -280,6 +280,54 @@ conversation.predict(input="What would be a good demo to show?")
 memory.load_memory_variables({})
 
 
+# ## Bounded-memory sessions
+# 
+# For long-lived support sessions, `SessionMemory` keeps each session's recent window in a
+# `SessionStore`. Token counts are computed once per turn and the window is trimmed from the
+# oldest turn without recounting. Every turn is also written through to SQLite, so only the
+# recently used sessions are kept in memory and a restarted kernel picks up where it left off.
+
+# In[ ]:
+
+
+from session_memory import SessionStore, SessionMemory
+
+store = SessionStore("session_memory.db", max_token_limit=50, count_tokens=llm.get_num_tokens)
+memory = SessionMemory(store=store, session_id="andrew")
+memory.save_context({"input": "AI is what?!"},
+                    {"output": "Amazing!"})
+memory.save_context({"input": "Backpropagation is what?"},
+                    {"output": "Beautiful!"})
+memory.save_context({"input": "Chatbots are what?"}, 
+                    {"output": "Charming!"})
+memory.load_memory_variables({})
+
+
+# In[ ]:
+
+
+# The full transcript, including turns that left the window
+store.history("andrew")
+
+
+# In[ ]:
+
+
+conversation = ConversationChain(
+    llm=llm, 
+    memory = SessionMemory(store=store, session_id="another-customer"),
+    verbose=False
+)
+conversation.predict(input="Hi, my name is Andrew")
+
+
+# In[ ]:
+
+
+# Writes any buffered turns; this also happens when the kernel exits
+store.close()
+
+
 # Reminder: Download your notebook to you local computer to save your work.
 
 # In[ ]:
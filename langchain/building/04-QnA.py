@@ -46,7 +46,6 @@ else:
 from langchain.chains import RetrievalQA
 from langchain.chat_models import ChatOpenAI
 from langchain.document_loaders import CSVLoader
-from langchain.vectorstores import DocArrayInMemorySearch
 from IPython.display import display, Markdown
 
 
@@ -60,7 +59,9 @@ loader = CSVLoader(file_path=file)
 # In[ ]:
 
 
-from langchain.indexes import VectorstoreIndexCreator
+from langchain.indexes.vectorstore import VectorStoreIndexWrapper
+from langchain.embeddings import OpenAIEmbeddings
+from vector_index import PersistentVectorStore
 
 
 # In[ ]:
@@ -69,12 +70,52 @@ from langchain.indexes import VectorstoreIndexCreator
 #pip install docarray
 
 
+# Set LOCAL_EMBEDDINGS to a word-vector model (e.g. `glove-wiki-gigaword-100`) to embed the
+# catalog and queries on the CPU with int8-quantized vectors instead of calling OpenAI.
+# Local and OpenAI embeddings are not comparable, so each gets its own index directory.
+
+# In[ ]:
+
+
+from local_embeddings import LocalEmbeddings, QuantizedWordVectors
+
+local_model = os.getenv("LOCAL_EMBEDDINGS")
+if local_model:
+    catalog_embeddings = LocalEmbeddings(QuantizedWordVectors.from_pretrained(local_model))
+    index_dir = f"catalog_index_{local_model}"
+else:
+    catalog_embeddings = OpenAIEmbeddings()
+    index_dir = "catalog_index"
+
+
+# The catalog embeddings are kept on disk in `catalog_index/`. Ingestion streams the CSV in
+# batches with concurrent, rate-limit-aware requests and only embeds rows that are new or changed
+# since the last run; an interrupted ingestion resumes from its checkpoint. Opening the index
+# memory-maps the stored matrix.
+
+# In[ ]:
+
+
+from ingest import EmbeddingIngestor
+
+print(EmbeddingIngestor(catalog_embeddings, index_dir, concurrency=4).ingest_csv(file))
+catalog_db = PersistentVectorStore.open(index_dir, catalog_embeddings)
+index = VectorStoreIndexWrapper(vectorstore=catalog_db)
+
+
+# For large catalogs, open the index with an approximate search backend instead of exact search.
+# `nprobe` (IVF) or `ef` (HNSW) trade recall for latency and can also be set per query through
+# `search_kwargs`, e.g. `catalog_db.as_retriever(search_kwargs={"k": 4, "nprobe": 16})`.
+# Several queries can be answered in one batch with `catalog_db.similarity_search_batch(queries)`.
+# `python ann_benchmark.py` compares recall@k and QPS of the backends against exact search.
+
 # In[ ]:
 
 
-index = VectorstoreIndexCreator(
-    vectorstore_cls=DocArrayInMemorySearch
-).from_loaders([loader])
+from ann_index import IVFIndex, HNSWIndex
+
+# catalog_db = PersistentVectorStore.open(index_dir, catalog_embeddings, ann=IVFIndex(nprobe=16))
+# catalog_db = PersistentVectorStore.open(index_dir, catalog_embeddings, ann=HNSWIndex(ef=64))
 
 
 # In[ ]:
@@ -120,8 +161,7 @@ docs[0]
 # In[ ]:
 
 
-from langchain.embeddings import OpenAIEmbeddings
-embeddings = OpenAIEmbeddings()
+embeddings = catalog_embeddings
 
 
 # In[ ]:
@@ -145,10 +185,8 @@ print(embed[:5])
 # In[ ]:
 
 
-db = DocArrayInMemorySearch.from_documents(
-    docs, 
-    embeddings
-)
+db = PersistentVectorStore.open(index_dir, embeddings)
+db.sync(docs)
 
 
 # In[ ]:
@@ -181,6 +219,18 @@ docs[0]
 retriever = db.as_retriever()
 
 
+# Pure embedding search can miss exact attributes such as "UPF 50+". The hybrid retriever also
+# ranks rows with BM25 over an inverted index of the CSV fields (kept in `bm25/` next to the
+# vectors) and fuses both rankings with reciprocal rank fusion, so fewer documents are needed.
+
+# In[ ]:
+
+
+from hybrid_search import HybridRetriever
+
+retriever = HybridRetriever.from_store(db, k=4)
+
+
 # In[ ]:
 
 
@@ -236,6 +286,23 @@ response = qa_stuff.run(query)
 display(Markdown(response))
 
 
+# `stuff` puts every retrieved document into one prompt, which overflows or slows down as k
+# grows. `AdaptiveQA` keeps `stuff` while the retrieved documents fit in `max_stuff_tokens` and
+# otherwise runs a map-reduce: map calls run concurrently (at most `max_concurrency` at once)
+# and their partial answers are folded into the reduce step as they arrive.
+
+# In[ ]:
+
+
+from parallel_qa import AdaptiveQA
+
+qa_adaptive = AdaptiveQA(llm, HybridRetriever.from_store(db, k=12), max_stuff_tokens=3000,
+                         max_concurrency=4, verbose=True)
+output = qa_adaptive.invoke({"query": query})
+print(output["chain_type"])
+display(Markdown(output["result"]))
+
+
 # In[ ]:
 
 
@@ -245,10 +312,8 @@ response = index.query(query, llm=llm)
 # In[ ]:
 
 
-index = VectorstoreIndexCreator(
-    vectorstore_cls=DocArrayInMemorySearch,
-    embedding=embeddings,
-).from_loaders([loader])
+# Wraps the persisted index instead of re-embedding the catalog with VectorstoreIndexCreator
+index = VectorStoreIndexWrapper(vectorstore=db)
 
 
 # Reminder: Download your notebook to you local computer to save your work.
@@ -47,8 +47,6 @@ else:
 from langchain.chains import RetrievalQA
 from langchain.chat_models import ChatOpenAI
 from langchain.document_loaders import CSVLoader
-from langchain.indexes import VectorstoreIndexCreator
-from langchain.vectorstores import DocArrayInMemorySearch
 
 
 # In[ ]:
@@ -62,9 +60,24 @@ data = loader.load()
 # In[ ]:
 
 
-index = VectorstoreIndexCreator(
-    vectorstore_cls=DocArrayInMemorySearch
-).from_loaders([loader])
+from langchain.embeddings import OpenAIEmbeddings
+from langchain.indexes.vectorstore import VectorStoreIndexWrapper
+from ingest import EmbeddingIngestor
+from local_embeddings import LocalEmbeddings, QuantizedWordVectors
+from vector_index import PersistentVectorStore
+
+# LOCAL_EMBEDDINGS=glove-wiki-gigaword-100 embeds on the CPU instead of calling OpenAI
+local_model = os.getenv("LOCAL_EMBEDDINGS")
+if local_model:
+    catalog_embeddings = LocalEmbeddings(QuantizedWordVectors.from_pretrained(local_model))
+    index_dir = f"catalog_index_{local_model}"
+else:
+    catalog_embeddings = OpenAIEmbeddings()
+    index_dir = "catalog_index"
+
+# Shares the index with 04-QnA: only new or changed rows are embedded
+EmbeddingIngestor(catalog_embeddings, index_dir, concurrency=4).ingest_csv(file)
+index = VectorStoreIndexWrapper(vectorstore=PersistentVectorStore.open(index_dir, catalog_embeddings))
 
 
 # In[ ]:
@@ -126,7 +139,8 @@ from langchain.evaluation.qa import QAGenerateChain
 # In[ ]:
 
 
-example_gen_chain = QAGenerateChain.from_llm(ChatOpenAI(model=llm_model))
+# temperature 0 keeps generated examples reproducible
+example_gen_chain = QAGenerateChain.from_llm(ChatOpenAI(temperature=0, model=llm_model))
 
 
 # In[ ]:
@@ -236,6 +250,36 @@ for i, eg in enumerate(examples):
 graded_outputs[0]
 
 
+# ## Concurrent evaluation
+# 
+# For eval sets with thousands of examples, `EvaluationRunner` generates examples, predicts and
+# grades with a bounded number of concurrent LLM calls. Predictions and grades are cached in
+# `eval_runs/catalog/`, so an interrupted run resumes where it stopped and re-running an unchanged
+# example costs nothing. Bump `version` when the QA chain changes. `summary` reports latencies and
+# tokens of the LLM calls made in this run; tokens saved by the cache are counted in `cached_tokens`.
+# 
+# Generated examples are stored in `eval_examples/` by document content hash and generator
+# prompt/model, so only new or changed documents are sent to `QAGenerateChain`. `set_name`
+# freezes the generated test set: later runs load exactly the same examples from disk. If the
+# documents or the generator prompt/model change, loading the set raises `StaleSetError`; pass
+# `refresh=True` to regenerate and overwrite it, or pick a new `set_name` to keep the old one.
+
+# In[ ]:
+
+
+from eval_runner import EvaluationRunner
+
+runner = EvaluationRunner(qa, eval_chain, "eval_runs/catalog", max_concurrency=16, version=llm_model)
+generated_examples = runner.generate_examples(example_gen_chain, data[:100], set_name="catalog-100")
+results = runner.run(examples[:2] + generated_examples)
+
+
+# In[ ]:
+
+
+runner.summary(results)
+
+
 # ## LangChain evaluation platform
 
 # The LangChain evaluation platform, LangChain Plus, can be accessed here https://www.langchain.plus/.  
@@ -0,0 +1,79 @@
+"""
+Compare ANN backends against exact search on synthetic embeddings.
+
+Reports build time, recall@k (overlap with the exact top k) and queries per second
+for IVF over a range of nprobe values and, when hnswlib is installed, HNSW over a
+range of ef values.
+
+    python ann_benchmark.py --n 200000 --dim 256 --queries 1000 --k 10
+"""
+
+import time
+import argparse
+
+import numpy as np
+
+from ann_index import ExactIndex, IVFIndex, HNSWIndex
+
+
+def synthetic_embeddings(n: int, dim: int, clusters: int = 256, seed: int = 0) -> np.ndarray:
+    """Normalized vectors drawn around random centres, so neighbourhoods look like real embeddings"""
+    rng = np.random.default_rng(seed)
+    centres = rng.standard_normal((clusters, dim)).astype(np.float32)
+    vectors = centres[rng.integers(0, clusters, n)] + 0.5 * rng.standard_normal((n, dim)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def recall_at_k(found: np.ndarray, truth: np.ndarray) -> float:
+    hits = sum(len(set(f[f >= 0]) & set(t)) for f, t in zip(found, truth))
+    return hits / truth.size
+
+
+def timed_search(index, queries: np.ndarray, k: int, **params):
+    start = time.perf_counter()
+    ids, _ = index.search(queries, k, **params)
+    return ids, len(queries) / (time.perf_counter() - start)
+
+
+def timed_build(index, vectors: np.ndarray) -> float:
+    start = time.perf_counter()
+    index.build(vectors)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--n", type=int, default=100_000, help="number of indexed vectors")
+    parser.add_argument("--dim", type=int, default=256, help="embedding dimension")
+    parser.add_argument("--queries", type=int, default=1000, help="number of queries")
+    parser.add_argument("--k", type=int, default=10, help="neighbours per query")
+    args = parser.parse_args()
+
+    data = synthetic_embeddings(args.n + args.queries, args.dim)
+    vectors, queries = data[:args.n], data[args.n:]
+
+    exact = ExactIndex()
+    exact.build(vectors)
+    truth, exact_qps = timed_search(exact, queries, args.k)
+    print(f"{'backend':<24}{'build s':>10}{'recall@' + str(args.k):>12}{'QPS':>12}")
+    print(f"{'exact':<24}{0:>10.2f}{1:>12.3f}{exact_qps:>12.0f}")
+
+    ivf = IVFIndex()
+    build_time = timed_build(ivf, vectors)
+    for nprobe in (1, 4, 16, 64):
+        ids, qps = timed_search(ivf, queries, args.k, nprobe=nprobe)
+        print(f"{'ivf nprobe=' + str(nprobe):<24}{build_time:>10.2f}{recall_at_k(ids, truth):>12.3f}{qps:>12.0f}")
+
+    hnsw = HNSWIndex()
+    try:
+        build_time = timed_build(hnsw, vectors)
+    except ImportError as e:
+        print(f"hnsw skipped: {e}")
+        return
+    for ef in (16, 64, 256):
+        ids, qps = timed_search(hnsw, queries, args.k, ef=ef)
+        print(f"{'hnsw ef=' + str(ef):<24}{build_time:>10.2f}{recall_at_k(ids, truth):>12.3f}{qps:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
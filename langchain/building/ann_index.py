@@ -0,0 +1,224 @@
+"""
+Nearest-neighbour search backends for PersistentVectorStore.
+
+All backends take L2-normalized float32 vectors and return cosine similarities.
+
+- ExactIndex: brute-force matrix product, the reference for recall
+- IVFIndex: inverted file over k-means clusters; `nprobe` clusters are scanned per query
+- HNSWIndex: hierarchical navigable small-world graph via hnswlib; `ef` is the search beam
+
+IVF and HNSW trade recall for latency through nprobe / ef, which can be set on the
+index or passed per search (e.g. `db.as_retriever(search_kwargs={"k": 4, "nprobe": 16})`).
+"""
+
+import json
+import math
+from pathlib import Path
+from typing import Optional, Tuple
+
+import numpy as np
+
+
+def _top_k(scores: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Indices and values of the k highest scores per row, best first"""
+    k = min(k, scores.shape[1])
+    top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    top_scores = np.take_along_axis(scores, top, axis=1)
+    order = np.argsort(-top_scores, axis=1)
+    return np.take_along_axis(top, order, axis=1), np.take_along_axis(top_scores, order, axis=1)
+
+
+class ExactIndex:
+    """Brute-force search over every vector, in query batches and document blocks"""
+
+    name = "exact"
+
+    def __init__(self, batch_size: int = 256, block_size: int = 65_536):
+        """
+        batch_size: Queries scored at once
+        block_size: Vectors scored at once; a batch holds at most batch_size x block_size scores
+        """
+        self.batch_size = batch_size
+        self.block_size = block_size
+        self.signature: Optional[str] = None
+        self.vectors: Optional[np.ndarray] = None
+
+    def build(self, vectors: np.ndarray):
+        self.vectors = vectors
+
+    def _search_batch(self, queries: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        ids = np.zeros((len(queries), 0), dtype=np.int64)
+        scores = np.zeros((len(queries), 0), dtype=np.float32)
+        for start in range(0, len(self.vectors), self.block_size):
+            block_ids, block_scores = _top_k(queries @ np.asarray(self.vectors[start:start + self.block_size]).T, k)
+            # Merge the block's best with the best so far
+            ids = np.concatenate([ids, block_ids + start], axis=1)
+            scores = np.concatenate([scores, block_scores], axis=1)
+            top, scores = _top_k(scores, k)
+            ids = np.take_along_axis(ids, top, axis=1)
+        return ids, scores
+
+    def search(self, queries: np.ndarray, k: int, **params) -> Tuple[np.ndarray, np.ndarray]:
+        ids, scores = [], []
+        for start in range(0, len(queries), self.batch_size):
+            batch_ids, batch_scores = self._search_batch(queries[start:start + self.batch_size], k)
+            ids.append(batch_ids)
+            scores.append(batch_scores)
+        return np.concatenate(ids), np.concatenate(scores)
+
+    def save(self, path: Path):
+        pass
+
+    def load(self, path: Path, signature: str, vectors: np.ndarray) -> bool:
+        # Nothing to persist: "building" only keeps a reference to the vectors
+        return False
+
+
+class IVFIndex:
+    """
+    Inverted file index: vectors are grouped by their nearest k-means centroid and a
+    query only scans the vectors of its nprobe nearest centroids.
+    """
+
+    name = "ivf"
+
+    def __init__(self, nlist: Optional[int] = None, nprobe: int = 8, train_size: int = 100_000,
+                 iterations: int = 10, seed: int = 0):
+        """
+        nlist: Number of clusters (defaults to 4 * sqrt(n))
+        nprobe: Clusters scanned per query; higher is slower with better recall
+        train_size: Vectors sampled to train the centroids
+        iterations: k-means iterations
+        """
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.train_size = train_size
+        self.iterations = iterations
+        self.seed = seed
+        self.signature: Optional[str] = None
+        self.centroids: Optional[np.ndarray] = None
+        self.offsets: Optional[np.ndarray] = None
+        self.ids: Optional[np.ndarray] = None
+        self.vectors: Optional[np.ndarray] = None
+
+    def _train(self, vectors: np.ndarray, nlist: int) -> np.ndarray:
+        rng = np.random.default_rng(self.seed)
+        sample = np.asarray(vectors[np.sort(rng.choice(len(vectors), min(len(vectors), self.train_size), replace=False))])
+        centroids = sample[rng.choice(len(sample), nlist, replace=False)]
+        for _ in range(self.iterations):
+            assign = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assign, sample)
+            counts = np.bincount(assign, minlength=nlist)
+            # Re-seed empty clusters from random sample points
+            empty = counts == 0
+            sums[empty] = sample[rng.choice(len(sample), int(empty.sum()))]
+            centroids = sums / np.maximum(np.linalg.norm(sums, axis=1, keepdims=True), 1e-12)
+        return centroids.astype(np.float32)
+
+    def build(self, vectors: np.ndarray, chunk_size: int = 65_536):
+        nlist = min(self.nlist or max(1, int(4 * math.sqrt(len(vectors)))), len(vectors), self.train_size)
+        self.centroids = self._train(vectors, nlist)
+        assign = np.concatenate([
+            np.argmax(np.asarray(vectors[start:start + chunk_size]) @ self.centroids.T, axis=1)
+            for start in range(0, len(vectors), chunk_size)
+        ])
+        # Row ids grouped by cluster (ascending within each); the vectors themselves stay
+        # in the store's memory map instead of being copied in cluster order
+        self.ids = np.argsort(assign, kind="stable")
+        self.offsets = np.searchsorted(assign[self.ids], np.arange(nlist + 1))
+        self.vectors = vectors
+
+    def search(self, queries: np.ndarray, k: int, nprobe: Optional[int] = None, **params) -> Tuple[np.ndarray, np.ndarray]:
+        nprobe = min(nprobe or self.nprobe, len(self.centroids))
+        probes, _ = _top_k(queries @ self.centroids.T, nprobe)
+        # Best k of each probed cluster per query, merged at the end
+        candidate_ids = np.full((len(queries), nprobe, k), -1, dtype=np.int64)
+        candidate_scores = np.full((len(queries), nprobe, k), -np.inf, dtype=np.float32)
+        # One pass per probed cluster scores it against every query that probes it
+        for cluster in np.unique(probes):
+            members = self.ids[self.offsets[cluster]:self.offsets[cluster + 1]]
+            if not len(members):
+                continue
+            rows, slots = np.nonzero(probes == cluster)
+            top, top_scores = _top_k(queries[rows] @ np.asarray(self.vectors[members]).T, k)
+            candidate_ids[rows, slots, :top.shape[1]] = members[top]
+            candidate_scores[rows, slots, :top.shape[1]] = top_scores
+        candidate_ids = candidate_ids.reshape(len(queries), -1)
+        top, scores = _top_k(candidate_scores.reshape(len(queries), -1), k)
+        return np.take_along_axis(candidate_ids, top, axis=1), scores
+
+    def save(self, path: Path):
+        path.mkdir(parents=True, exist_ok=True)
+        np.savez(path / "ivf.npz", centroids=self.centroids, offsets=self.offsets, ids=self.ids,
+                 signature=np.array(self.signature))
+
+    def load(self, path: Path, signature: str, vectors: np.ndarray) -> bool:
+        if not (path / "ivf.npz").exists():
+            return False
+        with np.load(path / "ivf.npz") as data:
+            if str(data["signature"]) != signature:
+                return False
+            self.centroids, self.offsets, self.ids = data["centroids"], data["offsets"], data["ids"]
+        self.vectors = vectors
+        self.signature = signature
+        return True
+
+
+class HNSWIndex:
+    """Graph index built with hnswlib (pip install hnswlib)"""
+
+    name = "hnsw"
+
+    def __init__(self, M: int = 16, ef_construction: int = 200, ef: int = 64, num_threads: int = -1):
+        """
+        M: Graph degree; higher improves recall at the cost of memory and build time
+        ef_construction: Beam width while building
+        ef: Beam width while searching; higher is slower with better recall
+        num_threads: Threads for building and batched queries (-1 for all cores)
+        """
+        self.M = M
+        self.ef_construction = ef_construction
+        self.ef = ef
+        self.num_threads = num_threads
+        self.signature: Optional[str] = None
+        self.index = None
+
+    @staticmethod
+    def _hnswlib():
+        try:
+            import hnswlib
+        except ImportError as e:
+            raise ImportError("HNSWIndex requires hnswlib: pip install hnswlib") from e
+        return hnswlib
+
+    def build(self, vectors: np.ndarray):
+        hnswlib = self._hnswlib()
+        self.index = hnswlib.Index(space="ip", dim=vectors.shape[1])
+        self.index.init_index(max_elements=len(vectors), ef_construction=self.ef_construction, M=self.M)
+        self.index.add_items(np.asarray(vectors), np.arange(len(vectors)), num_threads=self.num_threads)
+
+    def search(self, queries: np.ndarray, k: int, ef: Optional[int] = None, **params) -> Tuple[np.ndarray, np.ndarray]:
+        k = min(k, self.index.get_current_count())
+        self.index.set_ef(max(ef or self.ef, k))
+        labels, distances = self.index.knn_query(queries, k=k, num_threads=self.num_threads)
+        # hnswlib's inner-product distance is 1 - dot product
+        return labels.astype(np.int64), (1 - distances).astype(np.float32)
+
+    def save(self, path: Path):
+        path.mkdir(parents=True, exist_ok=True)
+        self.index.save_index(str(path / "hnsw.bin"))
+        with open(path / "hnsw.json", "w") as f:
+            json.dump({"signature": self.signature, "dim": self.index.dim}, f)
+
+    def load(self, path: Path, signature: str, vectors: np.ndarray) -> bool:
+        if not (path / "hnsw.bin").exists() or not (path / "hnsw.json").exists():
+            return False
+        with open(path / "hnsw.json") as f:
+            info = json.load(f)
+        if info["signature"] != signature:
+            return False
+        self.index = self._hnswlib().Index(space="ip", dim=info["dim"])
+        self.index.load_index(str(path / "hnsw.bin"), max_elements=len(vectors))
+        self.signature = signature
+        return True
@@ -0,0 +1,29 @@
+import asyncio
+import threading
+from typing import Any, Coroutine
+
+
+def run_sync(coroutine: Coroutine) -> Any:
+    """
+    Run a coroutine to completion from synchronous code. Inside Jupyter an event
+    loop is already running, where asyncio.run fails, so the coroutine runs on a
+    fresh loop in a helper thread instead.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coroutine)
+    result = {}
+
+    def target():
+        try:
+            result["value"] = asyncio.run(coroutine)
+        except BaseException as e:
+            result["error"] = e
+
+    thread = threading.Thread(target=target)
+    thread.start()
+    thread.join()
+    if "error" in result:
+        raise result["error"]
+    return result["value"]
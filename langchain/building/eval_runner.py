@@ -0,0 +1,251 @@
+"""
+Concurrent, cached and resumable evaluation for the 05-Evaluation notebook.
+
+EvaluationRunner replaces the sequential `example_gen_chain.apply_and_parse`,
+`qa.apply(examples)` and `eval_chain.evaluate(examples, predictions)` calls. Each
+example is predicted and then graded as soon as its prediction arrives, with at most
+`max_concurrency` LLM calls in flight. Every finished prediction and grade is
+appended to a JSONL cache in `cache_dir`, so an interrupted run resumes where it
+stopped and an unchanged example is never sent twice. Generated examples are kept
+in a versioned ExampleStore (see example_store.py).
+`summary` aggregates accuracy, and latency percentiles and token usage of the calls
+actually made in the run, separately from what the cache saved.
+
+    runner = EvaluationRunner(qa, eval_chain, "eval_runs/catalog", max_concurrency=16)
+    examples += runner.generate_examples(example_gen_chain, data[:100], set_name="catalog-v1")
+    results = runner.run(examples)
+    runner.summary(results)
+"""
+
+import re
+import time
+import random
+import asyncio
+import hashlib
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.documents import Document
+
+from async_utils import run_sync
+from example_store import ExampleStore
+from ingest import is_rate_limit_error, retry_after_seconds
+from jsonl_cache import JsonlCache
+
+QA_PAIR_PATTERN = re.compile(r"QUESTION: (.*?)\n+ANSWER: (.*)", re.DOTALL)
+
+
+def cache_key(*parts: str) -> str:
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+def parse_grade(text: str) -> Optional[bool]:
+    """CORRECT / INCORRECT verdict of a QAEvalChain output, None if it has neither"""
+    text = text.upper()
+    if "INCORRECT" in text:
+        return False
+    if "CORRECT" in text:
+        return True
+    return None
+
+
+def parse_qa_pair(output: Any) -> Dict[str, str]:
+    """QAGenerateChain output (parsed dict or raw "QUESTION: ... ANSWER: ..." text) as query/answer"""
+    if isinstance(output, dict):
+        return {"query": output["query"], "answer": output["answer"]}
+    match = QA_PAIR_PATTERN.search(output)
+    if not match:
+        raise ValueError(f"Could not parse a question and answer from: {output!r}")
+    return {"query": match.group(1).strip(), "answer": match.group(2).strip()}
+
+
+class TokenUsageHandler(BaseCallbackHandler):
+    """Sums the tokens reported by every LLM call it is attached to"""
+
+    def __init__(self):
+        self.tokens = 0
+
+    def on_llm_end(self, response, **kwargs: Any):
+        usage = (response.llm_output or {}).get("token_usage") or {}
+        if usage:
+            self.tokens += usage.get("total_tokens", 0)
+            return
+        for generations in response.generations:
+            for generation in generations:
+                metadata = getattr(getattr(generation, "message", None), "usage_metadata", None) or {}
+                self.tokens += metadata.get("total_tokens", 0)
+
+
+class EvaluationRunner:
+    """Predicts and grades QA examples concurrently with a resumable on-disk cache"""
+
+    def __init__(self, qa: Any, eval_chain: Any, cache_dir: str = "eval_runs/default", max_concurrency: int = 8,
+                 max_retries: int = 6, base_delay: float = 1.0, version: str = "",
+                 example_store: Optional[ExampleStore] = None):
+        """
+        qa: Chain answering {"query": ...} with a "result" (RetrievalQA, AdaptiveQA)
+        eval_chain: QAEvalChain grading query/answer/result
+        cache_dir: Directory for the JSONL caches of this evaluation
+        max_concurrency: LLM calls in flight at once
+        max_retries: Attempts per call on rate-limit errors
+        base_delay: First backoff delay in seconds; doubles on each retry
+        version: Part of the prediction cache key; change it when the QA chain changes
+        example_store: Store of generated examples (eval_examples/ by default)
+        """
+        self.qa = qa
+        self.eval_chain = eval_chain
+        self.cache_dir = Path(cache_dir)
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.version = version
+        self.predictions = JsonlCache(self.cache_dir / "predictions.jsonl")
+        self.grades = JsonlCache(self.cache_dir / "grades.jsonl")
+        self.example_store = example_store or ExampleStore()
+        self._resume_at = 0.0
+
+    async def _call(self, chain: Any, inputs: Dict[str, Any], semaphore: asyncio.Semaphore) -> Dict[str, Any]:
+        """One chain call under the run's concurrency limit, with shared rate-limit backoff"""
+        for attempt in range(self.max_retries + 1):
+            async with semaphore:
+                wait = self._resume_at - time.monotonic()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                usage = TokenUsageHandler()
+                started = time.perf_counter()
+                try:
+                    output = await chain.ainvoke(inputs, config={"callbacks": [usage]})
+                    return {"output": output, "latency": time.perf_counter() - started, "tokens": usage.tokens}
+                except Exception as e:
+                    if not is_rate_limit_error(e) or attempt == self.max_retries:
+                        raise
+                    delay = retry_after_seconds(e) or self.base_delay * 2 ** attempt * (1 + random.random())
+                    self._resume_at = max(self._resume_at, time.monotonic() + delay)
+
+    # Example generation
+
+    async def agenerate_examples(self, example_gen_chain: Any, documents: List[Document],
+                                 set_name: Optional[str] = None, refresh: bool = False) -> List[Dict[str, str]]:
+        """Async version of generate_examples"""
+        version = self.example_store.register(example_gen_chain)
+        texts = [doc.page_content for doc in documents]
+        if set_name and not refresh:
+            frozen = self.example_store.load_set(set_name, version, texts)
+            if frozen is not None:
+                return frozen
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def generate(doc: Document) -> Dict[str, str]:
+            example = self.example_store.get(version, doc.page_content)
+            if example is None:
+                call = await self._call(example_gen_chain, {"doc": doc}, semaphore)
+                example = parse_qa_pair(call["output"][example_gen_chain.output_key])
+                self.example_store.put(version, doc.page_content, example,
+                                       latency=call["latency"], tokens=call["tokens"])
+            return example
+
+        examples = list(await asyncio.gather(*(generate(doc) for doc in documents)))
+        if set_name:
+            self.example_store.save_set(set_name, version, examples, texts)
+        return examples
+
+    def generate_examples(self, example_gen_chain: Any, documents: List[Document],
+                          set_name: Optional[str] = None, refresh: bool = False) -> List[Dict[str, str]]:
+        """
+        One generated {"query", "answer"} per document. Only documents without an example
+        from the same generator prompt and model are sent to the LLM. With set_name, the
+        examples are frozen under that name and later calls return them unchanged; a set
+        saved for another generator or other documents raises StaleSetError.
+        refresh: Regenerate the named set and overwrite it
+        """
+        return run_sync(self.agenerate_examples(example_gen_chain, documents, set_name, refresh))
+
+    # Prediction and grading
+
+    async def _evaluate_one(self, example: Dict[str, str], semaphore: asyncio.Semaphore) -> Dict[str, Any]:
+        result = {"query": example["query"], "answer": example["answer"], "cached": True,
+                  "predict_cached": True, "grade_cached": True}
+        try:
+            prediction_key = cache_key(self.version, example["query"])
+            prediction = self.predictions.get(prediction_key)
+            if prediction is None:
+                result["cached"] = result["predict_cached"] = False
+                call = await self._call(self.qa, {"query": example["query"]}, semaphore)
+                prediction = {"key": prediction_key, "value": call["output"]["result"],
+                              "latency": call["latency"], "tokens": call["tokens"]}
+                self.predictions.put(prediction)
+            result["result"] = prediction["value"]
+
+            grade_key = cache_key(example["query"], example["answer"], prediction["value"])
+            grade = self.grades.get(grade_key)
+            if grade is None:
+                result["cached"] = result["grade_cached"] = False
+                call = await self._call(self.eval_chain, {**example, "result": prediction["value"]}, semaphore)
+                grade = {"key": grade_key, "value": call["output"][self.eval_chain.output_key],
+                         "latency": call["latency"], "tokens": call["tokens"]}
+                self.grades.put(grade)
+            result.update({
+                "grade": grade["value"],
+                "correct": parse_grade(grade["value"]),
+                "predict_latency": prediction["latency"],
+                "grade_latency": grade["latency"],
+                "predict_tokens": prediction["tokens"],
+                "grade_tokens": grade["tokens"],
+                "tokens": prediction["tokens"] + grade["tokens"],
+            })
+        except Exception as e:
+            result.update({"cached": False, "error": f"{type(e).__name__}: {e}"})
+        return result
+
+    async def arun(self, examples: List[Dict[str, str]]) -> List[Dict[str, Any]]:
+        """Async version of run"""
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        results: List[Dict[str, Any]] = [None] * len(examples)
+        started = time.monotonic()
+        done = 0
+
+        async def evaluate(i: int, example: Dict[str, str]):
+            nonlocal done
+            results[i] = await self._evaluate_one(example, semaphore)
+            done += 1
+            print(f"Evaluated {done}/{len(examples)} ({time.monotonic() - started:.0f}s)", end="\r")
+
+        await asyncio.gather(*(evaluate(i, example) for i, example in enumerate(examples)))
+        print()
+        return results
+
+    def run(self, examples: List[Dict[str, str]]) -> List[Dict[str, Any]]:
+        """
+        Predict and grade every {"query", "answer"} example. Returns one dict per example
+        with query, answer, result, grade, correct, latencies, tokens and whether each
+        stage came from the cache (or error).
+        """
+        return run_sync(self.arun(examples))
+
+    @staticmethod
+    def summary(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Accuracy over a run's results, with latency percentiles and tokens of the LLM calls
+        made in this run; tokens served from the cache are reported as cached_tokens
+        """
+        graded = [r for r in results if "error" not in r]
+        verdicts = [r["correct"] for r in graded if r["correct"] is not None]
+        stats: Dict[str, Any] = {
+            "examples": len(results),
+            "errors": len(results) - len(graded),
+            "cached": sum(r["cached"] for r in results),
+            "accuracy": sum(verdicts) / len(verdicts) if verdicts else None,
+            "unparsed_grades": len(graded) - len(verdicts),
+            "tokens": 0,
+            "cached_tokens": 0,
+        }
+        for stage in ("predict", "grade"):
+            for r in graded:
+                stats["cached_tokens" if r[f"{stage}_cached"] else "tokens"] += r[f"{stage}_tokens"]
+            latencies = np.array([r[f"{stage}_latency"] for r in graded if not r[f"{stage}_cached"]])
+            stats[f"{stage}_calls"] = len(latencies)
+            stats[f"{stage}_latency_p50"] = float(np.percentile(latencies, 50)) if len(latencies) else None
+            stats[f"{stage}_latency_p95"] = float(np.percentile(latencies, 95)) if len(latencies) else None
+        return stats
@@ -0,0 +1,124 @@
+"""
+Versioned store of generated Q&A examples for the 05-Evaluation notebook.
+
+Examples are keyed by the content hash of their source document and by a generator
+version, a hash of the QAGenerateChain prompt and its model settings. Generating an
+eval set again only calls the LLM for documents that are new or whose text changed;
+changing the prompt or model starts a new version next to the old one instead of
+overwriting it. A named eval set pins an exact list of examples so later runs load
+the same test set from disk. The set records the generator version and the hashes of
+its documents; loading it for another generator or other documents raises a
+StaleSetError instead of silently returning the old examples. Refresh a set by
+regenerating it with refresh=True, or by deleting sets/<name>.json.
+
+    eval_examples/
+        <version>/manifest.json     prompt and model of the generator
+        <version>/examples.jsonl    one generated example per document hash
+        sets/<name>.json            frozen eval sets
+"""
+
+import json
+import hashlib
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from jsonl_cache import JsonlCache
+from vector_index import content_hash
+
+
+class StaleSetError(ValueError):
+    """A frozen eval set was generated by another generator version or from other documents"""
+
+
+def generator_version(chain: Any) -> str:
+    """Short hash of a generator chain's prompt and model settings"""
+    prompt = getattr(getattr(chain, "prompt", None), "template", None) or repr(getattr(chain, "prompt", chain))
+    llm = getattr(chain, "llm", None)
+    settings = getattr(llm, "_identifying_params", None) or {"llm": repr(llm)}
+    payload = json.dumps({"prompt": prompt, "llm": settings}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+class ExampleStore:
+    """Generated examples keyed by document content hash and generator version"""
+
+    def __init__(self, store_dir: str = "eval_examples"):
+        """
+        store_dir: Directory holding one sub-directory per generator version and the frozen sets
+        """
+        self.store_dir = Path(store_dir)
+        self._caches: Dict[str, JsonlCache] = {}
+
+    def _cache(self, version: str) -> JsonlCache:
+        if version not in self._caches:
+            self._caches[version] = JsonlCache(self.store_dir / version / "examples.jsonl")
+        return self._caches[version]
+
+    def register(self, chain: Any) -> str:
+        """Version of a generator chain, recording its prompt and model on first use"""
+        version = generator_version(chain)
+        manifest = self.store_dir / version / "manifest.json"
+        if not manifest.exists():
+            manifest.parent.mkdir(parents=True, exist_ok=True)
+            llm = getattr(chain, "llm", None)
+            with open(manifest, "w") as f:
+                json.dump({
+                    "prompt": getattr(getattr(chain, "prompt", None), "template", None),
+                    "llm": getattr(llm, "_identifying_params", None),
+                }, f, indent=2, default=str)
+        return version
+
+    def get(self, version: str, text: str) -> Optional[Dict[str, str]]:
+        record = self._cache(version).get(content_hash(text))
+        return record["value"] if record else None
+
+    def put(self, version: str, text: str, example: Dict[str, str], **stats: Any):
+        self._cache(version).put({"key": content_hash(text), "value": example, **stats})
+
+    def versions(self) -> List[Dict[str, Any]]:
+        """Every stored generator version with its manifest and example count"""
+        found = []
+        for manifest in sorted(self.store_dir.glob("*/manifest.json")):
+            with open(manifest) as f:
+                info = json.load(f)
+            found.append({"version": manifest.parent.name, "examples": len(self._cache(manifest.parent.name).records), **info})
+        return found
+
+    # Frozen eval sets
+
+    def _set_path(self, name: str) -> Path:
+        return self.store_dir / "sets" / f"{name}.json"
+
+    def save_set(self, name: str, version: str, examples: List[Dict[str, str]], texts: List[str]):
+        """
+        name: Name of the eval set
+        version: Generator version the examples came from
+        examples: Examples in document order
+        texts: Source document texts, one per example
+        """
+        path = self._set_path(name)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump({"version": version, "documents": [content_hash(text) for text in texts],
+                       "examples": examples}, f, indent=2)
+        tmp_path.replace(path)
+
+    def load_set(self, name: str, version: str, texts: List[str]) -> Optional[List[Dict[str, str]]]:
+        """
+        Examples of a frozen eval set, or None if it was never saved.
+        Raises StaleSetError when the set was saved for another generator version or other documents.
+        """
+        if not self._set_path(name).exists():
+            return None
+        with open(self._set_path(name)) as f:
+            frozen = json.load(f)
+        refresh_hint = f"regenerate it with refresh=True or delete {self._set_path(name)}"
+        if frozen.get("version") != version:
+            raise StaleSetError(f"Eval set {name!r} was generated by generator version {frozen.get('version')}, "
+                                f"not {version}; {refresh_hint}")
+        if "documents" not in frozen:
+            raise StaleSetError(f"Eval set {name!r} does not record its documents; {refresh_hint}")
+        if frozen["documents"] != [content_hash(text) for text in texts]:
+            raise StaleSetError(f"Eval set {name!r} was generated from other documents; {refresh_hint}")
+        return frozen["examples"]
@@ -0,0 +1,168 @@
+"""
+Hybrid keyword + vector retrieval for PersistentVectorStore.
+
+BM25Index is a compact inverted index over the rows of a store: the postings of
+all terms are kept in two flat arrays (document ids and term frequencies) with
+one offset per term, so a query touches only the postings of its own terms.
+Tokens keep a trailing "+", so attributes such as "UPF 50+" are matched exactly.
+The index is saved next to the vectors and rebuilt only when the rows change.
+
+HybridRetriever runs BM25 and vector search for a query and fuses the two rankings
+with reciprocal rank fusion (RRF), so a document ranked highly by either one
+rises to the top and a small k is enough for the `stuff` chain:
+
+    retriever = HybridRetriever.from_store(catalog_db, k=4)
+    qa_stuff = RetrievalQA.from_chain_type(llm=llm, chain_type="stuff", retriever=retriever)
+"""
+
+import re
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+
+from vector_index import PersistentVectorStore
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+\+?")
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+class BM25Index:
+    """Okapi BM25 over a flat-array inverted index"""
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        """
+        k1: Term-frequency saturation
+        b: Document-length normalization (0 disables it)
+        """
+        self.k1 = k1
+        self.b = b
+        self.signature: Optional[str] = None
+        self.vocab: Dict[str, int] = {}
+        self.offsets = np.zeros(1, dtype=np.int64)
+        self.doc_ids = np.zeros(0, dtype=np.int32)
+        self.tfs = np.zeros(0, dtype=np.float32)
+        self.doc_lengths = np.zeros(0, dtype=np.float32)
+
+    def __len__(self) -> int:
+        return len(self.doc_lengths)
+
+    def build(self, texts: List[str]):
+        term_ids, doc_ids, lengths = [], [], []
+        for doc_id, text in enumerate(texts):
+            tokens = tokenize(text)
+            lengths.append(len(tokens))
+            term_ids.extend(self.vocab.setdefault(token, len(self.vocab)) for token in tokens)
+            doc_ids.extend([doc_id] * len(tokens))
+        self.doc_lengths = np.array(lengths, dtype=np.float32)
+        # Count (term, doc) pairs, then lay postings out term by term
+        pairs, tfs = np.unique(np.array([term_ids, doc_ids], dtype=np.int64).reshape(2, -1), axis=1, return_counts=True)
+        self.doc_ids = pairs[1].astype(np.int32)
+        self.tfs = tfs.astype(np.float32)
+        self.offsets = np.searchsorted(pairs[0], np.arange(len(self.vocab) + 1))
+
+    def search(self, query: str, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Row ids and BM25 scores of the k best matching rows, best first (only rows matching a term)"""
+        scores = np.zeros(len(self), dtype=np.float32)
+        average_length = max(float(self.doc_lengths.mean()), 1.0) if len(self) else 1.0
+        for term in set(tokenize(query)):
+            term_id = self.vocab.get(term)
+            if term_id is None:
+                continue
+            start, end = self.offsets[term_id], self.offsets[term_id + 1]
+            docs, tfs = self.doc_ids[start:end], self.tfs[start:end]
+            idf = np.log(1 + (len(self) - len(docs) + 0.5) / (len(docs) + 0.5))
+            norm = self.k1 * (1 - self.b + self.b * self.doc_lengths[docs] / average_length)
+            scores[docs] += idf * tfs * (self.k1 + 1) / (tfs + norm)
+        matched = np.flatnonzero(scores)
+        if len(matched) > k:
+            matched = matched[np.argpartition(-scores[matched], k - 1)[:k]]
+        top = matched[np.argsort(-scores[matched], kind="stable")]
+        return top, scores[top]
+
+    def save(self, path: Path):
+        path.mkdir(parents=True, exist_ok=True)
+        np.savez(path / "bm25.npz", offsets=self.offsets, doc_ids=self.doc_ids, tfs=self.tfs,
+                 doc_lengths=self.doc_lengths)
+        with open(path / "bm25.json", "w") as f:
+            json.dump({"signature": self.signature, "vocab": list(self.vocab)}, f)
+
+    def load(self, path: Path, signature: str) -> bool:
+        if not (path / "bm25.npz").exists() or not (path / "bm25.json").exists():
+            return False
+        with open(path / "bm25.json") as f:
+            info = json.load(f)
+        if info["signature"] != signature:
+            return False
+        with np.load(path / "bm25.npz") as data:
+            self.offsets, self.doc_ids = data["offsets"], data["doc_ids"]
+            self.tfs, self.doc_lengths = data["tfs"], data["doc_lengths"]
+        self.vocab = {term: i for i, term in enumerate(info["vocab"])}
+        self.signature = signature
+        return True
+
+    @classmethod
+    def for_store(cls, store: PersistentVectorStore, **kwargs: Any) -> "BM25Index":
+        """Load the store's BM25 index from disk, or build and save it if the rows changed"""
+        index = cls(**kwargs)
+        signature = store._rows_signature()
+        path = store.index_dir / "bm25"
+        if not index.load(path, signature):
+            index.build([row["page_content"] for row in store.rows])
+            index.signature = signature
+            index.save(path)
+        return index
+
+
+def reciprocal_rank_fusion(rankings: List[List[int]], weights: Optional[List[float]] = None,
+                           rrf_k: int = 60) -> List[Tuple[int, float]]:
+    """Fuse several ranked id lists: score(id) = sum of weight / (rrf_k + rank)"""
+    scores: Dict[int, float] = {}
+    for ranking, weight in zip(rankings, weights or [1.0] * len(rankings)):
+        for rank, row_id in enumerate(ranking, start=1):
+            scores[row_id] = scores.get(row_id, 0.0) + weight / (rrf_k + rank)
+    return sorted(scores.items(), key=lambda item: -item[1])
+
+
+class HybridRetriever(BaseRetriever):
+    """Retriever fusing BM25 keyword ranking with vector similarity ranking"""
+
+    store: Any
+    bm25: Any
+    k: int = 4
+    fetch_k: int = 20
+    rrf_k: int = 60
+    keyword_weight: float = 1.0
+    vector_weight: float = 1.0
+    search_kwargs: Dict[str, Any] = {}
+
+    @classmethod
+    def from_store(cls, store: PersistentVectorStore, **kwargs: Any) -> "HybridRetriever":
+        """
+        store: PersistentVectorStore to search
+        kwargs: k (documents returned), fetch_k (candidates from each ranking), rrf_k,
+            keyword_weight / vector_weight, and search_kwargs for the vector backend (e.g. nprobe)
+        """
+        return cls(store=store, bm25=BM25Index.for_store(store), **kwargs)
+
+    def _rankings(self, query: str) -> List[List[int]]:
+        if self.bm25.signature != self.store._rows_signature():
+            # The store was synced since the retriever was created
+            self.bm25 = BM25Index.for_store(self.store)
+        keyword_ids, _ = self.bm25.search(query, self.fetch_k)
+        if not len(self.store):
+            return [keyword_ids.tolist(), []]
+        vector_ids, _ = self.store.search_ids([self.store.embedding.embed_query(query)], self.fetch_k,
+                                              **self.search_kwargs)
+        return [keyword_ids.tolist(), [int(i) for i in vector_ids[0] if i >= 0]]
+
+    def _get_relevant_documents(self, query: str, *, run_manager: CallbackManagerForRetrieverRun) -> List[Document]:
+        fused = reciprocal_rank_fusion(self._rankings(query), [self.keyword_weight, self.vector_weight], self.rrf_k)
+        return [self.store._document(row_id) for row_id, _ in fused[:self.k]]
@@ -0,0 +1,293 @@
+"""
+Streaming, batched and concurrent embedding ingestion for PersistentVectorStore.
+
+CSV rows are read lazily, grouped into batches bounded by row count and estimated
+tokens, and embedded by a fixed number of concurrent workers. When the API
+returns a rate-limit error every worker backs off together before retrying.
+Finished batches are appended in row order to a staging area under
+<index_dir>/ingest with a checkpoint, so an interrupted run resumes after the
+last committed row. Rows whose text is already in the index are not re-embedded.
+
+    python ingest.py OutdoorClothingCatalog_1000.csv catalog_index --concurrency 8
+    python ingest.py OutdoorClothingCatalog_1000.csv catalog_index_glove --local glove-wiki-gigaword-100
+"""
+
+import os
+import csv
+import json
+import time
+import random
+import asyncio
+import argparse
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+from async_utils import run_sync
+from vector_index import PersistentVectorStore, content_hash
+
+
+def stream_csv_documents(csv_path: str, start_row: int = 0, **csv_args: Any) -> Iterator[Document]:
+    """Yield one Document per CSV row, formatted like CSVLoader, starting at start_row"""
+    with open(csv_path, newline="", encoding="utf-8") as f:
+        for i, row in enumerate(csv.DictReader(f, **csv_args)):
+            if i < start_row:
+                continue
+            content = "\n".join(f"{(k or '').strip()}: {(v or '').strip()}" for k, v in row.items())
+            yield Document(page_content=content, metadata={"source": csv_path, "row": i})
+
+
+def estimate_tokens(text: str) -> int:
+    # ~4 characters per token for English text; only used to size batches
+    return len(text) // 4 + 1
+
+
+def batch_documents(documents: Iterator[Document], batch_size: int, max_batch_tokens: int) -> Iterator[List[Document]]:
+    """Group documents into batches capped by count and estimated tokens"""
+    batch, tokens = [], 0
+    for doc in documents:
+        doc_tokens = estimate_tokens(doc.page_content)
+        if batch and (len(batch) >= batch_size or tokens + doc_tokens > max_batch_tokens):
+            yield batch
+            batch, tokens = [], 0
+        batch.append(doc)
+        tokens += doc_tokens
+    if batch:
+        yield batch
+
+
+def is_rate_limit_error(error: Exception) -> bool:
+    status = getattr(error, "status_code", None) or getattr(getattr(error, "response", None), "status_code", None)
+    return status == 429 or "RateLimit" in type(error).__name__ or "rate limit" in str(error).lower()
+
+
+def retry_after_seconds(error: Exception) -> Optional[float]:
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+class EmbeddingIngestor:
+    """Embeds a CSV into a PersistentVectorStore index directory with checkpointed progress"""
+
+    def __init__(self, embedding: Embeddings, index_dir: str, batch_size: int = 500,
+                 max_batch_tokens: int = 100_000, concurrency: int = 4, max_retries: int = 8,
+                 base_delay: float = 1.0, verbose: bool = False):
+        """
+        embedding: LangChain embeddings used for rows not already in the index
+        index_dir: PersistentVectorStore directory to write
+        batch_size: Maximum rows per embedding request
+        max_batch_tokens: Maximum estimated tokens per embedding request
+        concurrency: Embedding requests in flight at once
+        max_retries: Attempts per batch on rate-limit errors before giving up
+        base_delay: First backoff delay in seconds; doubles on each retry
+        verbose: Print progress and rate-limit retries
+        """
+        self.embedding = embedding
+        self.index_dir = Path(index_dir)
+        self.staging_dir = self.index_dir / "ingest"
+        self.batch_size = batch_size
+        self.max_batch_tokens = max_batch_tokens
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.verbose = verbose
+        self._resume_at = 0.0
+
+    def _log(self, message: str, **print_args: Any):
+        if self.verbose:
+            print(message, **print_args)
+
+    # Source tracking
+
+    def _source_path(self) -> Path:
+        return self.staging_dir / "source.json"
+
+    def _source_signature(self, csv_path: str, csv_args: Dict[str, Any]) -> Dict[str, Any]:
+        """What the index was built from: the CSV's identity and the index file it produced"""
+        stat = os.stat(csv_path)
+        rows_path = self.index_dir / PersistentVectorStore.ROWS_FILE
+        return {
+            "source": os.path.abspath(csv_path),
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "csv_args": repr(sorted(csv_args.items())),
+            "index_mtime_ns": os.stat(rows_path).st_mtime_ns if rows_path.exists() else None,
+        }
+
+    def _ingested_rows(self, csv_path: str, csv_args: Dict[str, Any]) -> Optional[int]:
+        """Row count of the index if it was last built from this exact CSV and not changed since, else None"""
+        if not self._source_path().exists() or self._checkpoint_path().exists():
+            return None
+        with open(self._source_path()) as f:
+            recorded = json.load(f)
+        rows = recorded.pop("rows")
+        return rows if recorded == self._source_signature(csv_path, csv_args) else None
+
+    # Checkpointing
+
+    def _checkpoint_path(self) -> Path:
+        return self.staging_dir / "checkpoint.json"
+
+    def _load_checkpoint(self, csv_path: str) -> Dict[str, Any]:
+        source = {"source": os.path.abspath(csv_path), "mtime": os.path.getmtime(csv_path)}
+        fresh = {**source, "rows": 0, "rows_bytes": 0, "dim": None, "embedded": 0, "reused": 0}
+        if not self._checkpoint_path().exists():
+            return fresh
+        with open(self._checkpoint_path()) as f:
+            checkpoint = json.load(f)
+        if checkpoint["source"] != source["source"] or checkpoint["mtime"] != source["mtime"]:
+            # The CSV changed since the interrupted run: start over
+            return fresh
+        return checkpoint
+
+    def _truncate_staging(self, checkpoint: Dict[str, Any]):
+        """Drop anything written after the last checkpoint (e.g. by a crash mid-commit)"""
+        self.staging_dir.mkdir(parents=True, exist_ok=True)
+        vectors_bytes = checkpoint["rows"] * (checkpoint["dim"] or 0) * 4
+        for name, size in (("vectors.f32", vectors_bytes), ("rows.jsonl", checkpoint["rows_bytes"])):
+            with open(self.staging_dir / name, "ab") as f:
+                f.truncate(size)
+
+    def _commit(self, checkpoint: Dict[str, Any], rows: List[Dict[str, Any]], vectors: np.ndarray, embedded: int):
+        with open(self.staging_dir / "vectors.f32", "ab") as f:
+            f.write(np.ascontiguousarray(vectors, dtype=np.float32).tobytes())
+        with open(self.staging_dir / "rows.jsonl", "ab") as f:
+            for row in rows:
+                f.write((json.dumps(row) + "\n").encode("utf-8"))
+            checkpoint["rows_bytes"] = f.tell()
+        checkpoint["rows"] += len(rows)
+        checkpoint["embedded"] += embedded
+        checkpoint["reused"] += len(rows) - embedded
+        checkpoint["dim"] = vectors.shape[1]
+        tmp_path = self._checkpoint_path().with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(checkpoint, f)
+        os.replace(tmp_path, self._checkpoint_path())
+
+    # Embedding
+
+    async def _embed_with_retry(self, texts: List[str]) -> List[List[float]]:
+        for attempt in range(self.max_retries + 1):
+            # Honour a back-off triggered by any worker, not just this one
+            wait = self._resume_at - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            try:
+                return await self.embedding.aembed_documents(texts)
+            except Exception as e:
+                if not is_rate_limit_error(e) or attempt == self.max_retries:
+                    raise
+                delay = retry_after_seconds(e) or self.base_delay * 2 ** attempt * (1 + random.random())
+                self._resume_at = max(self._resume_at, time.monotonic() + delay)
+                self._log(f"Rate limited, retrying {len(texts)} rows in {delay:.1f}s (attempt {attempt + 1})")
+
+    async def _embed_batch(self, batch: List[Document], store: PersistentVectorStore,
+                           known: Dict[str, int]) -> tuple:
+        hashes = [content_hash(doc.page_content) for doc in batch]
+        missing = [i for i, h in enumerate(hashes) if h not in known]
+        embedded = await self._embed_with_retry([batch[i].page_content for i in missing]) if missing else []
+        fresh = dict(zip(missing, np.asarray(embedded, dtype=np.float32)))
+        dim = len(embedded[0]) if embedded else store.vectors.shape[1]
+        vectors = np.empty((len(batch), dim), dtype=np.float32)
+        for i, h in enumerate(hashes):
+            vectors[i] = fresh[i] / max(np.linalg.norm(fresh[i]), 1e-12) if i in fresh else store.vectors[known[h]]
+        rows = [{"hash": h, "page_content": doc.page_content, "metadata": doc.metadata}
+                for h, doc in zip(hashes, batch)]
+        return rows, vectors, len(missing)
+
+    async def aingest(self, csv_path: str, **csv_args: Any) -> Dict[str, int]:
+        """Async version of ingest_csv"""
+        rows = self._ingested_rows(csv_path, csv_args)
+        if rows is not None:
+            # Unchanged CSV: skip streaming, hashing and rewriting the index
+            return {"rows": rows, "embedded": 0, "reused": rows}
+        store = PersistentVectorStore.open(str(self.index_dir), self.embedding)
+        known = {row["hash"]: i for i, row in enumerate(store.rows)}
+        checkpoint = self._load_checkpoint(csv_path)
+        self._truncate_staging(checkpoint)
+        if checkpoint["rows"]:
+            self._log(f"Resuming after row {checkpoint['rows']}")
+
+        documents = stream_csv_documents(csv_path, start_row=checkpoint["rows"], **csv_args)
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.concurrency * 2)
+        results: Dict[int, tuple] = {}
+        committed = 0
+        started = time.monotonic()
+
+        async def produce():
+            for number, batch in enumerate(batch_documents(documents, self.batch_size, self.max_batch_tokens)):
+                await queue.put((number, batch))
+            for _ in range(self.concurrency):
+                await queue.put(None)
+
+        async def work():
+            nonlocal committed
+            while (item := await queue.get()) is not None:
+                number, batch = item
+                results[number] = await self._embed_batch(batch, store, known)
+                # Commit finished batches in order so the checkpoint is a single row count
+                while committed in results:
+                    rows, vectors, embedded = results.pop(committed)
+                    self._commit(checkpoint, rows, vectors, embedded)
+                    committed += 1
+                rate = checkpoint["rows"] / max(time.monotonic() - started, 1e-9)
+                self._log(f"Committed {checkpoint['rows']} rows ({rate:.0f} rows/s)", end="\r")
+
+        await asyncio.gather(produce(), *(work() for _ in range(self.concurrency)))
+        self._log("")
+        self._finalize(store, checkpoint)
+        with open(self._source_path(), "w") as f:
+            json.dump({**self._source_signature(csv_path, csv_args), "rows": checkpoint["rows"]}, f)
+        return {"rows": checkpoint["rows"], "embedded": checkpoint["embedded"], "reused": checkpoint["reused"]}
+
+    def ingest_csv(self, csv_path: str, **csv_args: Any) -> Dict[str, int]:
+        """
+        Embed every row of a CSV into the index, resuming from the last checkpoint.
+        Returns at once when the index was already built from this CSV (same path,
+        size and mtime) and has not been modified since.
+        Returns counts of rows written, rows embedded and rows reused from the index.
+        """
+        return run_sync(self.aingest(csv_path, **csv_args))
+
+    def _finalize(self, store: PersistentVectorStore, checkpoint: Dict[str, Any]):
+        """Swap the staged rows and vectors in as the index files"""
+        dim = checkpoint["dim"] or 0
+        staged = np.memmap(self.staging_dir / "vectors.f32", dtype=np.float32, mode="r",
+                           shape=(checkpoint["rows"], dim)) if checkpoint["rows"] else np.zeros((0, dim), np.float32)
+        with open(self.staging_dir / "rows.jsonl") as f:
+            rows = [json.loads(line) for line in f]
+        store._save(rows, staged)
+        del staged
+        for name in ("vectors.f32", "rows.jsonl", "checkpoint.json"):
+            (self.staging_dir / name).unlink(missing_ok=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("csv_path")
+    parser.add_argument("index_dir")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--max-batch-tokens", type=int, default=100_000)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--local", metavar="MODEL", help="embed locally with word vectors, e.g. glove-wiki-gigaword-100")
+    args = parser.parse_args()
+
+    if args.local:
+        from local_embeddings import LocalEmbeddings, QuantizedWordVectors
+        embedding = LocalEmbeddings(QuantizedWordVectors.from_pretrained(args.local))
+    else:
+        from langchain.embeddings import OpenAIEmbeddings
+        embedding = OpenAIEmbeddings()
+    ingestor = EmbeddingIngestor(embedding, args.index_dir, batch_size=args.batch_size,
+                                 max_batch_tokens=args.max_batch_tokens, concurrency=args.concurrency, verbose=True)
+    print(ingestor.ingest_csv(args.csv_path))
+
+
+if __name__ == "__main__":
+    main()
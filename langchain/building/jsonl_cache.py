@@ -0,0 +1,29 @@
+import json
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+
+class JsonlCache:
+    """Append-only key/value records; the last record of a key wins"""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.records: Dict[str, Dict[str, Any]] = {}
+        if path.exists():
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        # A line cut short by an interrupted run
+                        continue
+                    self.records[record["key"]] = record
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        return self.records.get(key)
+
+    def put(self, record: Dict[str, Any]):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n")
+        self.records[record["key"]] = record
@@ -0,0 +1,180 @@
+"""
+Local CPU embeddings for the Q&A notebooks, so retrieval and ingestion need no network.
+
+LocalEmbeddings is a LangChain Embeddings that delegates to a pluggable encoder: any
+object with `dim` and `encode(texts) -> np.ndarray`. The bundled encoder,
+QuantizedWordVectors, embeds a text as the mean of its word vectors (the
+`embed_sequence` approach of misc/RAGFromScratch.ipynb), with the vectors stored as
+int8 plus one float32 scale per word, a quarter of the float32 size. A batch of
+texts is encoded with one gather and one segmented sum over all of its words.
+Query embeddings are kept in an LRU cache, so repeated questions cost a dict lookup.
+
+    embeddings = LocalEmbeddings(QuantizedWordVectors.from_pretrained("glove-wiki-gigaword-100"))
+    db = PersistentVectorStore.open("catalog_index_local", embeddings)
+"""
+
+import re
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Protocol, Tuple
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "local_embeddings"
+
+
+class Encoder(Protocol):
+    dim: int
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        ...
+
+
+def quantize(vectors: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Symmetric per-row int8 quantization: vectors ~= codes * scales[:, None]"""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    scales = np.abs(vectors).max(axis=1) / 127
+    scales[scales == 0] = 1
+    codes = np.clip(np.rint(vectors / scales[:, None]), -127, 127).astype(np.int8)
+    return codes, scales.astype(np.float32)
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+class QuantizedWordVectors:
+    """Mean-of-word-vectors encoder over an int8-quantized vocabulary"""
+
+    def __init__(self, words: List[str], codes: np.ndarray, scales: np.ndarray):
+        """
+        words: Vocabulary, one entry per row of codes
+        codes: int8 matrix of shape (len(words), dim)
+        scales: float32 per-word scale, so a word vector is codes[i] * scales[i]
+        """
+        self.words = words
+        self.vocab: Dict[str, int] = {word: i for i, word in enumerate(words)}
+        self.codes = codes
+        self.scales = scales
+        self.dim = codes.shape[1]
+
+    @classmethod
+    def from_vectors(cls, words: List[str], vectors: np.ndarray) -> "QuantizedWordVectors":
+        return cls(list(words), *quantize(vectors))
+
+    @classmethod
+    def from_glove_file(cls, path: str, chunk_size: int = 100_000) -> "QuantizedWordVectors":
+        """Read a GloVe text file ("word v1 v2 ..." per line), quantizing in chunks"""
+        words, codes, scales, chunk = [], [], [], []
+
+        def flush():
+            chunk_codes, chunk_scales = quantize(np.array(chunk, dtype=np.float32))
+            codes.append(chunk_codes)
+            scales.append(chunk_scales)
+            chunk.clear()
+
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                word, *values = line.rstrip().split(" ")
+                words.append(word)
+                chunk.append(values)
+                if len(chunk) == chunk_size:
+                    flush()
+        if chunk:
+            flush()
+        return cls(words, np.concatenate(codes), np.concatenate(scales))
+
+    @classmethod
+    def from_pretrained(cls, name: str = "glove-wiki-gigaword-100",
+                        cache_dir: Optional[str] = None) -> "QuantizedWordVectors":
+        """
+        Load a gensim-downloader model (e.g. "glove-twitter-25", "glove-wiki-gigaword-100").
+        The first call downloads and quantizes it (pip install gensim); later calls read
+        the quantized copy from cache_dir.
+        """
+        path = Path(cache_dir or DEFAULT_CACHE_DIR) / name
+        if (path / "vectors.npz").exists():
+            return cls.load(path)
+        try:
+            import gensim.downloader
+        except ImportError as e:
+            raise ImportError("Downloading word vectors requires gensim: pip install gensim") from e
+        keyed_vectors = gensim.downloader.load(name)
+        encoder = cls.from_vectors(keyed_vectors.index_to_key, keyed_vectors.vectors)
+        encoder.save(path)
+        return encoder
+
+    def save(self, path: Path):
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        np.savez(path / "vectors.npz", codes=self.codes, scales=self.scales)
+        (path / "vocab.txt").write_text("\n".join(self.words), encoding="utf-8")
+
+    @classmethod
+    def load(cls, path: Path) -> "QuantizedWordVectors":
+        path = Path(path)
+        with np.load(path / "vectors.npz") as data:
+            codes, scales = data["codes"], data["scales"]
+        return cls((path / "vocab.txt").read_text(encoding="utf-8").split("\n"), codes, scales)
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        """Mean vector of the known words of each text (zeros if none are known)"""
+        ids = [[self.vocab[token] for token in tokenize(text) if token in self.vocab] for text in texts]
+        counts = np.array([len(row) for row in ids])
+        out = np.zeros((len(texts), self.dim), dtype=np.float32)
+        if not counts.sum():
+            return out
+        flat = np.fromiter((i for row in ids for i in row), dtype=np.int64, count=int(counts.sum()))
+        # Dequantize only the words in this batch, then sum each text's segment at once
+        vectors = self.codes[flat].astype(np.float32) * self.scales[flat, None]
+        nonempty = counts > 0
+        starts = np.concatenate([[0], np.cumsum(counts)[:-1]])[nonempty]
+        out[nonempty] = np.add.reduceat(vectors, starts, axis=0) / counts[nonempty, None]
+        return out
+
+
+class LocalEmbeddings(Embeddings):
+    """LangChain embeddings computed on the CPU by a local encoder"""
+
+    def __init__(self, encoder: Encoder, batch_size: int = 256, query_cache_size: int = 4096):
+        """
+        encoder: Object with `dim` and `encode(texts) -> (len(texts), dim) array`
+        batch_size: Texts passed to the encoder at once by embed_documents
+        query_cache_size: Query embeddings kept in the LRU cache (0 disables it)
+        """
+        self.encoder = encoder
+        self.batch_size = batch_size
+        self.query_cache_size = query_cache_size
+        self._query_cache: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def _batches(self, texts: List[str]) -> Iterable[List[str]]:
+        for start in range(0, len(texts), self.batch_size):
+            yield texts[start:start + self.batch_size]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        if not texts:
+            return []
+        return np.concatenate([self.encoder.encode(batch) for batch in self._batches(texts)]).tolist()
+
+    def embed_query(self, text: str) -> List[float]:
+        with self._lock:
+            cached = self._query_cache.get(text)
+            if cached is not None:
+                self._query_cache.move_to_end(text)
+                self.cache_hits += 1
+                return list(cached)
+            self.cache_misses += 1
+        embedding = self.encoder.encode([text])[0].tolist()
+        if self.query_cache_size:
+            with self._lock:
+                self._query_cache[text] = embedding
+                if len(self._query_cache) > self.query_cache_size:
+                    self._query_cache.popitem(last=False)
+        return list(embedding)
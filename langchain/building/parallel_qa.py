@@ -0,0 +1,133 @@
+"""
+Question answering that picks between "stuff" and a parallel map-reduce per query.
+
+When the retrieved documents fit in `max_stuff_tokens`, they are stuffed into one
+prompt as RetrievalQA(chain_type="stuff") does. Otherwise every document is sent
+to a map call that extracts what is relevant to the question; at most
+`max_concurrency` map calls are in flight at once. Partial answers are folded into
+the reduce step as they arrive: whenever the pending partials would exceed
+`max_reduce_tokens`, they are collapsed into one intermediate answer while the
+remaining map calls keep running, and a final reduce writes the answer.
+
+    qa = AdaptiveQA(llm, HybridRetriever.from_store(db, k=12))
+    qa.run("Please list all your shirts with sun protection in a table in markdown")
+"""
+
+import asyncio
+from typing import Any, Callable, Dict, List, Optional
+
+from langchain_core.documents import Document
+from langchain_core.language_models import BaseLanguageModel
+from langchain_core.output_parsers import StrOutputParser
+from langchain_core.prompts import PromptTemplate
+from langchain_core.retrievers import BaseRetriever
+from langchain_core.runnables import RunnableConfig
+
+from async_utils import run_sync
+
+STUFF_PROMPT = PromptTemplate.from_template(
+    "Use the following pieces of context to answer the question at the end. "
+    "If you don't know the answer, just say that you don't know, don't try to make up an answer.\n\n"
+    "{context}\n\nQuestion: {question}\nHelpful Answer:"
+)
+
+MAP_PROMPT = PromptTemplate.from_template(
+    "Use the following portion of a long document to see if any of the text is relevant to answer the question.\n"
+    "Return any relevant text verbatim. If nothing is relevant, return only the word NONE and nothing else.\n\n"
+    "{context}\n\nQuestion: {question}\nRelevant text, if any:"
+)
+
+REDUCE_PROMPT = PromptTemplate.from_template(
+    "Given the following extracted parts of long documents and a question, create a final answer. "
+    "If you don't know the answer, just say that you don't know, don't try to make up an answer.\n\n"
+    "{context}\n\nQuestion: {question}\nFinal Answer:"
+)
+
+COLLAPSE_PROMPT = PromptTemplate.from_template(
+    "Combine the following extracted parts into one concise summary of everything relevant to the question.\n\n"
+    "{context}\n\nQuestion: {question}\nCombined relevant text:"
+)
+
+DOCUMENT_SEPARATOR = "\n\n"
+
+# Map output meaning the document had nothing relevant to the question
+NO_MATCH = "NONE"
+
+
+class AdaptiveQA:
+    """Retrieval QA choosing stuff or concurrent map-reduce from the retrieved token count"""
+
+    def __init__(self, llm: BaseLanguageModel, retriever: BaseRetriever, max_stuff_tokens: int = 3000,
+                 max_concurrency: int = 4, max_reduce_tokens: int = 3000,
+                 count_tokens: Optional[Callable[[str], int]] = None, verbose: bool = False):
+        """
+        llm: Model used for the stuff, map and reduce calls
+        retriever: Source of the documents for a question
+        max_stuff_tokens: Largest retrieved context answered with a single stuff call
+        max_concurrency: Map (and collapse) calls in flight at once
+        max_reduce_tokens: Partial answers held before they are collapsed into one
+        count_tokens: Token counter; defaults to llm.get_num_tokens
+        """
+        self.retriever = retriever
+        self.max_stuff_tokens = max_stuff_tokens
+        self.max_concurrency = max_concurrency
+        self.max_reduce_tokens = max_reduce_tokens
+        self.count_tokens = count_tokens or llm.get_num_tokens
+        self.verbose = verbose
+        self.stuff_chain = STUFF_PROMPT | llm | StrOutputParser()
+        self.map_chain = MAP_PROMPT | llm | StrOutputParser()
+        self.reduce_chain = REDUCE_PROMPT | llm | StrOutputParser()
+        self.collapse_chain = COLLAPSE_PROMPT | llm | StrOutputParser()
+
+    def choose_chain_type(self, documents: List[Document]) -> str:
+        tokens = sum(self.count_tokens(doc.page_content) for doc in documents)
+        return "stuff" if tokens <= self.max_stuff_tokens else "map_reduce"
+
+    async def _map_reduce(self, question: str, documents: List[Document], config: Optional[RunnableConfig] = None) -> str:
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def map_one(doc: Document) -> str:
+            async with semaphore:
+                return await self.map_chain.ainvoke({"context": doc.page_content, "question": question}, config=config)
+
+        partials: List[str] = []
+        partial_tokens = 0
+        for finished in asyncio.as_completed([map_one(doc) for doc in documents]):
+            partial = (await finished).strip()
+            # Only the exact sentinel means nothing was relevant; "None of the jackets..." is an extraction
+            if not partial or partial.upper() == NO_MATCH:
+                continue
+            tokens = self.count_tokens(partial)
+            if partials and partial_tokens + tokens > self.max_reduce_tokens:
+                # Collapse what has arrived so far while later map calls are still running;
+                # the collapse call takes a slot like a map call so concurrency stays bounded
+                async with semaphore:
+                    collapsed = await self.collapse_chain.ainvoke(
+                        {"context": DOCUMENT_SEPARATOR.join(partials), "question": question}, config=config)
+                partials, partial_tokens = [collapsed], self.count_tokens(collapsed)
+            partials.append(partial)
+            partial_tokens += tokens
+        if self.verbose:
+            print(f"map_reduce: {len(documents)} documents -> {len(partials)} partial answers")
+        return await self.reduce_chain.ainvoke(
+            {"context": DOCUMENT_SEPARATOR.join(partials) or "NONE", "question": question}, config=config)
+
+    async def ainvoke(self, inputs: Dict[str, Any], config: Optional[RunnableConfig] = None) -> Dict[str, Any]:
+        question = inputs["query"]
+        documents = await self.retriever.ainvoke(question, config=config)
+        chain_type = self.choose_chain_type(documents)
+        if self.verbose:
+            print(f"{len(documents)} documents retrieved, using {chain_type}")
+        if chain_type == "stuff":
+            context = DOCUMENT_SEPARATOR.join(doc.page_content for doc in documents)
+            result = await self.stuff_chain.ainvoke({"context": context, "question": question}, config=config)
+        else:
+            result = await self._map_reduce(question, documents, config)
+        return {"query": question, "result": result, "chain_type": chain_type, "source_documents": documents}
+
+    def invoke(self, inputs: Dict[str, Any], config: Optional[RunnableConfig] = None) -> Dict[str, Any]:
+        """Answer {"query": ...}; returns the query, result, chain_type used and source_documents"""
+        return run_sync(self.ainvoke(inputs, config))
+
+    def run(self, query: str) -> str:
+        return self.invoke({"query": query})["result"]
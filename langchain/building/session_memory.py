@@ -0,0 +1,268 @@
+"""
+Bounded-memory conversation store for long-lived sessions (02-Memory patterns).
+
+ConversationBufferMemory keeps the whole conversation in one string and
+ConversationTokenBufferMemory recounts the tokens of the whole buffer on every
+save_context. Here each session keeps only its recent window of turns in a deque,
+with the token count of every turn computed once when it is saved and a running
+total, so trimming the window pops turns from the left in O(1) without recounting.
+
+Every turn is written through to one SQLite file shared by all sessions when it is
+saved. Writes are buffered and flushed every `spill_batch` turns, `flush_interval`
+seconds after the first unwritten turn, and at interpreter exit, so a restart keeps
+the recent window and not only the turns that had left it. Only the `max_sessions`
+most recently used sessions stay in memory; older ones are dropped and their window
+is reloaded from disk on next use, so RSS stays bounded however many sessions exist.
+
+    store = SessionStore("session_memory.db", max_token_limit=50)
+    memory = SessionMemory(store=store, session_id="customer-42")
+    conversation = ConversationChain(llm=llm, memory=memory)
+"""
+
+import atexit
+import sqlite3
+import threading
+from collections import OrderedDict, deque
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, List, NamedTuple, Optional, Set
+
+from langchain_core.memory import BaseMemory
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS turns(
+    session_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    human TEXT,
+    ai TEXT,
+    tokens INTEGER NOT NULL,
+    PRIMARY KEY (session_id, seq)
+) WITHOUT ROWID;
+"""
+
+
+def estimate_tokens(text: str) -> int:
+    # ~4 characters per token for English text
+    return len(text) // 4 + 1
+
+
+class Turn(NamedTuple):
+    seq: int
+    human: str
+    ai: str
+    tokens: int
+    on_disk: bool  # written, or queued to be written, to SQLite
+
+
+class Session:
+    """Recent turns of one conversation with their running token total"""
+
+    __slots__ = ("turns", "tokens", "next_seq")
+
+    def __init__(self, next_seq: int = 0):
+        self.turns: Deque[Turn] = deque()
+        self.tokens = 0
+        self.next_seq = next_seq
+
+
+class SessionStore:
+    """Token-bounded conversation windows for many sessions, writing every turn through to SQLite"""
+
+    def __init__(self, db_path: str = "session_memory.db", max_token_limit: int = 2000, max_turns: int = 64,
+                 max_sessions: int = 10_000, count_tokens: Callable[[str], int] = estimate_tokens,
+                 human_prefix: str = "Human", ai_prefix: str = "AI", spill_batch: int = 512,
+                 flush_interval: float = 1.0):
+        """
+        db_path: SQLite file receiving every turn
+        max_token_limit: Tokens kept in a session's window
+        max_turns: Turns kept in a session's window, whatever their tokens
+        max_sessions: Sessions kept in memory; the least recently used are dropped and reloaded on use
+        count_tokens: Token counter, e.g. llm.get_num_tokens; run once per turn
+        spill_batch: Turns buffered before they are written
+        flush_interval: Seconds a buffered turn waits at most before it is written
+        """
+        self.db_path = db_path
+        self.max_token_limit = max_token_limit
+        self.max_turns = max_turns
+        self.max_sessions = max_sessions
+        self.count_tokens = count_tokens
+        self.human_prefix = human_prefix
+        self.ai_prefix = ai_prefix
+        self.spill_batch = spill_batch
+        self.flush_interval = flush_interval
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._con = sqlite3.connect(db_path, check_same_thread=False)
+        self._con.execute("PRAGMA journal_mode=WAL")
+        self._con.execute("PRAGMA synchronous=NORMAL")
+        self._con.executescript(SCHEMA)
+        self._sessions: "OrderedDict[str, Session]" = OrderedDict()
+        self._pending: List[tuple] = []
+        self._pending_sessions: Set[str] = set()
+        self._flush_timer: Optional[threading.Timer] = None
+        self._lock = threading.RLock()
+        atexit.register(self.close)
+
+    def format_turn(self, human: str, ai: str) -> str:
+        return f"{self.human_prefix}: {human}\n{self.ai_prefix}: {ai}"
+
+    # Writing
+
+    def _write(self, session_id: str, turn: Turn):
+        self._pending.append((session_id, turn.seq, turn.human, turn.ai, turn.tokens))
+        self._pending_sessions.add(session_id)
+        if len(self._pending) >= self.spill_batch:
+            self.flush()
+        elif self._flush_timer is None:
+            self._flush_timer = threading.Timer(self.flush_interval, self.flush)
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+
+    def flush(self):
+        """Write buffered turns"""
+        with self._lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            if self._pending and self._con is not None:
+                with self._con:
+                    self._con.executemany("INSERT OR REPLACE INTO turns VALUES (?, ?, ?, ?, ?)", self._pending)
+                self._pending.clear()
+                self._pending_sessions.clear()
+
+    def _evict_idle_sessions(self):
+        # Every turn of an evicted session is already written or queued
+        while len(self._sessions) > self.max_sessions:
+            self._sessions.popitem(last=False)
+
+    def _load(self, session_id: str) -> Session:
+        """Rebuild a session's window from the newest turns on disk"""
+        if session_id in self._pending_sessions:
+            self.flush()
+        session = Session()
+        rows = self._con.execute(
+            "SELECT seq, human, ai, tokens FROM turns WHERE session_id = ? ORDER BY seq DESC LIMIT ?",
+            (session_id, self.max_turns),
+        ).fetchall()
+        if rows:
+            session.next_seq = rows[0][0] + 1
+        for seq, human, ai, tokens in rows:
+            if session.turns and session.tokens + tokens > self.max_token_limit:
+                break
+            session.turns.appendleft(Turn(seq, human, ai, tokens, True))
+            session.tokens += tokens
+        return session
+
+    def _session(self, session_id: str) -> Session:
+        session = self._sessions.get(session_id)
+        if session is None:
+            session = self._sessions[session_id] = self._load(session_id)
+            self._evict_idle_sessions()
+        else:
+            self._sessions.move_to_end(session_id)
+        return session
+
+    # Public API
+
+    def append(self, session_id: str, human: str, ai: str) -> int:
+        """
+        Add a turn to a session and trim its window
+        Returns:
+            Sequence number of the turn within the session
+        """
+        tokens = self.count_tokens(self.format_turn(human, ai))
+        with self._lock:
+            session = self._session(session_id)
+            seq = session.next_seq
+            session.next_seq += 1
+            turn = Turn(seq, human, ai, tokens, True)
+            self._write(session_id, turn)
+            session.turns.append(turn)
+            session.tokens += tokens
+            # The newest turn always stays, even if it alone exceeds the limit
+            while len(session.turns) > 1 and (session.tokens > self.max_token_limit or len(session.turns) > self.max_turns):
+                session.tokens -= session.turns.popleft().tokens
+        return seq
+
+    def window(self, session_id: str) -> List[Turn]:
+        """Turns currently in a session's window, oldest first"""
+        with self._lock:
+            return list(self._session(session_id).turns)
+
+    def window_tokens(self, session_id: str) -> int:
+        with self._lock:
+            return self._session(session_id).tokens
+
+    def history(self, session_id: str, offset: int = 0, limit: Optional[int] = None) -> List[Turn]:
+        """Full transcript of a session, starting at sequence number offset"""
+        with self._lock:
+            self.flush()
+            rows = self._con.execute(
+                "SELECT seq, human, ai, tokens FROM turns WHERE session_id = ? AND seq >= ? ORDER BY seq LIMIT ?",
+                (session_id, offset, -1 if limit is None else limit),
+            ).fetchall()
+        return [Turn(seq, human, ai, tokens, True) for seq, human, ai, tokens in rows]
+
+    def clear(self, session_id: str):
+        with self._lock:
+            self._pending = [row for row in self._pending if row[0] != session_id]
+            self._pending_sessions.discard(session_id)
+            self._sessions.pop(session_id, None)
+            with self._con:
+                self._con.execute("DELETE FROM turns WHERE session_id = ?", (session_id,))
+
+    def __len__(self) -> int:
+        """Sessions currently held in memory"""
+        return len(self._sessions)
+
+    def close(self):
+        """Write buffered turns and close the database; also run at interpreter exit"""
+        with self._lock:
+            if self._con is None:
+                return
+            self.flush()
+            self._sessions.clear()
+            self._con.close()
+            self._con = None
+        atexit.unregister(self.close)
+
+
+class SessionMemory(BaseMemory):
+    """LangChain memory reading and writing one session of a SessionStore"""
+
+    store: Any
+    session_id: str
+    memory_key: str = "history"
+    input_key: Optional[str] = None
+    output_key: Optional[str] = None
+    return_messages: bool = False
+
+    @property
+    def memory_variables(self) -> List[str]:
+        return [self.memory_key]
+
+    @property
+    def buffer(self) -> str:
+        return "\n".join(self.store.format_turn(turn.human, turn.ai) for turn in self.store.window(self.session_id))
+
+    def _messages(self) -> List[BaseMessage]:
+        messages: List[BaseMessage] = []
+        for turn in self.store.window(self.session_id):
+            messages += [HumanMessage(content=turn.human), AIMessage(content=turn.ai)]
+        return messages
+
+    def load_memory_variables(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
+        return {self.memory_key: self._messages() if self.return_messages else self.buffer}
+
+    def _value(self, values: Dict[str, Any], key: Optional[str], exclude: List[str]) -> str:
+        if key is None:
+            candidates = [k for k in values if k not in exclude]
+            key = candidates[0]
+        return str(values[key])
+
+    def save_context(self, inputs: Dict[str, Any], outputs: Dict[str, str]) -> None:
+        human = self._value(inputs, self.input_key, [self.memory_key, "stop"])
+        ai = self._value(outputs, self.output_key, [])
+        self.store.append(self.session_id, human, ai)
+
+    def clear(self) -> None:
+        self.store.clear(self.session_id)
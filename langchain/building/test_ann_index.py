@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+
+from ann_index import ExactIndex, HNSWIndex, IVFIndex
+
+
+def clustered_vectors(n, dim=32, clusters=20, seed=0):
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((clusters, dim))
+    vectors = centers[rng.integers(clusters, size=n)] + 0.3 * rng.standard_normal((n, dim))
+    return (vectors / np.linalg.norm(vectors, axis=1, keepdims=True)).astype(np.float32)
+
+
+def recall(ids, truth):
+    return np.mean([len(set(found) & set(expected)) / len(expected) for found, expected in zip(ids, truth)])
+
+
+@pytest.fixture(scope="module")
+def data():
+    vectors = clustered_vectors(3000)
+    queries = clustered_vectors(50, seed=1)
+    truth = np.argsort(-(queries @ vectors.T), axis=1)[:, :10]
+    return vectors, queries, truth
+
+
+def test_exact_search_merges_document_blocks(data):
+    vectors, queries, truth = data
+    index = ExactIndex(batch_size=16, block_size=500)
+    index.build(vectors)
+    ids, scores = index.search(queries, 10)
+    assert (ids == truth).all()
+    assert np.allclose(scores, np.take_along_axis(queries @ vectors.T, truth, axis=1), atol=1e-5)
+
+
+def test_ivf_recall_grows_with_nprobe(data):
+    vectors, queries, truth = data
+    index = IVFIndex(nlist=32)
+    index.build(vectors)
+    assert index.vectors is vectors
+    assert recall(index.search(queries, 10, nprobe=32)[0], truth) == 1.0
+    assert recall(index.search(queries, 10, nprobe=8)[0], truth) >= 0.9
+
+
+def test_ivf_saves_only_the_permutation(tmp_path, data):
+    vectors, queries, truth = data
+    index = IVFIndex(nlist=32)
+    index.build(vectors)
+    index.signature = "rows-v1"
+    index.save(tmp_path)
+    assert [path.name for path in tmp_path.iterdir()] == ["ivf.npz"]
+
+    loaded = IVFIndex(nlist=32)
+    assert not loaded.load(tmp_path, "rows-v2", vectors)
+    assert loaded.load(tmp_path, "rows-v1", vectors)
+    assert (loaded.search(queries, 10, nprobe=8)[0] == index.search(queries, 10, nprobe=8)[0]).all()
+
+
+def test_ivf_pads_missing_neighbours():
+    vectors = clustered_vectors(20)
+    index = IVFIndex(nlist=4, nprobe=1)
+    index.build(vectors)
+    ids, scores = index.search(vectors[:3], 20)
+    assert ids.shape == (3, 20)
+    assert ((ids == -1) == np.isneginf(scores)).all()
+
+
+def test_hnsw_recall(data):
+    pytest.importorskip("hnswlib")
+    vectors, queries, truth = data
+    index = HNSWIndex(ef=128, num_threads=1)
+    index.build(vectors)
+    assert recall(index.search(queries, 10)[0], truth) >= 0.95
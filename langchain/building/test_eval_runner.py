@@ -0,0 +1,73 @@
+import asyncio
+
+from langchain_core.runnables import RunnableLambda
+
+from eval_runner import EvaluationRunner, parse_grade
+from example_store import ExampleStore
+
+
+def make_runner(tmp_path, calls, **kwargs):
+    async def answer(inputs):
+        calls["qa"] += 1
+        await asyncio.sleep(0.01)
+        if inputs["query"] == "boom":
+            raise ValueError("no answer")
+        return {"query": inputs["query"], "result": f"answer to {inputs['query']}"}
+
+    async def grade(inputs):
+        calls["grade"] += 1
+        return {"results": "GRADE: CORRECT" if inputs["answer"] in inputs["result"] else "GRADE: INCORRECT"}
+
+    eval_chain = RunnableLambda(grade)
+    eval_chain.output_key = "results"
+    return EvaluationRunner(RunnableLambda(answer), eval_chain, str(tmp_path / "run"), max_concurrency=4,
+                            example_store=ExampleStore(str(tmp_path / "examples")), **kwargs)
+
+
+EXAMPLES = [{"query": f"q{i}", "answer": "q" if i % 2 else "missing"} for i in range(6)]
+
+
+def test_parse_grade():
+    assert parse_grade("GRADE: CORRECT") is True
+    assert parse_grade("grade: incorrect") is False
+    assert parse_grade("no verdict") is None
+
+
+def test_rerun_is_served_from_the_cache(tmp_path):
+    calls = {"qa": 0, "grade": 0}
+    results = make_runner(tmp_path, calls).run(EXAMPLES + [{"query": "boom", "answer": "x"}])
+    assert calls == {"qa": 7, "grade": 6}
+    assert "error" in results[-1]
+    assert [r["correct"] for r in results[:-1]] == [False, True] * 3
+
+    results = make_runner(tmp_path, calls).run(EXAMPLES + [{"query": "boom", "answer": "x"}])
+    # Only the failed example is retried
+    assert calls == {"qa": 8, "grade": 6}
+    assert all(r["cached"] for r in results[:-1])
+
+
+def test_changing_the_version_predicts_again(tmp_path):
+    calls = {"qa": 0, "grade": 0}
+    make_runner(tmp_path, calls).run(EXAMPLES)
+    make_runner(tmp_path, calls, version="v2").run(EXAMPLES)
+    # Same predictions as before, so their grades are reused
+    assert calls == {"qa": 12, "grade": 6}
+
+
+def test_summary_separates_fresh_and_cached_calls():
+    def result(predict_cached, grade_cached):
+        return {"correct": True, "cached": predict_cached and grade_cached,
+                "predict_cached": predict_cached, "grade_cached": grade_cached,
+                "predict_latency": 0.0 if predict_cached else 2.0, "grade_latency": 1.0,
+                "predict_tokens": 100, "grade_tokens": 10}
+
+    stats = EvaluationRunner.summary([result(True, True), result(True, False), result(False, False)])
+    assert stats["tokens"] == 100 + 10 + 10
+    assert stats["cached_tokens"] == 100 + 100 + 10
+    assert (stats["predict_calls"], stats["grade_calls"]) == (1, 2)
+    assert stats["predict_latency_p50"] == 2.0
+    assert stats["accuracy"] == 1.0
+
+    stats = EvaluationRunner.summary([result(True, True)])
+    assert stats["tokens"] == 0
+    assert stats["predict_latency_p95"] is None
@@ -0,0 +1,80 @@
+import json
+
+import pytest
+from langchain_core.documents import Document
+from langchain_core.runnables import RunnableLambda
+
+from eval_runner import EvaluationRunner
+from example_store import ExampleStore, StaleSetError
+
+
+def make_generator(calls, prompt="Write a question about {doc}"):
+    async def generate(inputs):
+        calls.append(inputs["doc"].page_content)
+        return {"qa_pairs": f"QUESTION: what is {inputs['doc'].page_content}?\n\nANSWER: {inputs['doc'].page_content}"}
+
+    chain = RunnableLambda(generate)
+    chain.output_key = "qa_pairs"
+    chain.prompt = prompt
+    return chain
+
+
+def make_runner(tmp_path):
+    return EvaluationRunner(None, None, str(tmp_path / "run"), example_store=ExampleStore(str(tmp_path / "examples")))
+
+
+DOCS = [Document(page_content=text) for text in ("pasta", "pizza", "risotto")]
+
+
+def test_only_new_documents_are_generated(tmp_path):
+    calls = []
+    runner = make_runner(tmp_path)
+    runner.generate_examples(make_generator(calls), DOCS[:2])
+    examples = runner.generate_examples(make_generator(calls), DOCS)
+    assert calls == ["pasta", "pizza", "risotto"]
+    assert examples[2] == {"query": "what is risotto?", "answer": "risotto"}
+
+
+def test_a_new_prompt_is_a_new_version(tmp_path):
+    calls = []
+    runner = make_runner(tmp_path)
+    runner.generate_examples(make_generator(calls), DOCS)
+    runner.generate_examples(make_generator(calls, prompt="Ask about {doc}"), DOCS)
+    assert len(calls) == 6
+    assert len(runner.example_store.versions()) == 2
+
+
+def test_frozen_set_is_loaded_unchanged(tmp_path):
+    calls = []
+    runner = make_runner(tmp_path)
+    examples = runner.generate_examples(make_generator(calls), DOCS, set_name="menu")
+    assert make_runner(tmp_path).generate_examples(make_generator(calls), DOCS, set_name="menu") == examples
+    assert len(calls) == 3
+
+
+def test_stale_set_raises_until_refreshed(tmp_path):
+    calls = []
+    runner = make_runner(tmp_path)
+    runner.generate_examples(make_generator(calls), DOCS, set_name="menu")
+
+    with pytest.raises(StaleSetError, match="other documents"):
+        runner.generate_examples(make_generator(calls), DOCS[:2], set_name="menu")
+    with pytest.raises(StaleSetError, match="generator version"):
+        runner.generate_examples(make_generator(calls, prompt="Ask about {doc}"), DOCS, set_name="menu")
+
+    examples = runner.generate_examples(make_generator(calls), DOCS[:2], set_name="menu", refresh=True)
+    assert runner.generate_examples(make_generator(calls), DOCS[:2], set_name="menu") == examples
+    assert len(calls) == 3
+
+
+def test_set_without_document_hashes_is_stale(tmp_path):
+    calls = []
+    runner = make_runner(tmp_path)
+    runner.generate_examples(make_generator(calls), DOCS, set_name="menu")
+    path = tmp_path / "examples" / "sets" / "menu.json"
+    frozen = json.loads(path.read_text())
+    del frozen["documents"]
+    path.write_text(json.dumps(frozen))
+
+    with pytest.raises(StaleSetError, match="does not record its documents"):
+        runner.generate_examples(make_generator(calls), DOCS, set_name="menu")
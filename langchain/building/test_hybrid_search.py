@@ -0,0 +1,96 @@
+import math
+import zlib
+from collections import Counter
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+from hybrid_search import BM25Index, HybridRetriever, reciprocal_rank_fusion, tokenize
+from vector_index import PersistentVectorStore
+
+TEXTS = [
+    "Sun Shield Shirt UPF 50+ lightweight sun protection",
+    "Recycled waterhog dog mat with chevron pattern",
+    "Infant and toddler girls coastal chill swimsuit UPF 50+",
+    "Refresh swimwear V-neck tankini contrasts",
+    "EcoFlex 3L storm pants waterproof",
+    "Sun protection hat with wide brim and sun shield",
+]
+
+
+def brute_force_bm25(texts, query, k1=1.5, b=0.75):
+    docs = [Counter(tokenize(text)) for text in texts]
+    average_length = sum(sum(doc.values()) for doc in docs) / len(docs)
+    scores = []
+    for doc in docs:
+        length = sum(doc.values())
+        score = 0.0
+        for term in set(tokenize(query)):
+            containing = sum(term in other for other in docs)
+            if not doc[term]:
+                continue
+            idf = math.log(1 + (len(docs) - containing + 0.5) / (containing + 0.5))
+            score += idf * doc[term] * (k1 + 1) / (doc[term] + k1 * (1 - b + b * length / average_length))
+        scores.append(score)
+    return scores
+
+
+class HashEmbeddings(Embeddings):
+    def embed_documents(self, texts):
+        return [self.embed_query(text) for text in texts]
+
+    def embed_query(self, text):
+        vector = np.zeros(32)
+        for token in tokenize(text):
+            vector[zlib.crc32(token.encode()) % 32] += 1
+        return vector.tolist()
+
+
+def test_bm25_matches_brute_force_scores():
+    index = BM25Index()
+    index.build(TEXTS)
+    for query in ["sun shield UPF 50+", "swimwear", "waterproof storm pants sun", "nothing matches"]:
+        expected = brute_force_bm25(TEXTS, query)
+        ids, scores = index.search(query, k=len(TEXTS))
+        matching = [i for i, score in enumerate(expected) if score > 0]
+        assert sorted(ids.tolist()) == matching
+        assert np.allclose(scores, [expected[i] for i in ids], rtol=1e-5)
+        assert (np.diff(scores) <= 0).all()
+
+
+def test_bm25_keeps_the_plus_suffix():
+    index = BM25Index()
+    index.build(TEXTS)
+    assert sorted(index.search("50+", k=5)[0].tolist()) == [0, 2]
+    assert len(index.search("50", k=5)[0]) == 0
+
+
+def test_bm25_saved_index_is_reused_only_for_the_same_rows(tmp_path):
+    index = BM25Index()
+    index.build(TEXTS)
+    index.signature = "rows-v1"
+    index.save(tmp_path)
+    loaded = BM25Index()
+    assert not loaded.load(tmp_path, "rows-v2")
+    assert loaded.load(tmp_path, "rows-v1")
+    query = "sun protection"
+    assert np.array_equal(loaded.search(query, 3)[0], index.search(query, 3)[0])
+
+
+def test_reciprocal_rank_fusion():
+    fused = reciprocal_rank_fusion([[1, 2, 3], [3, 1]], rrf_k=60)
+    assert [row_id for row_id, _ in fused] == [1, 3, 2]
+    assert math.isclose(dict(fused)[1], 1 / 61 + 1 / 62)
+    assert [row_id for row_id, _ in reciprocal_rank_fusion([[1, 2], [2, 1]], weights=[1.0, 3.0])] == [2, 1]
+
+
+def test_hybrid_retriever_follows_store_syncs(tmp_path):
+    store = PersistentVectorStore.open(str(tmp_path), HashEmbeddings())
+    store.sync([Document(page_content=text) for text in TEXTS])
+    retriever = HybridRetriever.from_store(store, k=2)
+    assert retriever.invoke("dog mat")[0].page_content == TEXTS[1]
+
+    store.sync([Document(page_content=text) for text in TEXTS[2:]])
+    assert retriever.invoke("dog mat")[0].page_content != TEXTS[1]
+    assert retriever.invoke("tankini")[0].page_content == TEXTS[3]
@@ -0,0 +1,93 @@
+import csv
+import os
+
+import numpy as np
+import pytest
+from langchain_core.embeddings import Embeddings
+
+from ingest import EmbeddingIngestor, batch_documents, stream_csv_documents
+from vector_index import PersistentVectorStore
+
+
+class CountingEmbeddings(Embeddings):
+    """Deterministic embeddings that count embedded rows and can fail after a number of calls"""
+
+    def __init__(self, fail_after_calls=None):
+        self.rows = 0
+        self.calls = 0
+        self.fail_after_calls = fail_after_calls
+
+    def embed_documents(self, texts):
+        if self.fail_after_calls is not None and self.calls >= self.fail_after_calls:
+            raise RuntimeError("connection reset")
+        self.calls += 1
+        self.rows += len(texts)
+        return [[float(len(text)), 1.0, float(text.count("1"))] for text in texts]
+
+    def embed_query(self, text):
+        return self.embed_documents([text])[0]
+
+
+def write_catalog(path, rows, mode="w"):
+    with open(path, mode, newline="") as f:
+        writer = csv.writer(f)
+        if mode == "w":
+            writer.writerow(["name", "description"])
+        writer.writerows([f"item {i}", f"description of item {i}"] for i in rows)
+
+
+@pytest.fixture
+def catalog(tmp_path):
+    path = tmp_path / "catalog.csv"
+    write_catalog(path, range(100))
+    return str(path)
+
+
+def test_batches_respect_the_row_and_token_limits(catalog):
+    batches = list(batch_documents(stream_csv_documents(catalog), batch_size=30, max_batch_tokens=10_000))
+    assert [len(batch) for batch in batches] == [30, 30, 30, 10]
+    batches = list(batch_documents(stream_csv_documents(catalog, start_row=90), batch_size=30, max_batch_tokens=40))
+    assert sum(len(batch) for batch in batches) == 10
+    assert all(len(batch) < 10 for batch in batches)
+
+
+def test_interrupted_ingest_resumes_from_the_checkpoint(tmp_path, catalog):
+    index_dir = str(tmp_path / "index")
+    failing = CountingEmbeddings(fail_after_calls=3)
+    with pytest.raises(RuntimeError):
+        EmbeddingIngestor(failing, index_dir, batch_size=10, concurrency=1).ingest_csv(catalog)
+    assert failing.rows == 30
+
+    embedding = CountingEmbeddings()
+    stats = EmbeddingIngestor(embedding, index_dir, batch_size=10, concurrency=1).ingest_csv(catalog)
+    assert stats == {"rows": 100, "embedded": 100, "reused": 0}
+    assert embedding.rows == 70
+    store = PersistentVectorStore.open(index_dir, embedding)
+    assert [doc.metadata["row"] for doc in map(store._document, range(len(store)))] == list(range(100))
+    assert not (tmp_path / "index" / "ingest" / "checkpoint.json").exists()
+
+
+def test_unchanged_csv_is_not_read_again(tmp_path, catalog):
+    index_dir = tmp_path / "index"
+    EmbeddingIngestor(CountingEmbeddings(), str(index_dir), batch_size=10).ingest_csv(catalog)
+    built_at = os.stat(index_dir / "vectors.npy").st_mtime_ns
+
+    embedding = CountingEmbeddings()
+    stats = EmbeddingIngestor(embedding, str(index_dir), batch_size=10).ingest_csv(catalog)
+    assert stats == {"rows": 100, "embedded": 0, "reused": 100}
+    assert embedding.calls == 0
+    assert os.stat(index_dir / "vectors.npy").st_mtime_ns == built_at
+
+
+def test_changed_csv_embeds_only_new_rows(tmp_path, catalog):
+    index_dir = str(tmp_path / "index")
+    EmbeddingIngestor(CountingEmbeddings(), index_dir, batch_size=10).ingest_csv(catalog)
+    write_catalog(catalog, range(100, 105), mode="a")
+
+    embedding = CountingEmbeddings()
+    stats = EmbeddingIngestor(embedding, index_dir, batch_size=10).ingest_csv(catalog)
+    assert stats == {"rows": 105, "embedded": 5, "reused": 100}
+    assert embedding.rows == 5
+    vectors = PersistentVectorStore.open(index_dir, embedding).vectors
+    assert vectors.shape == (105, 3)
+    assert np.allclose(np.linalg.norm(vectors, axis=1), 1)
@@ -0,0 +1,57 @@
+import numpy as np
+
+from local_embeddings import LocalEmbeddings, QuantizedWordVectors, quantize, tokenize
+
+WORDS = ["red", "blue", "shoes", "jeans", "men's", "size", "10"]
+
+
+def word_vectors(dim=50, seed=0):
+    return np.random.default_rng(seed).standard_normal((len(WORDS), dim)).astype(np.float32)
+
+
+def float_mean(vectors, text):
+    ids = [WORDS.index(token) for token in tokenize(text) if token in WORDS]
+    return vectors[ids].mean(axis=0) if ids else np.zeros(vectors.shape[1])
+
+
+def test_quantization_error_is_within_half_a_step():
+    vectors = word_vectors()
+    codes, scales = quantize(vectors)
+    assert codes.dtype == np.int8
+    assert (np.abs(codes * scales[:, None] - vectors) <= scales[:, None] / 2 + 1e-6).all()
+
+
+def test_encode_matches_the_float_mean_of_word_vectors():
+    vectors = word_vectors()
+    encoder = QuantizedWordVectors.from_vectors(WORDS, vectors)
+    texts = ["Red shoes", "unknown words only", "men's blue jeans, size 10", "", "shoes shoes red"]
+    encoded = encoder.encode(texts)
+    assert encoded.shape == (len(texts), 50)
+    for text, vector in zip(texts, encoded):
+        expected = float_mean(vectors, text)
+        assert np.allclose(vector, expected, atol=0.02)
+        if expected.any():
+            cosine = vector @ expected / (np.linalg.norm(vector) * np.linalg.norm(expected))
+            assert cosine > 0.999
+        else:
+            assert not vector.any()
+
+
+def test_saved_vectors_load_unchanged(tmp_path):
+    encoder = QuantizedWordVectors.from_vectors(WORDS, word_vectors())
+    encoder.save(tmp_path)
+    loaded = QuantizedWordVectors.load(tmp_path)
+    assert loaded.words == WORDS
+    assert np.array_equal(loaded.encode(["red jeans"]), encoder.encode(["red jeans"]))
+
+
+def test_query_embeddings_are_cached():
+    embeddings = LocalEmbeddings(QuantizedWordVectors.from_vectors(WORDS, word_vectors()), batch_size=2,
+                                 query_cache_size=1)
+    documents = embeddings.embed_documents(["red", "blue", "shoes"])
+    assert len(documents) == 3
+    assert embeddings.embed_query("red") == documents[0]
+    embeddings.embed_query("red")
+    embeddings.embed_query("blue")
+    embeddings.embed_query("red")
+    assert (embeddings.cache_hits, embeddings.cache_misses) == (1, 3)
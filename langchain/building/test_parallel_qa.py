@@ -0,0 +1,81 @@
+from typing import List
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.documents import Document
+from langchain_core.language_models import FakeListLLM
+from langchain_core.retrievers import BaseRetriever
+
+from parallel_qa import AdaptiveQA
+
+
+class FixedRetriever(BaseRetriever):
+    documents: List[Document]
+
+    def _get_relevant_documents(self, query, *, run_manager):
+        return self.documents
+
+
+class PromptRecorder(BaseCallbackHandler):
+    def __init__(self):
+        self.prompts = []
+
+    def on_llm_start(self, serialized, prompts, **kwargs):
+        self.prompts.extend(prompts)
+
+
+def count_words(text):
+    return len(text.split())
+
+
+def make_qa(responses, texts, **kwargs):
+    # FakeListLLM.i wraps to 0 after the last response; the spare one keeps it a call count
+    llm = FakeListLLM(responses=responses + ["unused"])
+    retriever = FixedRetriever(documents=[Document(page_content=text) for text in texts])
+    return llm, AdaptiveQA(llm, retriever, count_tokens=count_words, **kwargs)
+
+
+TEXTS = ["sun shirt with UPF 50+", "dog mat recycled", "swimsuit UPF 50+ for girls", "storm pants waterproof"]
+
+
+def test_small_context_is_stuffed_into_one_call():
+    llm, qa = make_qa(["the sun shirt"], TEXTS, max_stuff_tokens=100)
+    result = qa.invoke({"query": "which shirts have sun protection?"})
+    assert result["chain_type"] == "stuff"
+    assert result["result"] == "the sun shirt"
+    assert len(result["source_documents"]) == 4
+    assert llm.i == 1
+
+
+def test_large_context_is_mapped_then_reduced():
+    responses = ["sun shirt", "NONE", "swimsuit", "NONE", "sun shirt and swimsuit"]
+    llm, qa = make_qa(responses, TEXTS, max_stuff_tokens=10, max_concurrency=1)
+    result = qa.invoke({"query": "what has UPF 50+?"})
+    assert result["chain_type"] == "map_reduce"
+    assert result["result"] == "sun shirt and swimsuit"
+    # Four map calls and one reduce, no collapse
+    assert llm.i == 5
+
+
+def test_partials_over_the_reduce_budget_are_collapsed():
+    responses = ["sun shirt one", "dog mat two", "swimsuit three", "storm pants", "collapsed", "final answer"]
+    llm, qa = make_qa(responses, TEXTS, max_stuff_tokens=10, max_concurrency=1, max_reduce_tokens=6)
+    assert qa.run("list everything") == "final answer"
+    # The third partial pushes the pending ones past 6 tokens, which triggers one collapse
+    assert llm.i == 6
+
+
+def test_all_irrelevant_maps_still_reduce():
+    llm, qa = make_qa(["NONE"] * 4 + ["I don't know"], TEXTS, max_stuff_tokens=10)
+    assert qa.run("do you sell bikes?") == "I don't know"
+    assert llm.i == 5
+
+
+def test_extractions_starting_with_none_are_kept():
+    responses = ["None of the jackets are waterproof", "none", "Nonetheless the pants are", "NONE", "final answer"]
+    llm, qa = make_qa(responses, TEXTS, max_stuff_tokens=10, max_concurrency=1, max_reduce_tokens=100)
+    prompts = PromptRecorder()
+    result = qa.invoke({"query": "which jackets are waterproof?"}, config={"callbacks": [prompts]})
+    assert result["result"] == "final answer"
+    reduce_prompt = prompts.prompts[-1]
+    assert "None of the jackets are waterproof\n\nNonetheless the pants are" in reduce_prompt
+    assert "\nnone\n" not in reduce_prompt
@@ -0,0 +1,92 @@
+import time
+
+from session_memory import SessionMemory, SessionStore
+
+
+def count_words(text):
+    return len(text.split())
+
+
+def make_store(path, **kwargs):
+    return SessionStore(str(path / "sessions.db"), count_tokens=count_words, **kwargs)
+
+
+def test_window_is_trimmed_by_tokens_and_turns(tmp_path):
+    store = make_store(tmp_path, max_token_limit=12, max_turns=3)
+    for i in range(5):
+        store.append("a", f"question {i}", f"answer {i}")  # 4 words + 2 prefixes = 6 tokens
+    assert [turn.seq for turn in store.window("a")] == [3, 4]
+    assert store.window_tokens("a") == 12
+
+    store = make_store(tmp_path / "turns", max_token_limit=1000, max_turns=3)
+    for i in range(5):
+        store.append("a", f"question {i}", f"answer {i}")
+    assert [turn.seq for turn in store.window("a")] == [2, 3, 4]
+    store.close()
+
+
+def test_newest_turn_stays_even_over_the_limit(tmp_path):
+    store = make_store(tmp_path, max_token_limit=2)
+    store.append("a", "a long question", "a long answer")
+    assert len(store.window("a")) == 1
+    store.close()
+
+
+def test_evicted_session_is_reloaded_from_disk(tmp_path):
+    store = make_store(tmp_path, max_token_limit=100, max_sessions=2)
+    for i in range(3):
+        store.append("a", f"question {i}", f"answer {i}")
+    store.append("b", "hi", "hello")
+    store.append("c", "hi", "hello")
+    assert len(store) == 2
+
+    assert [turn.seq for turn in store.window("a")] == [0, 1, 2]
+    assert store.append("a", "question 3", "answer 3") == 3
+    store.close()
+
+
+def test_history_includes_turns_outside_the_window(tmp_path):
+    store = make_store(tmp_path, max_token_limit=6)
+    for i in range(5):
+        store.append("a", f"question {i}", f"answer {i}")
+    assert len(store.window("a")) == 1
+    assert [turn.seq for turn in store.history("a")] == [0, 1, 2, 3, 4]
+    assert [turn.seq for turn in store.history("a", offset=1, limit=2)] == [1, 2]
+    store.close()
+
+
+def test_recent_turns_survive_a_restart_without_close(tmp_path):
+    store = make_store(tmp_path, max_token_limit=100, flush_interval=0.05)
+    store.append("a", "question 0", "answer 0")
+    store.append("a", "question 1", "answer 1")
+    time.sleep(0.3)
+
+    restarted = make_store(tmp_path, max_token_limit=100)
+    assert [turn.human for turn in restarted.window("a")] == ["question 0", "question 1"]
+    assert restarted.append("a", "question 2", "answer 2") == 2
+    restarted.close()
+    store.close()
+
+
+def test_clear_drops_buffered_and_written_turns(tmp_path):
+    store = make_store(tmp_path)
+    store.append("a", "question 0", "answer 0")
+    store.flush()
+    store.append("a", "question 1", "answer 1")
+    store.clear("a")
+    assert store.history("a") == []
+    assert store.window("a") == []
+    store.close()
+
+
+def test_memory_loads_the_window(tmp_path):
+    store = make_store(tmp_path, max_token_limit=12)
+    memory = SessionMemory(store=store, session_id="a")
+    for i in range(3):
+        memory.save_context({"input": f"question {i}"}, {"output": f"answer {i}"})
+    assert memory.load_memory_variables({})["history"] == (
+        "Human: question 1\nAI: answer 1\nHuman: question 2\nAI: answer 2")
+
+    messages = SessionMemory(store=store, session_id="a", return_messages=True).load_memory_variables({})["history"]
+    assert [message.content for message in messages] == ["question 1", "answer 1", "question 2", "answer 2"]
+    store.close()
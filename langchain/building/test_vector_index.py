@@ -0,0 +1,80 @@
+import zlib
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+from ann_index import IVFIndex
+from vector_index import PersistentVectorStore
+
+
+class WordEmbeddings(Embeddings):
+    """Mean of fixed random word vectors; records every text it embeds"""
+
+    def __init__(self):
+        self.embedded = []
+
+    def embed_documents(self, texts):
+        self.embedded.extend(texts)
+        return [self.embed_query(text) for text in texts]
+
+    def embed_query(self, text):
+        return np.mean([np.random.default_rng(zlib.crc32(word.encode())).standard_normal(16)
+                        for word in text.split()], axis=0).tolist()
+
+
+def documents(*texts):
+    return [Document(page_content=text, metadata={"row": i}) for i, text in enumerate(texts)]
+
+
+def test_sync_embeds_only_new_rows(tmp_path):
+    embedding = WordEmbeddings()
+    store = PersistentVectorStore.open(str(tmp_path), embedding)
+    assert store.sync(documents("red shoes", "blue jeans")) == {"added": 2, "reused": 0, "removed": 0}
+
+    stats = store.sync(documents("blue jeans", "green hat"))
+    assert stats == {"added": 1, "reused": 1, "removed": 1}
+    assert embedding.embedded == ["red shoes", "blue jeans", "green hat"]
+    assert [doc.page_content for doc in store.similarity_search("green hat", k=2)][0] == "green hat"
+
+    assert store.sync(documents("blue jeans", "green hat")) == {"added": 0, "reused": 2, "removed": 0}
+    assert len(embedding.embedded) == 3
+
+
+def test_reopened_store_is_memory_mapped_and_not_re_embedded(tmp_path):
+    PersistentVectorStore.open(str(tmp_path), WordEmbeddings()).sync(documents("red shoes", "blue jeans"))
+
+    embedding = WordEmbeddings()
+    store = PersistentVectorStore.open(str(tmp_path), embedding)
+    assert len(store) == 2
+    assert isinstance(store.vectors, np.memmap)
+    assert np.allclose(np.linalg.norm(store.vectors, axis=1), 1)
+    doc, score = store.similarity_search_with_score("red shoes", k=1)[0]
+    assert (doc.page_content, doc.metadata) == ("red shoes", {"row": 0})
+    assert abs(score - 1) < 1e-5
+    assert embedding.embedded == []
+
+
+def test_ann_backend_is_rebuilt_only_when_rows_change(tmp_path):
+    texts = [f"item {i} colour {i % 7} size {i % 5}" for i in range(200)]
+    store = PersistentVectorStore.open(str(tmp_path), WordEmbeddings(), IVFIndex(nlist=8, nprobe=8))
+    store.sync(documents(*texts))
+    store.similarity_search("item 3", k=3)
+    saved = tmp_path / "ann_ivf" / "ivf.npz"
+    built_at = saved.stat().st_mtime_ns
+
+    reopened = PersistentVectorStore.open(str(tmp_path), WordEmbeddings(), IVFIndex(nlist=8, nprobe=8))
+    assert reopened.similarity_search("item 3", k=3) == store.similarity_search("item 3", k=3)
+    assert saved.stat().st_mtime_ns == built_at
+
+    reopened.sync(documents(*texts[:-1]))
+    reopened.similarity_search("item 3", k=3)
+    assert saved.stat().st_mtime_ns != built_at
+
+
+def test_search_returns_at_most_the_stored_rows(tmp_path):
+    store = PersistentVectorStore.open(str(tmp_path), WordEmbeddings())
+    assert store.similarity_search("anything") == []
+    store.add_texts(["red shoes"])
+    assert store.add_texts(["red shoes", "blue jeans"])[0] == store.rows[0]["hash"]
+    assert len(store.similarity_search("red", k=10)) == 2
@@ -0,0 +1,214 @@
+"""
+Persistent vector index for the Q&A notebooks.
+
+Embeddings are stored as a float32 NumPy matrix (vectors.npy, memory-mapped on
+load) next to a JSON file holding each row's text, metadata and content hash.
+Opening an existing index costs a file read instead of re-embedding the
+catalog, and `sync` only embeds rows whose content hash is not already stored.
+
+Searches go through a backend from ann_index (exact by default; IVFIndex or
+HNSWIndex for large catalogs), which is persisted in the index directory and
+rebuilt only when the rows change.
+"""
+
+import os
+import json
+import hashlib
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.vectorstores import VectorStore
+
+from ann_index import ExactIndex
+
+
+def content_hash(text: str) -> str:
+    """Hash of the embedded text; a row is re-embedded only when this changes"""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms == 0, 1, norms)
+
+
+class PersistentVectorStore(VectorStore):
+    """LangChain vector store backed by an on-disk, memory-mapped embedding matrix"""
+
+    VECTORS_FILE = "vectors.npy"
+    ROWS_FILE = "rows.json"
+
+    def __init__(self, index_dir: str, embedding: Embeddings, ann=None):
+        self.index_dir = Path(index_dir)
+        self.embedding = embedding
+        self.ann = ann or ExactIndex()
+        self.rows: List[Dict[str, Any]] = []
+        self.vectors = np.zeros((0, 0), dtype=np.float32)
+        self._signature: Optional[str] = None
+        self._load()
+
+    @classmethod
+    def open(cls, index_dir: str, embedding: Embeddings, ann=None) -> "PersistentVectorStore":
+        """
+        Open the index in index_dir, or an empty one if it does not exist yet.
+        ann is the search backend, e.g. IVFIndex(nprobe=16) or HNSWIndex(ef=64).
+        """
+        return cls(index_dir, embedding, ann)
+
+    @property
+    def embeddings(self) -> Embeddings:
+        return self.embedding
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def _load(self):
+        # Every change to the rows goes through _save, which reloads them here
+        self._signature = None
+        rows_path = self.index_dir / self.ROWS_FILE
+        vectors_path = self.index_dir / self.VECTORS_FILE
+        if not rows_path.exists() or not vectors_path.exists():
+            return
+        with open(rows_path) as f:
+            self.rows = json.load(f)
+        # Memory-mapped: pages are read on demand, so opening is near-instant
+        self.vectors = np.load(vectors_path, mmap_mode="r")
+
+    def _save(self, rows: List[Dict[str, Any]], vectors: np.ndarray):
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        vectors_tmp = self.index_dir / (self.VECTORS_FILE + ".tmp")
+        rows_tmp = self.index_dir / (self.ROWS_FILE + ".tmp")
+        # Copied in chunks so memory-mapped inputs larger than RAM can be written
+        out = np.lib.format.open_memmap(vectors_tmp, mode="w+", dtype=np.float32, shape=vectors.shape)
+        for start in range(0, len(vectors), 65_536):
+            out[start:start + 65_536] = vectors[start:start + 65_536]
+        out.flush()
+        del out
+        with open(rows_tmp, "w") as f:
+            json.dump(rows, f)
+        os.replace(vectors_tmp, self.index_dir / self.VECTORS_FILE)
+        os.replace(rows_tmp, self.index_dir / self.ROWS_FILE)
+        self._load()
+
+    def _embed(self, texts: List[str]) -> np.ndarray:
+        if not texts:
+            return np.zeros((0, self.vectors.shape[1] if len(self.rows) else 0), dtype=np.float32)
+        return _normalize(np.asarray(self.embedding.embed_documents(texts), dtype=np.float32))
+
+    def sync(self, documents: List[Document]) -> Dict[str, int]:
+        """
+        Make the index match a set of documents, embedding only new or changed rows.
+        Rows are kept in document order; rows no longer present are dropped.
+        Returns counts of added, reused and removed rows.
+        """
+        hashes = [content_hash(doc.page_content) for doc in documents]
+        existing = {row["hash"]: i for i, row in enumerate(self.rows)}
+        rows = [
+            {"hash": h, "page_content": doc.page_content, "metadata": doc.metadata}
+            for h, doc in zip(hashes, documents)
+        ]
+        if rows == self.rows:
+            return {"added": 0, "reused": len(rows), "removed": 0}
+
+        missing = [i for i, h in enumerate(hashes) if h not in existing]
+        new_vectors = self._embed([documents[i].page_content for i in missing])
+        new_rows = dict(zip(missing, new_vectors))
+
+        dim = new_vectors.shape[1] if len(missing) else self.vectors.shape[1]
+        vectors = np.empty((len(documents), dim), dtype=np.float32)
+        for i, h in enumerate(hashes):
+            vectors[i] = new_rows[i] if i in new_rows else self.vectors[existing[h]]
+        stats = {
+            "added": len(missing),
+            "reused": len(documents) - len(missing),
+            "removed": len(set(existing) - set(hashes)),
+        }
+        self._save(rows, vectors)
+        return stats
+
+    def add_texts(self, texts: Iterable[str], metadatas: Optional[List[dict]] = None, **kwargs: Any) -> List[str]:
+        texts = list(texts)
+        metadatas = metadatas or [{} for _ in texts]
+        hashes = [content_hash(text) for text in texts]
+        known = {row["hash"] for row in self.rows}
+        fresh = [i for i, h in enumerate(hashes) if h not in known]
+        if fresh:
+            new_vectors = self._embed([texts[i] for i in fresh])
+            vectors = np.concatenate([self.vectors, new_vectors]) if len(self.rows) else new_vectors
+            rows = self.rows + [
+                {"hash": hashes[i], "page_content": texts[i], "metadata": metadatas[i]} for i in fresh
+            ]
+            self._save(rows, vectors)
+        return hashes
+
+    def _rows_signature(self) -> str:
+        """Hash of the row hashes in order, computed once per load instead of on every query"""
+        if self._signature is None:
+            self._signature = hashlib.sha256("".join(row["hash"] for row in self.rows).encode("utf-8")).hexdigest()
+        return self._signature
+
+    def _ensure_ann(self):
+        """Load the search backend from disk, or build and save it if the rows changed"""
+        signature = self._rows_signature()
+        if self.ann.signature == signature:
+            return
+        path = self.index_dir / f"ann_{self.ann.name}"
+        if not self.ann.load(path, signature, self.vectors):
+            self.ann.build(self.vectors)
+            self.ann.signature = signature
+            self.ann.save(path)
+
+    def search_ids(self, embeddings: List[List[float]], k: int = 4, **params: Any) -> Tuple[np.ndarray, np.ndarray]:
+        """Row ids (-1 where fewer than k were found) and cosine similarities of the nearest rows per query"""
+        self._ensure_ann()
+        queries = _normalize(np.asarray(embeddings, dtype=np.float32))
+        return self.ann.search(queries, k, **params)
+
+    def search_vectors(self, embeddings: List[List[float]], k: int = 4, **params: Any) -> List[List[Tuple[Document, float]]]:
+        """
+        Batched search: one list of (document, cosine similarity) per query embedding.
+        params are backend settings such as nprobe (IVF) or ef (HNSW).
+        """
+        if not self.rows or not len(embeddings):
+            return [[] for _ in embeddings]
+        ids, scores = self.search_ids(embeddings, k, **params)
+        return [
+            [(self._document(int(i)), float(score)) for i, score in zip(row_ids, row_scores) if i >= 0]
+            for row_ids, row_scores in zip(ids, scores)
+        ]
+
+    def similarity_search_batch(self, queries: List[str], k: int = 4, **params: Any) -> List[List[Document]]:
+        """Answer several queries with one embedding call and one backend search"""
+        results = self.search_vectors(self.embedding.embed_documents(queries), k, **params)
+        return [[doc for doc, _ in result] for result in results]
+
+    def similarity_search_by_vector_with_score(self, embedding: List[float], k: int = 4, **params: Any) -> List[Tuple[Document, float]]:
+        return self.search_vectors([embedding], k, **params)[0]
+
+    def _document(self, i: int) -> Document:
+        row = self.rows[i]
+        return Document(page_content=row["page_content"], metadata=row["metadata"])
+
+    def similarity_search_with_score(self, query: str, k: int = 4, **kwargs: Any) -> List[Tuple[Document, float]]:
+        return self.similarity_search_by_vector_with_score(self.embedding.embed_query(query), k, **kwargs)
+
+    def similarity_search_by_vector(self, embedding: List[float], k: int = 4, **kwargs: Any) -> List[Document]:
+        return [doc for doc, _ in self.similarity_search_by_vector_with_score(embedding, k, **kwargs)]
+
+    def similarity_search(self, query: str, k: int = 4, **kwargs: Any) -> List[Document]:
+        return [doc for doc, _ in self.similarity_search_with_score(query, k, **kwargs)]
+
+    def _select_relevance_score_fn(self):
+        # Scores are cosine similarities in [-1, 1]
+        return lambda score: (score + 1) / 2
+
+    @classmethod
+    def from_texts(cls, texts: List[str], embedding: Embeddings, metadatas: Optional[List[dict]] = None,
+                   index_dir: str = "vector_index", ann=None, **kwargs: Any) -> "PersistentVectorStore":
+        store = cls(index_dir, embedding, ann)
+        store.sync([Document(page_content=text, metadata=metadata)
+                    for text, metadata in zip(texts, metadatas or [{} for _ in texts])])
+        return store
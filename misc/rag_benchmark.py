@@ -0,0 +1,84 @@
+"""
+Compare the notebook's per-document retrieval loop with VectorRetriever.
+
+Uses a synthetic word-vector table in place of glove-twitter-25 so it runs without
+downloads. For each collection size it reports the latency of one query with the
+loop (re-embedding every document and computing one distance at a time) and with
+the precomputed matrix, plus the per-query latency of a batch of queries.
+The loop is only timed up to --loop-max documents and extrapolated beyond that.
+
+    python rag_benchmark.py --sizes 10 1000 100000 1000000 --metric cosine
+"""
+
+import time
+import argparse
+
+import numpy as np
+
+from rag_retriever import VectorRetriever
+
+
+def make_corpus(n_docs: int, vocab_size: int = 5000, dim: int = 25, words_per_doc: int = 30, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    vocab = [f"w{i}" for i in range(vocab_size)]
+    word_vectors = dict(zip(vocab, rng.standard_normal((vocab_size, dim)).astype(np.float32)))
+    word_ids = rng.integers(0, vocab_size, (n_docs, words_per_doc))
+    documents = {f"doc{i}": " ".join(vocab[j] for j in row) for i, row in enumerate(word_ids)}
+    return word_vectors, documents
+
+
+def loop_retrieve(prompt, documents, embed_sequence):
+    # Mirrors retreive_relevent in RAGFromScratch.ipynb
+    min_dist, r_docname = float("inf"), ""
+    for docname, doc in documents.items():
+        dist = np.abs(embed_sequence(prompt) - embed_sequence(doc)).sum()
+        if dist < min_dist:
+            min_dist, r_docname = dist, docname
+    return r_docname
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 10_000, 100_000, 1_000_000])
+    parser.add_argument("--queries", type=int, default=64, help="queries in the batched run")
+    parser.add_argument("--loop-max", type=int, default=10_000, help="largest size timed with the loop")
+    parser.add_argument("--k", type=int, default=3)
+    parser.add_argument("--metric", choices=["cityblock", "cosine"], default="cityblock")
+    args = parser.parse_args()
+
+    print(f"{'docs':>10}{'loop ms':>12}{'index s':>10}{'query ms':>10}{'batch ms/q':>12}{'speedup':>10}")
+    for n in args.sizes:
+        word_vectors, documents = make_corpus(n)
+
+        def embed_sequence(sequence):
+            return np.mean([word_vectors[word] for word in sequence.split(" ")], axis=0)
+
+        prompt = next(iter(documents.values()))
+        loop_n = min(n, args.loop_max)
+        subset = dict(list(documents.items())[:loop_n])
+        start = time.perf_counter()
+        loop_retrieve(prompt, subset, embed_sequence)
+        loop_ms = (time.perf_counter() - start) * 1000 * n / loop_n
+
+        retriever = VectorRetriever(embed_sequence, metric=args.metric)
+        start = time.perf_counter()
+        retriever.add_documents(documents)
+        index_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        result = retriever.search(prompt, k=args.k)
+        query_ms = (time.perf_counter() - start) * 1000
+        assert result[0][0] == "doc0"
+
+        queries = list(documents.values())[:args.queries]
+        start = time.perf_counter()
+        retriever.search_batch(queries, k=args.k)
+        batch_ms = (time.perf_counter() - start) * 1000 / len(queries)
+
+        estimated = "*" if loop_n < n else " "
+        print(f"{n:>10}{loop_ms:>11.1f}{estimated}{index_s:>10.2f}{query_ms:>10.2f}{batch_ms:>12.2f}{loop_ms / query_ms:>9.0f}x")
+    print("* extrapolated from --loop-max documents")
+
+
+if __name__ == "__main__":
+    main()
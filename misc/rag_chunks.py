@@ -0,0 +1,166 @@
+"""
+Chunked retrieval and prompt assembly for RAGFromScratch.ipynb.
+
+Documents are split into overlapping windows of at most `chunk_tokens` tokens and
+each window is embedded on its own, so a prompt is matched against the part of a
+document it is about rather than the mean of the whole document. The best chunks
+are assembled into the prompt until a token budget is spent; overlapping chunks of
+the same document are merged so shared words are only paid for once. The budget of
+augment() covers the whole prompt: instructions, document headers and the question.
+
+    chunker = ChunkedRetriever(embed_sequence, chunk_tokens=12, overlap_tokens=4)
+    chunker.add_documents(documents)
+    chunker.augment("what pasta dishes do you have", k=3, token_budget=60)
+"""
+
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from rag_retriever import VectorRetriever
+
+PROMPT_TEMPLATE = "Answer the customers prompt based on the folowing documents:\n{sections}\nprompt: {prompt}\nresponse:"
+SECTION_HEADER = "==== document: {doc} ====\n"
+PASSAGE_SEPARATOR = "\n...\n"
+SECTION_FOOTER = "\n====\n"
+
+
+def count_words(text: str) -> int:
+    return len(text.split())
+
+
+@dataclass
+class Chunk:
+    doc: str
+    start: int  # first word of the window
+    end: int  # one past its last word
+    text: str
+
+
+def split_into_chunks(words: List[str], costs: np.ndarray, chunk_tokens: int, overlap_tokens: int) -> List[Tuple[int, int]]:
+    """
+    Word ranges of overlapping windows, each holding at most chunk_tokens tokens
+    (a single word longer than that still gets its own window). Consecutive windows
+    share their last words worth about overlap_tokens tokens.
+    """
+    ranges, start = [], 0
+    cumulative = np.concatenate([[0], np.cumsum(costs)])
+    while start < len(words):
+        # Furthest end whose window still fits, but always at least one word
+        end = max(start + 1, int(np.searchsorted(cumulative, cumulative[start] + chunk_tokens, side="right")) - 1)
+        ranges.append((start, end))
+        if end >= len(words):
+            break
+        # Step back from the end until the overlap is covered, but always move forward
+        overlap_start = int(np.searchsorted(cumulative, cumulative[end] - overlap_tokens, side="left"))
+        start = min(max(overlap_start, start + 1), end)
+    return ranges
+
+
+class ChunkedRetriever:
+    """Chunk-level retrieval with token-budgeted context assembly"""
+
+    def __init__(self, embed_fn: Callable[[str], np.ndarray], chunk_tokens: int = 128, overlap_tokens: int = 32,
+                 count_tokens: Callable[[str], int] = count_words, metric: str = "cityblock"):
+        """
+        embed_fn: Embeds one text, e.g. embed_sequence from the notebook
+        chunk_tokens: Maximum tokens per chunk
+        overlap_tokens: Tokens shared by consecutive chunks of a document
+        count_tokens: Token counter, e.g. lambda s: len(tiktoken_encoding.encode(s)); words by default
+        metric: Distance used by the underlying VectorRetriever
+        """
+        if overlap_tokens >= chunk_tokens:
+            raise ValueError("overlap_tokens must be smaller than chunk_tokens")
+        self.chunk_tokens = chunk_tokens
+        self.overlap_tokens = overlap_tokens
+        self.count_tokens = count_tokens
+        self.retriever = VectorRetriever(embed_fn, metric=metric)
+        self.chunks: List[Chunk] = []
+        self.words: Dict[str, List[str]] = {}
+        self.costs: Dict[str, np.ndarray] = {}
+        self._next_chunk_id = 0
+
+    def remove_documents(self, names: List[str]):
+        """Drop documents and their chunks"""
+        names = set(names) & set(self.words)
+        if not names:
+            return
+        self.retriever.remove([i for i, chunk in enumerate(self.chunks) if chunk.doc in names])
+        self.chunks = [chunk for chunk in self.chunks if chunk.doc not in names]
+        for name in names:
+            del self.words[name], self.costs[name]
+
+    def add_documents(self, documents: Dict[str, str]):
+        """Split documents (name -> text) into chunks and embed every chunk; a known name replaces its document"""
+        self.remove_documents(list(documents))
+        new_chunks = []
+        for name, text in documents.items():
+            words = text.split()
+            # Per-word token costs (with the leading space a word has inside a sentence)
+            costs = np.array([self.count_tokens(" " + word) for word in words], dtype=np.int64)
+            self.words[name], self.costs[name] = words, costs
+            for start, end in split_into_chunks(words, costs, self.chunk_tokens, self.overlap_tokens):
+                new_chunks.append(Chunk(name, start, end, " ".join(words[start:end])))
+        if not new_chunks:
+            return
+        self.retriever.add_documents({f"{c.doc}#{self._next_chunk_id + i}": c.text for i, c in enumerate(new_chunks)})
+        self._next_chunk_id += len(new_chunks)
+        self.chunks.extend(new_chunks)
+
+    def search(self, prompt: str, k: int = 4) -> List[Tuple[Chunk, float]]:
+        """The k closest chunks with their distances, closest first"""
+        if not self.chunks:
+            return []
+        ids, distances = self.retriever.search_vectors(self.retriever.embed([prompt]), k)
+        return [(self.chunks[i], float(d)) for i, d in zip(ids[0], distances[0])]
+
+    def _merged_ranges(self, chunks: List[Chunk]) -> Dict[str, List[List[int]]]:
+        ranges: Dict[str, List[List[int]]] = {}
+        for chunk in sorted(chunks, key=lambda c: (c.doc, c.start)):
+            doc_ranges = ranges.setdefault(chunk.doc, [])
+            if doc_ranges and chunk.start <= doc_ranges[-1][1]:
+                doc_ranges[-1][1] = max(doc_ranges[-1][1], chunk.end)
+            else:
+                doc_ranges.append([chunk.start, chunk.end])
+        return ranges
+
+    def _tokens(self, ranges: Dict[str, List[List[int]]]) -> int:
+        """Tokens of the sections these ranges render to, document headers and separators included"""
+        tokens = 0
+        for doc, doc_ranges in ranges.items():
+            tokens += self.count_tokens(SECTION_HEADER.format(doc=doc) + SECTION_FOOTER)
+            tokens += (len(doc_ranges) - 1) * self.count_tokens(PASSAGE_SEPARATOR)
+            tokens += sum(int(self.costs[doc][start:end].sum()) for start, end in doc_ranges)
+        return tokens
+
+    def select(self, prompt: str, k: int = 4, token_budget: Optional[int] = None) -> Dict[str, List[str]]:
+        """
+        Best chunks for a prompt, taken in rank order while their rendered sections fit token_budget
+        Returns:
+            Passages per document name, in document order, with overlapping chunks merged
+        """
+        selected: List[Chunk] = []
+        for chunk, _ in self.search(prompt, k):
+            candidate = selected + [chunk]
+            if token_budget is not None and self._tokens(self._merged_ranges(candidate)) > token_budget:
+                continue
+            selected = candidate
+        return {
+            doc: [" ".join(self.words[doc][start:end]) for start, end in doc_ranges]
+            for doc, doc_ranges in self._merged_ranges(selected).items()
+        }
+
+    def augment(self, prompt: str, k: int = 4, token_budget: Optional[int] = None) -> str:
+        """
+        Prompt in the notebook's retreive_and_agument format, built from the selected chunks
+        token_budget: Tokens of the whole prompt, including the instructions and the prompt itself
+        """
+        if token_budget is not None:
+            token_budget = max(token_budget - self.count_tokens(PROMPT_TEMPLATE.format(sections="", prompt=prompt)), 0)
+        selected = self.select(prompt, k, token_budget)
+        sections = "".join(
+            SECTION_HEADER.format(doc=doc) + PASSAGE_SEPARATOR.join(passages) + SECTION_FOOTER
+            for doc, passages in selected.items()
+        )
+        return PROMPT_TEMPLATE.format(sections=sections, prompt=prompt)
@@ -0,0 +1,116 @@
+"""
+Vectorized document retrieval for RAGFromScratch.ipynb.
+
+Documents are embedded once into a float32 matrix when they are added. A query (or a
+batch of queries) is then scored against every document in one vectorized
+cityblock or cosine computation, and the k closest documents are picked with
+argpartition instead of a Python loop over documents.
+
+    retriever = VectorRetriever(embed_sequence, metric="cityblock")
+    retriever.add_documents(documents)
+    retriever.search("what pasta dishes do you have", k=2)
+"""
+
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+METRICS = ("cityblock", "cosine")
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.where(norms == 0, 1, norms)
+
+
+def top_k_smallest(distances: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Indices and values of the k smallest distances per row, closest first"""
+    k = min(k, distances.shape[1])
+    top = np.argpartition(distances, k - 1, axis=1)[:, :k]
+    top_distances = np.take_along_axis(distances, top, axis=1)
+    order = np.argsort(top_distances, axis=1)
+    return np.take_along_axis(top, order, axis=1), np.take_along_axis(top_distances, order, axis=1)
+
+
+class VectorRetriever:
+    """Nearest-document search over a precomputed embedding matrix"""
+
+    def __init__(self, embed_fn: Callable[[str], np.ndarray], metric: str = "cityblock",
+                 batch_embed_fn: Optional[Callable[[List[str]], np.ndarray]] = None,
+                 max_block_floats: int = 8_000_000):
+        """
+        embed_fn: Embeds one text, e.g. embed_sequence from the notebook
+        metric: "cityblock" (manhattan, as in the notebook) or "cosine"
+        batch_embed_fn: Optional function embedding a list of texts at once
+        max_block_floats: Bounds the (queries x documents x dim) block used for cityblock
+        """
+        if metric not in METRICS:
+            raise ValueError(f"metric must be one of {METRICS}, got {metric!r}")
+        self.embed_fn = embed_fn
+        self.batch_embed_fn = batch_embed_fn
+        self.metric = metric
+        self.max_block_floats = max_block_floats
+        self.names: List[str] = []
+        self.texts: List[str] = []
+        self.matrix: Optional[np.ndarray] = None
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        if self.batch_embed_fn is not None:
+            return np.asarray(self.batch_embed_fn(list(texts)), dtype=np.float32)
+        return np.stack([np.asarray(self.embed_fn(text), dtype=np.float32) for text in texts])
+
+    def add_documents(self, documents: Dict[str, str]):
+        """Embed documents (name -> text) once and append them to the matrix"""
+        if not documents:
+            return
+        self.add_vectors(list(documents), list(documents.values()), self.embed(list(documents.values())))
+
+    def add_vectors(self, names: List[str], texts: List[str], vectors: np.ndarray):
+        """Add documents whose embeddings were computed elsewhere"""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if self.metric == "cosine":
+            vectors = _normalize(vectors)
+        self.matrix = vectors if self.matrix is None else np.concatenate([self.matrix, vectors])
+        self.names.extend(names)
+        self.texts.extend(texts)
+
+    def remove(self, indices: Sequence[int]):
+        """Drop documents by position; later documents move up to fill the gaps"""
+        keep = np.ones(len(self), dtype=bool)
+        keep[list(indices)] = False
+        self.matrix = self.matrix[keep] if self.matrix is not None else None
+        self.names = [name for name, kept in zip(self.names, keep) if kept]
+        self.texts = [text for text, kept in zip(self.texts, keep) if kept]
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def distances(self, queries: np.ndarray) -> np.ndarray:
+        """Distance from each query embedding to every document, shape (queries, documents)"""
+        queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+        if self.metric == "cosine":
+            return 1 - _normalize(queries) @ self.matrix.T
+        # Cityblock has no matrix-product form: broadcast in document blocks to bound memory
+        out = np.empty((len(queries), len(self.matrix)), dtype=np.float32)
+        block = max(1, self.max_block_floats // max(1, len(queries) * self.matrix.shape[1]))
+        for start in range(0, len(self.matrix), block):
+            docs = self.matrix[start:start + block]
+            out[:, start:start + block] = np.abs(queries[:, None, :] - docs[None, :, :]).sum(axis=2)
+        return out
+
+    def search_vectors(self, queries: np.ndarray, k: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+        """Document indices and distances of the k closest documents per query embedding"""
+        return top_k_smallest(self.distances(queries), k)
+
+    def search_batch(self, queries: List[str], k: int = 1) -> List[List[Tuple[str, str, float]]]:
+        """(name, text, distance) of the k closest documents for each query, closest first"""
+        if not len(self) or not queries:
+            return [[] for _ in queries]
+        ids, distances = self.search_vectors(self.embed(queries), k)
+        return [
+            [(self.names[i], self.texts[i], float(d)) for i, d in zip(row_ids, row_distances)]
+            for row_ids, row_distances in zip(ids, distances)
+        ]
+
+    def search(self, query: str, k: int = 1) -> List[Tuple[str, str, float]]:
+        return self.search_batch([query], k)[0]
@@ -0,0 +1,53 @@
+import zlib
+
+import numpy as np
+
+from rag_chunks import ChunkedRetriever, count_words, split_into_chunks
+
+
+def embed_words(text):
+    """Mean of fixed random word vectors, like embed_sequence over a word2vec model"""
+    return np.mean([np.random.default_rng(zlib.crc32(word.encode())).standard_normal(16)
+                    for word in text.split()], axis=0)
+
+
+MENU = {
+    "pasta": "spaghetti carbonara with egg and pancetta, penne arrabbiata with chili and tomato",
+    "pizza": "margherita with basil and mozzarella, diavola with spicy salami and chili oil",
+}
+
+
+def test_chunks_cover_the_document_with_overlap():
+    words = ("w " * 25).split()
+    ranges = split_into_chunks(words, np.ones(len(words)), chunk_tokens=10, overlap_tokens=3)
+    assert ranges[0] == (0, 10)
+    assert ranges[-1][1] == len(words)
+    for (start, end), (next_start, _) in zip(ranges, ranges[1:]):
+        assert end - start <= 10
+        assert end - next_start == 3
+
+
+def test_a_word_longer_than_a_chunk_gets_its_own_window():
+    ranges = split_into_chunks(["a", "b", "c"], np.array([1, 20, 1]), chunk_tokens=5, overlap_tokens=1)
+    assert ranges == [(0, 1), (1, 2), (2, 3)]
+
+
+def test_re_adding_a_document_replaces_its_chunks():
+    chunker = ChunkedRetriever(embed_words, chunk_tokens=6, overlap_tokens=2)
+    chunker.add_documents(MENU)
+    chunker.add_documents({"pasta": "lasagne with ragu"})
+
+    assert len(chunker.retriever) == len(chunker.chunks)
+    assert chunker.retriever.matrix.shape[0] == len(chunker.chunks)
+    assert [chunk.text for chunk in chunker.chunks if chunk.doc == "pasta"] == ["lasagne with ragu"]
+    assert chunker.select("lasagne with ragu", k=1) == {"pasta": ["lasagne with ragu"]}
+
+
+def test_augmented_prompt_fits_the_token_budget():
+    chunker = ChunkedRetriever(embed_words, chunk_tokens=6, overlap_tokens=2)
+    chunker.add_documents(MENU)
+    prompt = "what pasta dishes do you have"
+    for budget in (20, 30, 45, 80):
+        assert count_words(chunker.augment(prompt, k=6, token_budget=budget)) <= max(budget, 16)
+    assert "====" not in chunker.augment(prompt, k=6, token_budget=16)
+    assert chunker.augment(prompt, k=6).count("==== document:") == 2
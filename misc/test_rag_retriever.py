@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+from rag_retriever import VectorRetriever, top_k_smallest
+
+
+def brute_force(queries, matrix, metric):
+    if metric == "cosine":
+        unit = lambda v: v / np.linalg.norm(v, axis=-1, keepdims=True)
+        return 1 - unit(queries) @ unit(matrix).T
+    return np.array([[np.abs(query - doc).sum() for doc in matrix] for query in queries])
+
+
+@pytest.fixture
+def vectors():
+    rng = np.random.default_rng(0)
+    return rng.standard_normal((200, 16)).astype(np.float32), rng.standard_normal((7, 16)).astype(np.float32)
+
+
+def test_top_k_smallest_is_sorted():
+    ids, values = top_k_smallest(np.array([[5.0, 1.0, 3.0, 0.5], [2.0, 2.5, 0.0, 9.0]]), 3)
+    assert ids.tolist() == [[3, 1, 2], [2, 0, 1]]
+    assert values.tolist() == [[0.5, 1.0, 3.0], [0.0, 2.0, 2.5]]
+    assert top_k_smallest(np.array([[1.0, 0.0]]), 5)[0].tolist() == [[1, 0]]
+
+
+@pytest.mark.parametrize("metric", ["cityblock", "cosine"])
+def test_search_matches_brute_force(vectors, metric):
+    matrix, queries = vectors
+    # A small block size forces the cityblock distances to be computed in several blocks
+    retriever = VectorRetriever(lambda text: None, metric=metric, max_block_floats=16 * 7 * 30)
+    retriever.add_vectors([f"doc{i}" for i in range(len(matrix))], [""] * len(matrix), matrix)
+    expected = brute_force(queries, matrix, metric)
+    assert np.allclose(retriever.distances(queries), expected, atol=1e-4)
+    ids, _ = retriever.search_vectors(queries, k=5)
+    assert (ids == np.argsort(expected, axis=1)[:, :5]).all()
+
+
+def test_search_by_text_and_remove():
+    vectors = {"pasta": [1.0, 0.0], "pizza": [0.0, 1.0], "salad": [0.7, 0.7]}
+    retriever = VectorRetriever(lambda text: vectors[text])
+    retriever.add_documents({name: name for name in vectors})
+    assert [name for name, _, _ in retriever.search("pasta", k=2)] == ["pasta", "salad"]
+
+    retriever.remove([0])
+    assert retriever.names == ["pizza", "salad"]
+    assert retriever.matrix.shape == (2, 2)
+    assert retriever.search("pasta", k=1)[0][0] == "salad"
+    assert VectorRetriever(len).search_batch(["pasta"], k=1) == [[]]
+
+
+def test_unknown_metric_is_rejected():
+    with pytest.raises(ValueError):
+        VectorRetriever(len, metric="euclidean")